@@ -0,0 +1,162 @@
+"""Two-tier cache (in-memory LRU + SQLite on disk) for generated message templates.
+Entries are name-agnostic templates keyed on normalized (role, company, intent, model,
+prompt version); callers render the recipient's name in with `personalize_template`.
+Run as: python -m ai.message_cache stats|invalidate|clear
+"""
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from config import settings
+from utils.logger import info, error
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS message_cache (
+    key TEXT PRIMARY KEY,
+    prompt_version TEXT,
+    template TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_message_cache_used ON message_cache(last_used_at);
+"""
+
+
+def _normalize(value) -> str:
+    return ' '.join(str(value or '').lower().split())
+
+
+def cache_key(role: str, company: str, intent: str, model: str, prompt_version) -> str:
+    parts = [_normalize(role), _normalize(company), _normalize(intent), _normalize(model), str(prompt_version)]
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+class MessageCache:
+    """LRU in front of a size-bounded SQLite table; both tiers honour the TTL."""
+
+    def __init__(self, path: str = None, ttl: float = None, memory_size: int = None, max_entries: int = None):
+        self.path = path or settings.MESSAGE_CACHE_PATH
+        self.ttl = settings.MESSAGE_CACHE_TTL if ttl is None else ttl
+        self.memory_size = memory_size or settings.MESSAGE_CACHE_MEMORY_SIZE
+        self.max_entries = max_entries or settings.MESSAGE_CACHE_MAX_ENTRIES
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl > 0 and now - created_at > self.ttl
+
+    def _remember(self, key, template, created_at):
+        self._memory[key] = (template, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and not self._expired(entry[1], now):
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return entry[0]
+            self._memory.pop(key, None)
+            try:
+                db = self._db()
+                row = db.execute('SELECT template, created_at FROM message_cache WHERE key = ?', (key,)).fetchone()
+                if row and not self._expired(row[1], now):
+                    with db:
+                        db.execute('UPDATE message_cache SET last_used_at = ? WHERE key = ?', (now, key))
+                    self._remember(key, row[0], row[1])
+                    self.stats['disk_hits'] += 1
+                    return row[0]
+                if row:
+                    with db:
+                        db.execute('DELETE FROM message_cache WHERE key = ?', (key,))
+            except Exception as e:
+                error('message_cache', f'Cache read failed: {e}')
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, key: str, template: str, prompt_version):
+        now = time.time()
+        with self._lock:
+            self._remember(key, template, now)
+            try:
+                db = self._db()
+                with db:
+                    db.execute('INSERT OR REPLACE INTO message_cache VALUES (?, ?, ?, ?, ?)',
+                               (key, str(prompt_version), template, now, now))
+                    self._evict(db, now)
+            except Exception as e:
+                error('message_cache', f'Cache write failed: {e}')
+
+    def _evict(self, db, now: float):
+        """Drop expired rows, then least recently used rows beyond `max_entries`."""
+        removed = 0
+        if self.ttl > 0:
+            removed += db.execute('DELETE FROM message_cache WHERE created_at < ?', (now - self.ttl,)).rowcount
+        excess = db.execute('SELECT COUNT(*) FROM message_cache').fetchone()[0] - self.max_entries
+        if excess > 0:
+            removed += db.execute(
+                'DELETE FROM message_cache WHERE key IN '
+                '(SELECT key FROM message_cache ORDER BY last_used_at LIMIT ?)', (excess,)
+            ).rowcount
+        self.stats['evictions'] += removed
+
+    def prune(self) -> int:
+        """Drop expired and excess entries now instead of on the next write; returns how many."""
+        with self._lock:
+            before = self.stats['evictions']
+            db = self._db()
+            with db:
+                self._evict(db, time.time())
+            return self.stats['evictions'] - before
+
+    def invalidate(self, keep_prompt_version=None) -> int:
+        """Remove entries for every prompt version except `keep_prompt_version` (all if None)."""
+        with self._lock:
+            self._memory.clear()
+            db = self._db()
+            with db:
+                if keep_prompt_version is None:
+                    removed = db.execute('DELETE FROM message_cache').rowcount
+                else:
+                    removed = db.execute('DELETE FROM message_cache WHERE prompt_version != ?',
+                                         (str(keep_prompt_version),)).rowcount
+        info('message_cache', f'Invalidated {removed} cached templates')
+        return removed
+
+    def summary(self) -> dict:
+        with self._lock:
+            lookups = self.stats['memory_hits'] + self.stats['disk_hits'] + self.stats['misses']
+            hits = lookups - self.stats['misses']
+            return dict(self.stats, lookups=lookups, hit_rate=round(hits / lookups * 100, 2) if lookups else 0.0,
+                        memory_entries=len(self._memory),
+                        disk_entries=self._db().execute('SELECT COUNT(*) FROM message_cache').fetchone()[0])
+
+
+if __name__ == '__main__':
+    from ai.message_generator import PROMPT_VERSION, get_cache
+    commands = {
+        'stats': lambda c: c.summary(),
+        'invalidate': lambda c: c.invalidate(keep_prompt_version=PROMPT_VERSION),
+        'clear': lambda c: c.invalidate(),
+    }
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print('Usage: python -m ai.message_cache stats|invalidate|clear')
+        sys.exit(1)
+    print(commands[sys.argv[1]](get_cache()))
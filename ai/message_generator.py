@@ -1,31 +1,202 @@
-"""Generate human-like LinkedIn messages using OpenAI with safe defaults."""
+"""Generate human-like LinkedIn messages using OpenAI with safe defaults.
+Generated messages are name-agnostic templates cached per (role, company, intent, model,
+prompt version); the recipient's name is rendered in with `personalize_template`.
+"""
+import json
 import os
-import openai
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from openai import OpenAI
+from config import settings
 from utils.logger import info, error
+from utils.timing import carry_run, timed
+from utils.resilience import CircuitOpen, NotConfigured, call, get_breaker
+from ai.message_cache import MessageCache, cache_key
+from ai.personalization import personalize_template
 
-openai.api_key = os.getenv('OPENAI_API_KEY')
+OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+OPENAI_API_BASE = os.getenv('OPENAI_API_BASE') or None
 
+MODEL = 'gpt-4o-mini'
+# Bump whenever the prompt below changes so cached templates from the old prompt are not reused
+PROMPT_VERSION = 2
+NAME_TOKEN = '{{name}}'
 
-def generate_message(name: str, role: str, company: str, intent: str = 'connect') -> str:
-    """Call OpenAI to generate a concise personalized message. Falls back to simple template if API not configured."""
+_cache = None
+_client = None
+
+
+def get_client() -> OpenAI:
+    # retries are handled by utils.resilience.call, so the client itself must not retry
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_API_BASE, max_retries=0)
+    return _client
+
+
+def get_cache() -> MessageCache:
+    global _cache
+    if _cache is None:
+        _cache = MessageCache()
+    return _cache
+
+
+def _fallback_message(name: str, role: str, company: str) -> str:
+    return f"Hi {name}, I noticed your work as a {role} at {company} — I'd love to connect and learn more about your experience." 
+
+
+@timed('message_generator', 'openai_chat', 'openai')
+def _chat(prompt: str, max_tokens: int, timeout: float = None) -> str:
+    if not OPENAI_API_KEY:
+        raise NotConfigured('OPENAI_API_KEY not set')
+    resp = get_client().chat.completions.create(
+        model=MODEL,
+        messages=[{'role': 'system', 'content': 'You are a professional LinkedIn outreach assistant.'},
+                  {'role': 'user', 'content': prompt}],
+        max_tokens=max_tokens,
+        temperature=0.7,
+        timeout=timeout or settings.OPENAI_TIMEOUT,
+    )
+    return (resp.choices[0].message.content or '').strip()
+
+
+def _is_name_agnostic(text: str, name: str) -> bool:
+    return NAME_TOKEN in text and not (name and name in text)
+
+
+@timed('message_generator')
+def generate_message(name: str, role: str, company: str, intent: str = 'connect', use_cache: bool = True,
+                     timeout: float = None) -> str:
+    """Call OpenAI to generate a concise personalized message. Falls back to simple template if API not configured
+    or unavailable; while the OpenAI circuit breaker is open the template is returned without calling the API."""
+    key = cache_key(role, company, intent, MODEL, PROMPT_VERSION)
+    template = get_cache().get(key) if use_cache else None
+    if template is not None:
+        return personalize_template(template, {'name': name})
+    breaker = get_breaker('openai')
+    if breaker.is_open():
+        return _fallback_message(name, role, company)
     prompt = (
-        f"Write a short, friendly LinkedIn connection message to {name}, a {role} at {company}."
-        f"Purpose: {intent}. Keep it professional, concise (1-2 sentences), and include a personalization token."
+        f"Write a short, friendly LinkedIn connection message to a {role} at {company}."
+        f"Purpose: {intent}. Keep it professional, concise (1-2 sentences), and address the recipient "
+        f"only with the placeholder {NAME_TOKEN} instead of a name."
     )
     try:
-        if not openai.api_key:
-            raise RuntimeError('OPENAI_API_KEY not set')
-        resp = openai.ChatCompletion.create(
-            model='gpt-4o-mini',
-            messages=[{'role': 'system', 'content': 'You are a professional LinkedIn outreach assistant.'},
-                      {'role': 'user', 'content': prompt}],
-            max_tokens=120,
-            temperature=0.7,
-        )
-        text = resp['choices'][0]['message']['content'].strip()
+        text = call(_chat, prompt, 120, timeout, breaker=breaker)
+        # Only cache output that is actually name-agnostic
+        if use_cache and _is_name_agnostic(text, name):
+            get_cache().put(key, text, PROMPT_VERSION)
         info('message_generator', f'Generated message for {name}')
-        return text
+        return personalize_template(text, {'name': name})
+    except CircuitOpen:
+        return _fallback_message(name, role, company)
     except Exception as e:
         error('message_generator', f'OpenAI failure: {e}; falling back to template')
         # Fallback template
-        return f"Hi {name}, I noticed your work as a {role} at {company} — I'd love to connect and learn more about your experience." 
+        return _fallback_message(name, role, company)
+
+
+def _parse_batch(text: str, count: int) -> dict:
+    """Map lead index -> note from a `{"notes": [{"id": .., "note": ..}]}` reply, dropping invalid entries."""
+    text = re.sub(r'^```(?:json)?\s*|\s*```$', '', text.strip())
+    data = json.loads(text)
+    items = data.get('notes', []) if isinstance(data, dict) else data
+    notes = {}
+    for item in items:
+        try:
+            idx = int(item['id'])
+            note = str(item['note']).strip()
+        except (KeyError, TypeError, ValueError):
+            continue
+        if 0 <= idx < count and note and idx not in notes:
+            notes[idx] = note
+    return notes
+
+
+def generate_batch(leads: list, intent: str = 'connect', timeout: float = None) -> list:
+    """Generate notes for several leads with a single chat completion returning JSON.
+    Cached leads are served from the cache; leads missing from a malformed or partial reply
+    fall back to per-lead `generate_message` (and from there to the template).
+    Returns messages aligned with `leads`.
+    """
+    messages = [None] * len(leads)
+    pending = []
+    for i, lead in enumerate(leads):
+        key = cache_key(lead.get('role'), lead.get('company'), intent, MODEL, PROMPT_VERSION)
+        template = get_cache().get(key)
+        if template is not None:
+            messages[i] = personalize_template(template, {'name': lead.get('name')})
+        else:
+            pending.append((i, key))
+    if not pending:
+        return messages
+
+    listing = '\n'.join(
+        f"{n}: {leads[i].get('role') or 'professional'} at {leads[i].get('company') or 'their company'}"
+        for n, (i, _key) in enumerate(pending)
+    )
+    prompt = (
+        f"Write a short, friendly LinkedIn connection message for each lead below. Purpose: {intent}. "
+        f"Keep each professional, concise (1-2 sentences), and address the recipient only with the "
+        f"placeholder {NAME_TOKEN} instead of a name.\n"
+        'Reply with JSON only, in the form {"notes": [{"id": <lead id>, "note": "<message>"}]}, '
+        f"one entry per lead.\nLeads:\n{listing}"
+    )
+    notes = {}
+    try:
+        notes = _parse_batch(call(_chat, prompt, 120 * len(pending), timeout, breaker=get_breaker('openai')),
+                             len(pending))
+        info('message_generator', f'Generated {len(notes)}/{len(pending)} messages in one batch')
+    except CircuitOpen:
+        pass
+    except Exception as e:
+        error('message_generator', f'Batch generation failed: {e}; falling back to per-lead calls')
+
+    for n, (i, key) in enumerate(pending):
+        lead = leads[i]
+        name = lead.get('name') or ''
+        note = notes.get(n)
+        if note is None:
+            messages[i] = generate_message(name, lead.get('role') or '', lead.get('company') or '', intent,
+                                           timeout=timeout)
+            continue
+        if _is_name_agnostic(note, name):
+            get_cache().put(key, note, PROMPT_VERSION)
+        messages[i] = personalize_template(note, {'name': name})
+    return messages
+
+
+def generate_messages(leads: list, intent: str = 'connect', max_workers: int = None, timeout: float = None,
+                      batch_size: int = None):
+    """Generate messages for many leads on a bounded thread pool.
+    Yields (lead, message) pairs in completion order so callers can start sending while the
+    remaining generations are still in flight. With `batch_size` > 1 each pool task asks for
+    that many notes in one completion (see `generate_batch`). Each lead falls back to the
+    template on failure.
+    """
+    if not leads:
+        return
+    batch_size = max(1, batch_size or settings.OPENAI_BATCH_SIZE)
+    batches = [leads[i:i + batch_size] for i in range(0, len(leads), batch_size)]
+    workers = max(1, min(max_workers or settings.OPENAI_CONCURRENCY, len(batches)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='message-gen') as pool:
+        futures = {}
+        for batch in batches:
+            if batch_size > 1:
+                future = pool.submit(carry_run(generate_batch), batch, intent, timeout)
+            else:
+                lead = batch[0]
+                future = pool.submit(carry_run(generate_message), lead.get('name') or '', lead.get('role') or '',
+                                     lead.get('company') or '', intent, True, timeout)
+            futures[future] = batch
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                result = future.result()
+                messages = result if batch_size > 1 else [result]
+            except Exception as e:
+                error('message_generator', f'Generation failed for {len(batch)} leads: {e}; falling back to template')
+                messages = [None] * len(batch)
+            for lead, message in zip(batch, messages):
+                yield lead, message or _fallback_message(lead.get('name') or '', lead.get('role') or '',
+                                                         lead.get('company') or '')
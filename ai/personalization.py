@@ -1,5 +1,28 @@
-"""Simple personalization utilities to clean tone and inject tokens."""
+"""Simple personalization utilities to clean tone and inject tokens.
+Templates are compiled once into a render plan of literal text, tokens and conditionals:
+- `{{name}}` is replaced by the value (empty when it is blank); a token whose field is not
+  given at all is left as written, so templates can be filled in several passes
+- `{{company|your team}}` falls back to the text after `|` when the value is blank or missing
+- `{{#if company}}...{{else}}...{{/if}}` keeps the first branch when the value is non-blank
+  (the `{{else}}` branch is optional and blocks can be nested)
+Whitespace runs in the result are collapsed to single spaces.
+`compile_template` and `render_many` reject malformed `#if` blocks with TemplateError;
+`personalize_template`, which also renders model-generated notes, keeps their tags as text instead.
+"""
 import re
+from functools import lru_cache
+
+from config import settings
+from utils.logger import info
+
+TAG = re.compile(r'\{\{(?:#if (\w+)|(else)|(/if)|(\w+)(?:\|([^{}]*))?)\}\}')
+
+# render plan segment kinds
+LITERAL, TOKEN, IF = 0, 1, 2
+
+
+class TemplateError(ValueError):
+    pass
 
 
 def sanitize_text(text: str) -> str:
@@ -9,9 +32,125 @@ def sanitize_text(text: str) -> str:
     return re.sub(r"\s+", ' ', text).strip()
 
 
+def _parse(source: str, strict: bool = True) -> list:
+    """Render plan for `source`: (LITERAL, text), (TOKEN, field, default, text) and (IF, field, then, else).
+    Without `strict`, `#if`/`else`/`/if` tags are plain text and only tokens are filled in."""
+    root = []
+    # open blocks: (segment list the block sits in, IF segment as a list)
+    stack = []
+    current = root
+    pos = 0
+    for m in TAG.finditer(source):
+        if m.start() > pos:
+            current.append((LITERAL, source[pos:m.start()]))
+        pos = m.end()
+        cond, is_else, _end, field, default = m.groups()
+        if field:
+            current.append((TOKEN, field, default, m.group(0)))
+        elif not strict:
+            current.append((LITERAL, m.group(0)))
+        elif cond:
+            block = [IF, cond, [], []]
+            current.append(block)
+            stack.append((current, block))
+            current = block[2]
+        elif is_else:
+            if not stack or current is not stack[-1][1][2]:
+                raise TemplateError(f'{{{{else}}}} outside of an {{{{#if}}}} block at {m.start()}')
+            current = stack[-1][1][3]
+        else:
+            if not stack:
+                raise TemplateError(f'{{{{/if}}}} without an {{{{#if}}}} at {m.start()}')
+            current, _block = stack.pop()
+    if stack:
+        raise TemplateError(f'unclosed {{{{#if {stack[-1][1][1]}}}}}')
+    if pos < len(source):
+        current.append((LITERAL, source[pos:]))
+    return _freeze(root)
+
+
+def _freeze(plan: list) -> tuple:
+    return tuple((IF, seg[1], _freeze(seg[2]), _freeze(seg[3])) if seg[0] == IF else seg for seg in plan)
+
+
+def _blank(value) -> bool:
+    return not value or (isinstance(value, str) and value.isspace())
+
+
+def _fill(plan: tuple, values: dict, out: list):
+    for seg in plan:
+        kind = seg[0]
+        if kind == LITERAL:
+            out.append(seg[1])
+        elif kind == TOKEN:
+            value = values.get(seg[1])
+            if not _blank(value):
+                out.append(str(value))
+            elif seg[2] is not None:
+                out.append(seg[2])
+            elif seg[1] not in values:
+                out.append(seg[3])
+        else:
+            _fill(seg[3] if _blank(values.get(seg[1])) else seg[2], values, out)
+
+
+class Template:
+    """A template compiled into its render plan; use `compile_template` to share compiled plans."""
+
+    def __init__(self, source: str, strict: bool = True):
+        self.source = source
+        self.plan = _parse(source, strict)
+        self.fields = sorted(_fields(self.plan))
+
+    def render(self, values: dict) -> str:
+        out = []
+        _fill(self.plan, values, out)
+        # same result as sanitize_text, without the regex
+        return ' '.join(''.join(out).split())
+
+
+def _fields(plan: tuple) -> set:
+    fields = set()
+    for seg in plan:
+        if seg[0] == TOKEN:
+            fields.add(seg[1])
+        elif seg[0] == IF:
+            fields |= {seg[1]} | _fields(seg[2]) | _fields(seg[3])
+    return fields
+
+
+@lru_cache(maxsize=256)
+def compile_template(template: str, strict: bool = True) -> Template:
+    return Template(template, strict)
+
+
+def fit_note(text: str, limit: int) -> str:
+    """`text` cut at the last word boundary that fits in `limit` characters."""
+    if len(text) <= limit:
+        return text
+    return text[:limit + 1].rsplit(' ', 1)[0][:limit].rstrip(' ,;:-')
+
+
 def personalize_template(template: str, tokens: dict) -> str:
     """Replace tokens like {{name}} with provided values."""
-    result = template
-    for k, v in tokens.items():
-        result = result.replace(f'{{{{{k}}}}}', str(v or ''))
-    return sanitize_text(result)
+    try:
+        return compile_template(template).render(tokens)
+    except TemplateError:
+        # e.g. a generated note with stray template syntax: send it with the tags as text
+        return compile_template(template, strict=False).render(tokens)
+
+
+def render_many(template: str, leads, max_length: int = None) -> list:
+    """Render `template` for each lead dict, compiling it once.
+    Notes longer than `max_length` (default CONNECTION_NOTE_LIMIT; 0 for no limit) are cut at a
+    word boundary so LinkedIn does not reject or silently truncate them."""
+    limit = settings.CONNECTION_NOTE_LIMIT if max_length is None else max_length
+    render = compile_template(template).render
+    notes = [render(lead) for lead in leads]
+    if limit:
+        over = [i for i, note in enumerate(notes) if len(note) > limit]
+        for i in over:
+            notes[i] = fit_note(notes[i], limit)
+        if over:
+            info('personalization', f'Shortened {len(over)} of {len(notes)} notes to {limit} characters')
+    return notes
@@ -1,45 +1,59 @@
-"""Detect unanswered connection requests and send a polite follow-up after X days."""
-import pandas as pd
+"""Detect unanswered connection requests and send a polite follow-up after X days.
+Each profile gets at most FOLLOW_UP_MAX follow-up attempts, spaced at least `days` apart;
+attempts are recorded in the store so later runs do not message the same profiles again.
+Only sends and failures caused by the profile count as attempts: an outage, an open circuit
+breaker or a used-up quota leaves the candidates due for the next run.
+"""
 from datetime import datetime, timedelta
 
+from config import settings
 from utils.logger import info, error
-from automation.send_message import send_message
+from utils.storage import get_store
+from utils.timing import timed
+from utils.quota import get_ledger
+from automation.send_message import CIRCUIT_OPEN, FAILED, NO_QUOTA, SENT, message_profile
 
 
-def load_sent_requests(path):
-    try:
-        return pd.read_csv(path)
-    except Exception:
-        return pd.DataFrame()
-
-
-def follow_up_unanswered(driver, sent_csv: str, responses_csv: str, days: int = 5, message: str = None):
+@timed('follow_up')
+def follow_up_unanswered(driver, store=None, days: int = None, message: str = None, max_follow_ups: int = None,
+                         chunk_size: int = 500):
     """Send follow-up messages to profiles that haven't responded after `days` days."""
-    sent = load_sent_requests(sent_csv)
-    try:
-        responses = pd.read_csv(responses_csv)
-    except Exception:
-        responses = pd.DataFrame()
-
-    if sent.empty:
-        info('follow_up', 'No sent requests to evaluate')
-        return 0
-
-    sent['request_sent_at'] = pd.to_datetime(sent['request_sent_at'])
+    store = store or get_store()
+    days = settings.FOLLOW_UP_DAYS if days is None else days
+    max_follow_ups = settings.FOLLOW_UP_MAX if max_follow_ups is None else max_follow_ups
+    message = message or "Hi, just following up — would love to connect!"
     cutoff = datetime.utcnow() - timedelta(days=days)
-    candidates = sent[sent['request_sent_at'] <= cutoff]
-
-    # Exclude those with responses
-    if not responses.empty and 'profile_url' in responses.columns:
-        candidates = candidates[~candidates['profile_url'].isin(responses['profile_url'])]
 
     count = 0
-    for _, row in candidates.iterrows():
-        profile = row.get('profile_url')
-        try:
-            if send_message(driver, profile, message or "Hi, just following up — would love to connect!"):
-                count += 1
-        except Exception as e:
-            error('follow_up', f'Failed follow-up to {profile}: {e}')
+    evaluated = 0
+    ledger = get_ledger()
+    for chunk in store.iter_follow_up_candidates(cutoff, cutoff, max_follow_ups, chunk_size=chunk_size):
+        for row in chunk:
+            # stop before loading profiles that could not be messaged today
+            if ledger.remaining('follow_up') <= 0:
+                info('follow_up', f'Daily follow-up quota reached after {count} follow-ups')
+                return count
+            evaluated += 1
+            profile = row.get('profile_url')
+            try:
+                outcome = message_profile(driver, profile, message, action='follow_up')
+            except Exception as e:
+                error('follow_up', f'Failed follow-up to {profile}: {e}')
+                continue
+            if outcome == NO_QUOTA:
+                info('follow_up', f'Daily follow-up quota reached after {count} follow-ups')
+                return count
+            if outcome == CIRCUIT_OPEN:
+                info('follow_up', f'Navigation unavailable; stopping after {count} follow-ups')
+                return count
+            if outcome not in (SENT, FAILED):
+                continue
+            count += outcome == SENT
+            store.record_follow_ups([{'profile_url': profile, 'sent_at': datetime.utcnow().isoformat(),
+                                      'status': outcome, 'message': message}])
+
+    if not evaluated:
+        info('follow_up', 'No sent requests to evaluate')
+        return 0
     info('follow_up', f'Sent {count} follow-ups')
     return count
@@ -0,0 +1,217 @@
+"""Ranks the whole lead pool so each run spends its daily connection requests on the best leads.
+A lead's score is its estimated chance of accepting times (1 + relevance):
+- the chance of accepting is the acceptance rate (a response to a successful request, as counted
+  by the funnel rollups) of its company, shrunk toward the rate of its role, which is in turn
+  shrunk toward the overall rate (LEAD_SCORE_PRIOR requests' worth of weight), so sparse history
+  does not dominate
+- relevance (0-1) is the weighted match of role against the searched job titles and seniority
+  levels, location against the searched locations, and role and company against the keywords
+Profiles whose connection request failed (no Connect button, invite pending, ...) are left out
+for LEAD_RETRY_DAYS after the failure and for good after LEAD_MAX_ATTEMPTS failures.
+Uncontacted leads are read from the store in chunks of LEAD_SCORE_CHUNK rows on a separate
+read-only connection, scored with vectorized pandas string matching, and the best k are kept in a
+heap, so memory stays bounded on pools of millions of leads.
+Run as: python -m automation.lead_scoring top [k] [config_path]
+"""
+import heapq
+import json
+import re
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from config import settings
+from automation.query_planner import PlannedQuery, plan_queries
+from dashboard.funnel import funnel_table, update_funnel
+from utils.logger import info
+from utils.storage import get_store
+from utils.timing import timed
+
+# relevance weights; components without targets (e.g. no keywords configured) are left out
+WEIGHTS = {'title': 0.45, 'location': 0.2, 'keywords': 0.2, 'level': 0.15}
+# page cache of the pool scan; the contacted check probes sent_requests once per lead
+SCAN_CACHE_KB = 128 * 1024
+# role words that count as each seniority term of the query planner
+LEVEL_WORDS = {
+    'Intern': ['intern', 'internship'],
+    'Junior': ['junior', 'jr', 'graduate', 'entry'],
+    'Associate': ['associate'],
+    'Senior': ['senior', 'sr', 'lead', 'staff', 'principal'],
+    'Director': ['director', 'head'],
+    'VP': ['vp', 'vice president', 'chief', 'cto', 'ceo'],
+}
+
+# uncontacted leads, minus profiles whose request failed recently or too often
+POOL_SQL = """
+SELECT l.profile_url, l.name, l.role, l.company, l.location, l.query
+FROM leads l
+WHERE COALESCE(l.name, '') != ''
+  AND NOT EXISTS (SELECT 1 FROM sent_requests s WHERE s.profile_url = l.profile_url
+                  AND (s.status = 'sent' OR s.request_sent_at >= :retry_after))
+  AND (SELECT COUNT(*) FROM sent_requests s WHERE s.profile_url = l.profile_url AND s.status = 'failed')
+      < :max_attempts
+"""
+
+
+def _words_pattern(words) -> str:
+    return r'\b(?:' + '|'.join(re.escape(w.lower()) for w in words) + r')\b'
+
+
+def _norm(series: pd.Series) -> pd.Series:
+    return series.fillna('').astype(str).str.lower().str.strip()
+
+
+def _counts(table: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Sent and accepted profiles per normalized value of a funnel dimension."""
+    if table.empty:
+        return pd.DataFrame({'sent': [], 'accepted': []})
+    table = table.reset_index()
+    return table.assign(value=_norm(table[column])).groupby('value')[['sent', 'accepted']].sum()
+
+
+class LeadScorer:
+    """Scores lead frames against the searched titles, locations, keywords and seniority levels."""
+
+    def __init__(self, titles=(), locations=(), keywords=(), levels=()):
+        self.titles = sorted({t.lower() for t in titles if t})
+        self.locations = sorted({l.lower() for l in locations if l})
+        self.keywords = sorted({k.lower() for k in keywords if k})
+        self.levels = sorted({l for l in levels if l in LEVEL_WORDS})
+        self.rates = None
+
+    @classmethod
+    def from_queries(cls, queries) -> 'LeadScorer':
+        """Targets of the run's queries; free-text queries count as keywords."""
+        titles, locations, keywords, levels = set(), set(), set(), set()
+        for q in queries:
+            if isinstance(q, PlannedQuery):
+                titles.add(q.title)
+                locations.add(q.location)
+                keywords.update(q.keywords)
+                levels.update(q.levels)
+            else:
+                keywords.update(str(q).split())
+        return cls(titles, locations, keywords, levels)
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> 'LeadScorer':
+        return cls.from_queries(plan_queries(cfg))
+
+    def load_rates(self, store) -> 'LeadScorer':
+        """Smoothed acceptance rates per role and per company, from the funnel rollups."""
+        prior = settings.LEAD_SCORE_PRIOR
+        update_funnel(store)
+        roles = _counts(funnel_table(store, 'role'), 'role')
+        companies = _counts(funnel_table(store, 'company'), 'company')
+        # with no history yet every lead gets the same chance and relevance decides
+        overall = (roles['accepted'].sum() + 1) / (roles['sent'].sum() + 2)
+        self.rates = {
+            'overall': overall,
+            'role': ((roles['accepted'] + prior * overall) / (roles['sent'] + prior)).to_dict(),
+            'company': companies,
+        }
+        return self
+
+    def relevance(self, frame: pd.DataFrame) -> np.ndarray:
+        role = _norm(frame['role'])
+        parts, weights = [], []
+        if self.titles:
+            # best title by share of its words found in the role
+            best = np.zeros(len(frame))
+            for title in self.titles:
+                words = title.split()
+                hits = sum(role.str.contains(_words_pattern([w]), regex=True).to_numpy() for w in words)
+                best = np.maximum(best, hits / len(words))
+            parts.append(best)
+            weights.append(WEIGHTS['title'])
+        if self.locations:
+            location = _norm(frame['location'])
+            # whole words, so 'india' does not match 'Indiana' or 'British Indian Ocean Territory'
+            parts.append(location.str.contains(_words_pattern(self.locations), regex=True).to_numpy())
+            weights.append(WEIGHTS['location'])
+        if self.keywords:
+            text = role + ' ' + _norm(frame['company'])
+            hits = sum(text.str.contains(_words_pattern([k]), regex=True).to_numpy() for k in self.keywords)
+            parts.append(hits / len(self.keywords))
+            weights.append(WEIGHTS['keywords'])
+        if self.levels:
+            words = [w for level in self.levels for w in LEVEL_WORDS[level]]
+            parts.append(role.str.contains(_words_pattern(words), regex=True).to_numpy())
+            weights.append(WEIGHTS['level'])
+        if not parts:
+            return np.zeros(len(frame))
+        return np.average(np.vstack(parts).astype(float), axis=0, weights=weights)
+
+    def acceptance(self, frame: pd.DataFrame) -> np.ndarray:
+        """Chance of accepting: company rate shrunk toward the role rate, itself shrunk toward overall.
+        Needs `load_rates` first."""
+        prior = settings.LEAD_SCORE_PRIOR
+        rates = self.rates
+        role_rate = _norm(frame['role']).map(rates['role']).fillna(rates['overall']).to_numpy(dtype=float)
+        company = _norm(frame['company'])
+        sent = company.map(rates['company']['sent']).fillna(0).to_numpy(dtype=float)
+        accepted = company.map(rates['company']['accepted']).fillna(0).to_numpy(dtype=float)
+        return (accepted + prior * role_rate) / (sent + prior)
+
+    def score(self, frame: pd.DataFrame) -> np.ndarray:
+        return self.acceptance(frame) * (1 + self.relevance(frame))
+
+
+@timed('lead_scoring')
+def top_leads(store, scorer: LeadScorer, k: int, exclude=(), chunk_size: int = None) -> list:
+    """The `k` best-scoring uncontacted leads of the pool (lead dicts with a `score`), best first.
+    Profile URLs in `exclude` (e.g. leads already in the current run) are passed over."""
+    if k <= 0:
+        return []
+    chunk_size = chunk_size or settings.LEAD_SCORE_CHUNK
+    if scorer.rates is None:
+        scorer.load_rates(store)
+    exclude = set(exclude)
+    # min-heap of (score, -row number, lead): the weakest of the best k is on top, ties keep the older lead
+    heap = []
+    scanned = 0
+    # WAL lets this read-only connection scan while the pipeline keeps writing through the store
+    conn = sqlite3.connect(f'file:{store.path}?mode=ro', uri=True)
+    conn.execute(f'PRAGMA cache_size=-{SCAN_CACHE_KB}')
+    try:
+        params = {'retry_after': (datetime.utcnow() - timedelta(days=settings.LEAD_RETRY_DAYS)).isoformat(),
+                  'max_attempts': settings.LEAD_MAX_ATTEMPTS}
+        for frame in pd.read_sql_query(POOL_SQL, conn, params=params, chunksize=chunk_size):
+            if exclude:
+                frame = frame[~frame['profile_url'].isin(exclude)]
+            if frame.empty:
+                continue
+            scores = scorer.score(frame)
+            # only a chunk's own top k can make it into the heap
+            if len(frame) > k:
+                best = np.argpartition(-scores, k - 1)[:k]
+            else:
+                best = np.arange(len(frame))
+            records = frame.iloc[best].to_dict('records')
+            for i, lead in zip(best, records):
+                item = (float(scores[i]), -(scanned + int(i)), lead)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, item)
+            scanned += len(frame)
+    finally:
+        conn.close()
+    ranked = sorted(heap, key=lambda item: item[:2], reverse=True)
+    info('lead_scoring', f'Picked {len(ranked)} of {scanned} uncontacted leads')
+    return [dict(lead, score=round(score, 4)) for score, _row, lead in ranked]
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'top':
+        print('Usage: python -m automation.lead_scoring top [k] [config_path]')
+        sys.exit(1)
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else settings.MAX_DAILY_CONNECTIONS
+    with open(sys.argv[3] if len(sys.argv) > 3 else 'config/linkedin_config.json', encoding='utf-8') as f:
+        scorer = LeadScorer.from_config(json.load(f))
+    for lead in top_leads(get_store(), scorer, k):
+        print(f"{lead['score']:.4f}", lead['name'], lead['role'], lead['company'], lead['location'],
+              lead['profile_url'], sep='\t')
@@ -0,0 +1,190 @@
+"""Named element locators with ordered alternatives, explicit waits and adaptive ordering.
+Each locator lists CSS alternatives first and XPath fallbacks after. Lookups poll all
+alternatives under one short explicit wait (the driver's implicit wait stays at 0), try the
+alternative that last succeeded first, and count hits, fallbacks and misses per locator.
+Order and counters persist in LOCATOR_STATS_PATH, so UI changes show up as metrics.
+Run as: python -m automation.locators stats
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config import settings
+from utils.logger import info, error
+from utils.timing import span
+
+CSS, XPATH = By.CSS_SELECTOR, By.XPATH
+
+LOCATORS = {
+    'login.username': [(CSS, '#username'), (CSS, "input[name='session_key']")],
+    'login.password': [(CSS, '#password'), (CSS, "input[name='session_password']")],
+    'login.submit': [(CSS, "button[type='submit']"), (XPATH, "//button[contains(., 'Sign in')]")],
+    'search.box': [(CSS, "input[placeholder*='Search']"), (XPATH, "//input[contains(@placeholder, 'Search')]")],
+    'search.people_tab': [(XPATH, "//button[normalize-space()='People']"), (XPATH, "//button[contains(., 'People')]")],
+    'profile.connect': [
+        (CSS, "main button[aria-label^='Invite'][aria-label$='to connect']"),
+        (XPATH, "//main//button[normalize-space()='Connect']"),
+        (XPATH, "//button[contains(., 'Connect')]"),
+    ],
+    'profile.more_actions': [
+        (CSS, "main button[aria-label='More actions']"),
+        (XPATH, "//button[contains(@aria-label, 'More actions') or contains(., 'More')]"),
+    ],
+    'profile.menu_connect': [
+        (CSS, "[role='menu'] div[aria-label^='Invite'][aria-label$='to connect']"),
+        (XPATH, "//div[contains(@role,'menu')]//span[contains(.,'Connect')]/.."),
+    ],
+    'profile.message': [(CSS, "main button[aria-label^='Message']"), (XPATH, "//button[contains(., 'Message')]")],
+    'connect.add_note': [(CSS, "button[aria-label='Add a note']"), (XPATH, "//button[contains(., 'Add a note')]")],
+    'connect.note': [(CSS, "textarea[name='message']"), (CSS, '[role="dialog"] textarea'), (CSS, 'textarea')],
+    'connect.send': [(CSS, "button[aria-label='Send invitation']"), (CSS, "button[aria-label='Send now']"),
+                     (XPATH, "//button[contains(., 'Send')]")],
+    'message.textbox': [(CSS, "div[role='textbox'][contenteditable='true']"),
+                        (XPATH, "//div[contains(@role,'textbox') and @contenteditable='true']")],
+    'message.send': [(CSS, 'button.msg-form__send-button'), (XPATH, "//button[contains(., 'Send')]")],
+}
+
+
+def _ready(element, condition: str) -> bool:
+    if condition == 'present':
+        return True
+    if condition == 'visible':
+        return element.is_displayed()
+    return element.is_displayed() and element.is_enabled()  # clickable
+
+
+class LocatorRegistry:
+    """Resolves locator names to elements and learns which alternative currently works."""
+
+    def __init__(self, locators: dict = None, path: str = None):
+        self.locators = locators or LOCATORS
+        self.path = path or settings.LOCATOR_STATS_PATH
+        self.stats = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.stats = json.load(f)
+        except FileNotFoundError:
+            self.stats = {}
+        except Exception as e:
+            error('locators', f'Failed to load {self.path}: {e}')
+            self.stats = {}
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                tmp = f'{self.path}.tmp'
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(self.stats, f, indent=1, sort_keys=True)
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except Exception as e:
+                error('locators', f'Failed to save {self.path}: {e}')
+
+    def _entry(self, name: str) -> dict:
+        return self.stats.setdefault(name, {'preferred': None, 'hits': 0, 'fallbacks': 0, 'misses': 0,
+                                            'last_miss': None})
+
+    def alternatives(self, name: str) -> list:
+        """The locator's alternatives with the last successful one first."""
+        alts = list(self.locators[name])
+        preferred = self.stats.get(name, {}).get('preferred')
+        for i, (by, value) in enumerate(alts):
+            if f'{by}={value}' == preferred:
+                alts.insert(0, alts.pop(i))
+                break
+        return alts
+
+    def _record(self, name: str, alt=None):
+        with self._lock:
+            entry = self._entry(name)
+            if alt is None:
+                entry['misses'] += 1
+                entry['last_miss'] = datetime.utcnow().isoformat()
+            else:
+                entry['hits'] += 1
+                if alt != tuple(self.locators[name][0]):
+                    entry['fallbacks'] += 1
+                key = f'{alt[0]}={alt[1]}'
+                if key != entry['preferred']:
+                    info('locators', f'{name}: now trying {key} first')
+                    entry['preferred'] = key
+            self._dirty = True
+
+    def find_first(self, driver, names, timeout: float = None, condition: str = 'clickable'):
+        """Wait up to `timeout` seconds for any of the named locators; returns (name, element).
+        Raises TimeoutException (and counts a miss for each name) when none shows up."""
+        names = [names] if isinstance(names, str) else list(names)
+        candidates = [(name, alt) for name in names for alt in self.alternatives(name)]
+
+        def locate(d):
+            for name, (by, value) in candidates:
+                for element in d.find_elements(by, value):
+                    try:
+                        if _ready(element, condition):
+                            return name, (by, value), element
+                    except Exception:
+                        continue
+            return False
+
+        timeout = settings.LOCATOR_TIMEOUT if timeout is None else timeout
+        with span('locators', '|'.join(names), 'find'):
+            try:
+                name, alt, element = WebDriverWait(driver, timeout, poll_frequency=0.1).until(locate)
+            except TimeoutException:
+                for n in names:
+                    self._record(n)
+                raise TimeoutException(f"No element for locator {' or '.join(names)} within {timeout}s")
+        self._record(name, alt)
+        return name, element
+
+    def find(self, driver, name: str, timeout: float = None, condition: str = 'clickable'):
+        return self.find_first(driver, [name], timeout, condition)[1]
+
+    def report(self) -> dict:
+        with self._lock:
+            return {name: dict(entry) for name, entry in sorted(self.stats.items())}
+
+
+_registry = None
+
+
+def get_registry() -> LocatorRegistry:
+    global _registry
+    if _registry is None:
+        _registry = LocatorRegistry()
+    return _registry
+
+
+def find(driver, name: str, timeout: float = None, condition: str = 'clickable'):
+    """Shortcut for get_registry().find."""
+    return get_registry().find(driver, name, timeout, condition)
+
+
+@atexit.register
+def save_registry():
+    """Write the shared registry's stats if it was used; called after each run and at exit."""
+    if _registry is not None:
+        _registry.save()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'stats':
+        print('Usage: python -m automation.locators stats')
+        sys.exit(1)
+    for name, entry in get_registry().report().items():
+        print(name, entry, sep='\t')
@@ -1,45 +1,89 @@
 """Login helpers using Selenium with safe waits and validations."""
 from selenium import webdriver
-from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+import os
 import time
 
 from config import settings
 from utils.logger import info, error
+from utils.timing import span, timed
+from automation.locators import find
 
+# Background features the automation never needs
+LEAN_CHROME_ARGS = [
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-features=Translate,MediaRouter,OptimizationHints',
+    '--mute-audio',
+    '--no-first-run',
+]
 
-def create_driver(headless: bool = True):
+
+@timed('login', 'create_driver', 'startup')
+def create_driver(headless: bool = True, profile_dir: str = None, lean: bool = None):
+    """Start Chrome; with `profile_dir` its cookies and storage persist between runs.
+    In lean mode (LEAN_MODE unless `lean` is given) `driver.get` returns at DOMContentLoaded and
+    `use_flow` blocks heavy resources."""
+    lean = settings.LEAN_MODE if lean is None else lean
     opts = Options()
     if headless:
         opts.add_argument('--headless=new')
+    if lean:
+        opts.page_load_strategy = 'eager'
+        for arg in LEAN_CHROME_ARGS:
+            opts.add_argument(arg)
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        opts.add_argument(f'--user-data-dir={os.path.abspath(profile_dir)}')
     opts.add_argument('--disable-gpu')
     opts.add_argument('--no-sandbox')
     driver = webdriver.Chrome(options=opts)
     driver.set_page_load_timeout(settings.PAGE_LOAD_TIMEOUT)
     driver.implicitly_wait(settings.IMPLICIT_WAIT)
+    driver.lean_mode = lean
+    driver.resource_blocking = False
     return driver
 
 
+def set_resource_blocking(driver, enabled: bool):
+    """Block (or stop blocking) LEAN_BLOCKED_URLS for the driver's later requests via DevTools."""
+    if getattr(driver, 'resource_blocking', False) == enabled:
+        return
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': settings.LEAN_BLOCKED_URLS if enabled else []})
+        driver.resource_blocking = enabled
+    except Exception as e:
+        error('login', f'Resource blocking unavailable, continuing without it: {e}')
+        driver.lean_mode = False
+
+
+def use_flow(driver, flow: str):
+    """Apply the resource blocking configured for `flow` (login, search, connect, message) in lean mode."""
+    if getattr(driver, 'lean_mode', False):
+        set_resource_blocking(driver, flow in settings.LEAN_FLOWS)
+
+
+@timed('login')
 def login(driver, email: str, password: str) -> bool:
     """Perform LinkedIn login using provided driver. Returns True on success."""
+    use_flow(driver, 'login')
     try:
-        driver.get('https://www.linkedin.com/login')
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, 'username')))
-        username = driver.find_element(By.ID, 'username')
-        pwd = driver.find_element(By.ID, 'password')
+        with span('login', 'driver.get', 'page'):
+            driver.get(f'{settings.LINKEDIN_BASE_URL}/login')
+        username = find(driver, 'login.username', timeout=10)
+        pwd = find(driver, 'login.password')
         username.clear()
         username.send_keys(email)
         pwd.clear()
         pwd.send_keys(password)
-        btn = driver.find_element(By.XPATH, "//button[@type='submit']")
-        btn.click()
+        find(driver, 'login.submit').click()
         # Wait for successful login - presence of profile avatar or search box
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.XPATH, "//input[contains(@placeholder, 'Search')]"))
-        )
+        find(driver, 'search.box', timeout=15, condition='present')
         info('login', 'Logged in successfully')
         return True
     except TimeoutException as e:
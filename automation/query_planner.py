@@ -0,0 +1,233 @@
+"""Plans people searches from config/linkedin_config.json and remembers how far each one got.
+Each job title x location becomes one people-search URL the driver opens directly: the title
+goes to the title filter, known locations to the geo filter (others into the keywords), and
+`keywords` and `experience_levels` become OR-groups in the keyword search. Queries that differ
+only in case, spacing or term order are planned once.
+Progress per query (pages harvested, whether results ran out) is kept in the lead store's
+`query_cache` table for QUERY_CACHE_TTL seconds. Within the TTL a rerun first serves the query's
+stored, still uncontacted leads and then opens the first page not harvested yet.
+Run as: python -m automation.query_planner [config_path]
+"""
+import hashlib
+import json
+import sys
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+from config import settings
+from automation.search_profiles import collect_results, count_cards, has_next_page, open_search_url
+from utils.logger import info, error
+from utils.storage import get_store
+from utils.timing import timed
+
+# LinkedIn geo ids for the people-search location filter
+GEO_URNS = {
+    'united states': '103644278',
+    'india': '102713980',
+    'united kingdom': '101165590',
+    'canada': '101174742',
+    'germany': '101282230',
+    'australia': '101452733',
+}
+# People search has no seniority filter; experience levels become these keywords instead
+EXPERIENCE_TERMS = {
+    'internship': 'Intern',
+    'entry level': 'Junior',
+    'associate': 'Associate',
+    'mid-senior level': 'Senior',
+    'director': 'Director',
+    'executive': 'VP',
+}
+# LinkedIn stops paginating people search after this many pages
+MAX_PAGES = 100
+# Leads kept from one results page (the whole page is harvested so no page is visited twice)
+PAGE_HARVEST_LIMIT = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS query_cache (
+    query_key TEXT PRIMARY KEY,
+    label TEXT,
+    pages INTEGER DEFAULT 0,
+    exhausted INTEGER DEFAULT 0,
+    harvested INTEGER DEFAULT 0,
+    started_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_leads_query ON leads(query, extracted_at);
+"""
+
+
+def _clean(text) -> str:
+    return ' '.join(str(text or '').split())
+
+
+def _term(text: str) -> str:
+    return f'"{text}"' if ' ' in text else text
+
+
+def _or_group(terms) -> str:
+    terms = [_term(t) for t in terms]
+    return terms[0] if len(terms) == 1 else f"({' OR '.join(terms)})"
+
+
+def _unique(values) -> list:
+    """Cleaned, non-empty values without case-insensitive duplicates, in first-seen order."""
+    seen, out = set(), []
+    for value in values or []:
+        value = _clean(value)
+        if value and value.lower() not in seen:
+            seen.add(value.lower())
+            out.append(value)
+    return out
+
+
+class PlannedQuery:
+    """One people search: title and location filters plus keyword and seniority OR-groups."""
+
+    def __init__(self, title: str = '', location: str = '', keywords=(), levels=()):
+        self.title = _clean(title)
+        self.location = _clean(location)
+        self.keywords = sorted(_unique(keywords), key=str.lower)
+        self.levels = sorted(_unique(EXPERIENCE_TERMS.get(_clean(l).lower(), '') for l in levels), key=str.lower)
+
+    @property
+    def label(self) -> str:
+        """Human-readable name, stored as the leads' `query`."""
+        return ' / '.join(part for part in (self.title, self.location) if part) or 'all'
+
+    def params(self) -> dict:
+        groups = [_or_group(g) for g in (self.keywords, self.levels) if g]
+        geo = GEO_URNS.get(self.location.lower())
+        if self.location and not geo:
+            groups.append(_term(self.location))
+        params = {}
+        if groups:
+            params['keywords'] = ' AND '.join(groups)
+        if self.title:
+            params['titleFreeText'] = self.title
+        if geo:
+            params['geoUrn'] = json.dumps([geo])
+        return params
+
+    @property
+    def key(self) -> str:
+        """Identical for equivalent queries (case, spacing and term order do not matter)."""
+        canonical = json.dumps(self.params(), sort_keys=True).lower()
+        return hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:16]
+
+    def url(self, page: int = 1) -> str:
+        params = dict(self.params(), origin='FACETED_SEARCH', page=page)
+        return f'{settings.LINKEDIN_BASE_URL}/search/results/people/?{urlencode(params)}'
+
+    def __repr__(self):
+        return f'PlannedQuery({self.label!r}, key={self.key})'
+
+
+def plan_queries(cfg: dict) -> list:
+    """One query per job title x location (either may be missing), deduplicated by `key`."""
+    titles = _unique(cfg.get('job_titles')) or ['']
+    locations = _unique(cfg.get('locations')) or ['']
+    unknown = [l for l in _unique(cfg.get('experience_levels')) if l.lower() not in EXPERIENCE_TERMS]
+    if unknown:
+        error('query_planner', f'Ignoring unknown experience levels: {unknown}')
+    planned, keys = [], set()
+    for title in titles:
+        for location in locations:
+            query = PlannedQuery(title, location, cfg.get('keywords'), cfg.get('experience_levels'))
+            if not (query.title or query.location or query.keywords) or query.key in keys:
+                continue
+            keys.add(query.key)
+            planned.append(query)
+    info('query_planner', f'Planned {len(planned)} searches')
+    return planned
+
+
+class QueryCache:
+    """Per-query harvest progress, kept in the lead store next to the harvested leads."""
+
+    def __init__(self, store=None, ttl: float = None):
+        self.store = store or get_store()
+        self.ttl = settings.QUERY_CACHE_TTL if ttl is None else ttl
+        with self.store._lock:
+            self.store.conn.executescript(SCHEMA)
+
+    def _cutoff(self) -> str:
+        return (datetime.utcnow() - timedelta(seconds=self.ttl)).isoformat()
+
+    def get(self, query: PlannedQuery):
+        """The query's progress row, or None if it was never run or its TTL has passed."""
+        rows = self.store.query('SELECT * FROM query_cache WHERE query_key = ? AND started_at >= ?',
+                                (query.key, self._cutoff()))
+        return rows[0] if rows else None
+
+    def update(self, query: PlannedQuery, pages: int, exhausted: bool, harvested: int):
+        now = datetime.utcnow().isoformat()
+        with self.store._lock, self.store.conn:
+            self.store.conn.execute(
+                'INSERT INTO query_cache (query_key, label, pages, exhausted, harvested, started_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(query_key) DO UPDATE SET pages=excluded.pages, '
+                'exhausted=excluded.exhausted, harvested=query_cache.harvested + excluded.harvested, '
+                'updated_at=excluded.updated_at',
+                (query.key, query.label, pages, int(exhausted), harvested, now, now),
+            )
+
+    def reset(self, query: PlannedQuery):
+        with self.store._lock, self.store.conn:
+            self.store.conn.execute('DELETE FROM query_cache WHERE query_key = ?', (query.key,))
+
+    def prune(self) -> int:
+        """Delete progress rows past their TTL; returns how many."""
+        with self.store._lock, self.store.conn:
+            return self.store.conn.execute('DELETE FROM query_cache WHERE started_at < ?', (self._cutoff(),)).rowcount
+
+    def cached_leads(self, query: PlannedQuery, index=None) -> list:
+        """Leads this query harvested within the TTL that the contacted `index` does not skip."""
+        rows = self.store.query('SELECT * FROM leads WHERE query = ? AND extracted_at >= ? ORDER BY extracted_at',
+                                (query.label, self._cutoff()))
+        return [r for r in rows if r.get('name') and (index is None or not index.should_skip(r['profile_url']))]
+
+
+@timed('query_planner')
+def run_query(driver, query: PlannedQuery, max_results: int = 10, store=None, index=None, cache=None) -> list:
+    """Return up to `max_results` leads for a planned query: first the ones cached from earlier
+    runs, then whole new result pages, opened by URL, starting after the last harvested page."""
+    store = store or get_store()
+    cache = cache or QueryCache(store)
+    results = cache.cached_leads(query, index)[:max_results]
+    if results:
+        info('query_planner', f'{len(results)} cached leads for {query.label}')
+    entry = cache.get(query)
+    if entry is None:
+        cache.reset(query)
+    page = entry['pages'] if entry else 0
+    exhausted = bool(entry and entry['exhausted'])
+    fetched = 0
+    try:
+        while len(results) < max_results and not exhausted and fetched < settings.QUERY_PAGES_PER_RUN:
+            page += 1
+            fetched += 1
+            found = []
+            if not open_search_url(driver, query.url(page)):
+                # no cards in time: a slow page, a login wall or a captcha as much as the end of the
+                # results, so the page is neither counted as harvested nor taken as the last one
+                error('query_planner', f'No results shown for {query.label} on page {page}; will retry next run')
+                page -= 1
+                break
+            collect_results(driver, query.label, PAGE_HARVEST_LIMIT, index, max_pages=1, results=found)
+            store.add_leads(found)
+            # an empty page, or no enabled 'Next' button once the page is loaded, ends the results
+            exhausted = page >= MAX_PAGES or count_cards(driver) == 0 or not has_next_page(driver)
+            cache.update(query, page, exhausted, len(found))
+            results.extend(found[:max_results - len(results)])
+    except Exception as e:
+        error('query_planner', f'Search failed for {query.label} on page {page}: {e}')
+    info('query_planner', f'{len(results)} leads for {query.label} ({fetched} pages fetched, '
+                          f'{page} harvested{", exhausted" if exhausted else ""})')
+    return results
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else 'config/linkedin_config.json'
+    with open(path, encoding='utf-8') as f:
+        for q in plan_queries(json.load(f)):
+            print(q.key, q.label, q.url(), sep='\t')
@@ -1,84 +1,208 @@
 """Search LinkedIn profiles, scroll and extract basic profile metadata.
 This is a simple implementation; LinkedIn UI changes frequently so selectors may need updates.
 """
-from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
-import csv
-import os
+from selenium.common.exceptions import TimeoutException
 from datetime import datetime
 
-from utils.helpers import random_delay
+from config import settings
+from utils.helpers import random_delay, normalize_profile_url
+from automation.login import use_flow
+from automation.locators import find
 from utils.logger import info, error
+from utils.resilience import call, get_breaker
+from utils.timing import span, timed
 
+CARD_SELECTOR = "[class*='reusable-search__result-container']"
+NEXT_BUTTON_SELECTOR = "button[aria-label='Next']:not([disabled])"
 
-def search_profiles(driver, query: str, max_results: int = 20, output_csv: str = None):
-    """Search for profiles by query and save results to CSV.
-    Returns list of dicts with profile_url, name, role, company, location
+# Extracts every result card not returned before in one round trip. Cards are de-duplicated
+# in the page by profile URL (without query string); missing fields come back as null.
+EXTRACT_CARDS_JS = """
+const reset = arguments[0];
+if (reset || !window.__searchSeenProfiles) { window.__searchSeenProfiles = new Set(); }
+const seen = window.__searchSeenProfiles;
+const text = (root, selector) => {
+    const el = root.querySelector(selector);
+    const value = el ? el.innerText.trim() : '';
+    return value || null;
+};
+const cards = [];
+for (const card of document.querySelectorAll(arguments[1])) {
+    const link = card.querySelector("a[href*='/in/']");
+    if (!link || !link.href) { continue; }
+    const key = link.href.split('?')[0].replace(/\\/+$/, '');
+    if (seen.has(key)) { continue; }
+    seen.add(key);
+    cards.push({
+        profile_url: link.href,
+        name: text(card, "[class*='entity-result__title-text']"),
+        subtitle: text(card, "[class*='entity-result__primary-subtitle']"),
+        location: text(card, "[class*='entity-result__secondary-subtitle']"),
+    });
+}
+return cards;
+"""
+
+
+def extract_cards(driver, reset: bool = False) -> list:
+    """Return new result cards as dicts (profile_url, name, subtitle, location) in one script call."""
+    return driver.execute_script(EXTRACT_CARDS_JS, reset, CARD_SELECTOR) or []
+
+
+def count_cards(driver) -> int:
+    return driver.execute_script('return document.querySelectorAll(arguments[0]).length;', CARD_SELECTOR)
+
+
+def _first_card_url(driver):
+    return driver.execute_script(
+        "const a = document.querySelector(arguments[0] + \" a[href*='/in/']\"); return a ? a.href : null;",
+        CARD_SELECTOR,
+    )
+
+
+def _next_button(driver):
+    # looked up by script so a missing button does not cost the implicit wait
+    return driver.execute_script(
+        'const b = document.querySelector(arguments[0]); return b && b.offsetParent !== null ? b : null;',
+        NEXT_BUTTON_SELECTOR,
+    )
+
+
+def wait_for_results(driver, more_than: int = 0, timeout: float = None, allow_next: bool = False) -> bool:
+    """Wait until more than `more_than` result cards are shown (or, with `allow_next`, a Next
+    button appears). Returns as soon as the condition holds; False after `timeout` seconds."""
+    def ready(d):
+        return count_cards(d) > more_than or (allow_next and _next_button(d) is not None)
+    try:
+        with span('search_profiles', 'wait:results', 'wait'):
+            WebDriverWait(driver, timeout or settings.SEARCH_WAIT_TIMEOUT, poll_frequency=0.1).until(ready)
+        return True
+    except TimeoutException:
+        return False
+
+
+def has_next_page(driver) -> bool:
+    return _next_button(driver) is not None
+
+
+def go_to_next_page(driver, timeout: float = None) -> bool:
+    """Click the enabled 'Next' pagination button and wait for the next page's cards."""
+    button = _next_button(driver)
+    if button is None:
+        return False
+    first_url = _first_card_url(driver)
+    driver.execute_script("arguments[0].scrollIntoView({block: 'center'}); arguments[0].click();", button)
+    try:
+        with span('search_profiles', 'wait:next_page', 'wait'):
+            WebDriverWait(driver, timeout or settings.SEARCH_WAIT_TIMEOUT, poll_frequency=0.1).until(
+                lambda d: _first_card_url(d) not in (None, first_url)
+            )
+        return True
+    except TimeoutException:
+        return False
+
+
+def open_search(driver, query: str) -> bool:
+    """Type `query` into the global search box and switch to People results; True once cards show."""
+    use_flow(driver, 'search')
+    search_box = find(driver, 'search.box', timeout=10, condition='present')
+    search_box.clear()
+    search_box.send_keys(query)
+    search_box.send_keys(Keys.RETURN)
+    # Click 'People' filter as soon as it is rendered
+    try:
+        people_tab = find(driver, 'search.people_tab', timeout=settings.SEARCH_WAIT_TIMEOUT)
+        url = driver.current_url
+        people_tab.click()
+        with span('search_profiles', 'wait:people_results', 'wait'):
+            WebDriverWait(driver, settings.SEARCH_WAIT_TIMEOUT, poll_frequency=0.1).until(EC.url_changes(url))
+    except Exception:
+        pass
+    return wait_for_results(driver)
+
+
+def open_search_url(driver, url: str) -> bool:
+    """Open a people-search results URL directly (see automation.query_planner); True once cards show.
+    Navigation errors propagate (after the navigation breaker's retries)."""
+    use_flow(driver, 'search')
+    with span('search_profiles', 'driver.get', 'page'):
+        call(driver.get, url, breaker=get_breaker('navigation'))
+    return wait_for_results(driver)
+
+
+def collect_results(driver, query: str, max_results: int = 20, index=None, max_pages: int = None,
+                    results: list = None) -> list:
+    """Extract leads from the results page the driver is on, loading more by infinite scroll
+    and then the 'Next' button (at most `max_pages` pages). Profiles the contacted `index` says
+    to skip are not returned and do not count towards `max_results`. Leads are appended to
+    `results` as they are found, so a caller keeps them if extraction fails midway."""
+    results = [] if results is None else results
+    # Collect cards, then load more by infinite scroll or the 'Next' button
+    collected = 0
+    first_batch = True
+    seen = set()
+    pages = 1
+    while collected < max_results:
+        with span('search_profiles', 'extract_cards', 'work'):
+            cards = extract_cards(driver, reset=first_batch)
+        first_batch = False
+        for card in cards:
+            profile_url = card.get('profile_url')
+            # cards without a name cannot be personalized
+            if not card.get('name'):
+                continue
+            key = normalize_profile_url(profile_url)
+            if key in seen:
+                continue
+            seen.add(key)
+            if index is not None and index.should_skip(profile_url):
+                continue
+            # attempt to parse role/company
+            role, company = ((card.get('subtitle') or '').split(' at ', 1) + [None])[:2]
+            results.append({
+                'profile_url': profile_url,
+                'name': card['name'].strip(),
+                'role': (role or '').strip(),
+                'company': (company or '').strip(),
+                'location': (card.get('location') or '').strip(),
+                'extracted_at': datetime.utcnow().isoformat(),
+                'query': query,
+            })
+            collected += 1
+            if collected >= max_results:
+                break
+        if collected >= max_results:
+            break
+        shown = count_cards(driver)
+        driver.execute_script('window.scrollTo(0, document.body.scrollHeight);')
+        if wait_for_results(driver, more_than=shown, allow_next=True) and count_cards(driver) > shown:
+            continue
+        if (max_pages and pages >= max_pages) or not go_to_next_page(driver):
+            break
+        pages += 1
+    return results
+
+
+@timed('search_profiles')
+def search_profiles(driver, query: str, max_results: int = 20, store=None, index=None):
+    """Search for profiles by query and save results to the lead store.
+    Profiles the contacted `index` says to skip (contacted before or already seen this run)
+    are not returned and do not count towards `max_results`.
+    Returns list of dicts with profile_url, name, role, company, location, extracted_at, query
     """
     results = []
     try:
-        search_box = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, "//input[contains(@placeholder, 'Search')]") )
-        )
-        search_box.clear()
-        search_box.send_keys(query)
-        search_box.send_keys(Keys.RETURN)
-        # Click 'People' filter
-        time.sleep(2)
-        try:
-            people_tab = driver.find_element(By.XPATH, "//button[contains(., 'People')]")
-            people_tab.click()
-        except Exception:
-            pass
-
-        # Scroll and collect profile cards
-        collected = 0
-        last_height = driver.execute_script('return document.body.scrollHeight')
-        while collected < max_results:
-            cards = driver.find_elements(By.XPATH, "//div[contains(@class,'reusable-search__result-container')]")
-            for card in cards[collected:]:
-                try:
-                    link = card.find_element(By.XPATH, ".//a[contains(@href,'/in/')]")
-                    profile_url = link.get_attribute('href')
-                    name = card.find_element(By.XPATH, ".//span[contains(@class,'entity-result__title-text')]").text
-                    subtitle = card.find_element(By.XPATH, ".//div[contains(@class,'entity-result__primary-subtitle')]").text
-                    # attempt to parse role/company
-                    role, company = (subtitle.split(' at ', 1) + [None])[:2]
-                    location = card.find_element(By.XPATH, ".//div[contains(@class,'entity-result__secondary-subtitle')]").text
-                    results.append({
-                        'profile_url': profile_url,
-                        'name': name.strip(),
-                        'role': (role or '').strip(),
-                        'company': (company or '').strip(),
-                        'location': location.strip(),
-                        'extracted_at': datetime.utcnow().isoformat()
-                    })
-                    collected += 1
-                    if collected >= max_results:
-                        break
-                except Exception:
-                    continue
-            # scroll
-            driver.execute_script('window.scrollTo(0, document.body.scrollHeight);')
-            time.sleep(2)
-            new_height = driver.execute_script('return document.body.scrollHeight')
-            if new_height == last_height:
-                break
-            last_height = new_height
-
-        # Save CSV
-        if output_csv:
-            os.makedirs(os.path.dirname(output_csv), exist_ok=True)
-            write_header = not os.path.exists(output_csv) or os.path.getsize(output_csv) == 0
-            with open(output_csv, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                if write_header:
-                    writer.writerow(['profile_url', 'name', 'role', 'company', 'location', 'extracted_at'])
-                for r in results:
-                    writer.writerow([r['profile_url'], r['name'], r['role'], r['company'], r['location'], r['extracted_at']])
+        if not open_search(driver, query):
+            info('search_profiles', f'No results for query: {query}')
+            return results
+        collect_results(driver, query, max_results, index, results=results)
+
+        # Save leads
+        if store is not None:
+            store.add_leads(results)
 
         info('search_profiles', f'Extracted {len(results)} profiles for query: {query}')
         return results
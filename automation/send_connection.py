@@ -1,64 +1,85 @@
 """Send connection requests and attach personalized notes."""
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import csv
-import os
 from datetime import datetime
 
+from selenium.common.exceptions import TimeoutException
+
 from utils.helpers import random_delay, safe_click
 from utils.logger import info, error
+from utils.timing import span, timed
+from automation.login import use_flow
+from automation.locators import find, get_registry
+from utils.resilience import PERMANENT, CircuitOpen, call, classify, get_breaker
+from utils.quota import get_ledger
+
+
+@timed('send_connection')
+def send_connection(driver, profile_url: str, note: str = None, store=None):
+    """Open profile_url and send connection request optionally with a note.
+    Takes a slot of the daily connection quota first; returns False without loading the
+    profile once the quota is used up."""
+    ledger = get_ledger()
+    if not ledger.try_acquire('connect'):
+        return False
+    sent = _send_connection(driver, profile_url, note, store)
+    if not sent:
+        ledger.release('connect')
+    return sent
 
 
-def send_connection(driver, profile_url: str, note: str = None, output_csv: str = None):
-    """Open profile_url and send connection request optionally with a note."""
+def _record(store, profile_url: str, note: str, status: str):
+    if store is not None:
+        store.record_sent([{
+            'profile_url': profile_url, 'name': '', 'role': '', 'company': '',
+            'request_sent_at': datetime.utcnow().isoformat(), 'status': status, 'note': note or '',
+        }])
+
+
+def _send_connection(driver, profile_url: str, note: str = None, store=None):
+    use_flow(driver, 'connect')
     try:
-        driver.get(profile_url)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
-        # Try to find Connect button
+        with span('send_connection', 'driver.get', 'page'):
+            call(driver.get, profile_url, breaker=get_breaker('navigation'))
+        # The Connect button is either on the profile or in the 'More' dropdown; wait for
+        # whichever shows up first instead of sitting out a miss on the direct button
         try:
-            connect_btn = driver.find_element(By.XPATH, "//button[contains(., 'Connect')]")
-            safe_click(driver, connect_btn)
-        except Exception:
-            # Sometimes the connect is in a dropdown
-            try:
-                more_btn = driver.find_element(By.XPATH, "//button[contains(@aria-label, 'More actions') or contains(., 'More')]")
-                safe_click(driver, more_btn)
-                connect_btn = driver.find_element(By.XPATH, "//div[contains(@role,'menu')]//span[contains(.,'Connect')]/..")
-                safe_click(driver, connect_btn)
-            except Exception as e:
-                error('send_connection', f'Connect button not found: {e}')
-                return False
+            found, button = get_registry().find_first(driver, ['profile.connect', 'profile.more_actions'], timeout=10)
+            safe_click(driver, button)
+            if found == 'profile.more_actions':
+                try:
+                    safe_click(driver, find(driver, 'profile.menu_connect'))
+                except TimeoutException:
+                    # the dropdown has no Connect entry: the direct button may just have rendered late
+                    safe_click(driver, find(driver, 'profile.connect', timeout=1))
+        except Exception as e:
+            error('send_connection', f'Connect button not found: {e}')
+            # e.g. already connected or an invite pending; lead scoring holds the profile back for a while
+            _record(store, profile_url, note, 'failed')
+            return False
 
         # If add a note option exists
         try:
-            add_note = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Add a note') or contains(., 'Add a note')]") )
-            )
-            add_note.click()
-            textarea = WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.TAG_NAME, 'textarea')))
+            find(driver, 'connect.add_note').click()
+            textarea = find(driver, 'connect.note', condition='visible')
             textarea.clear()
             if note:
                 textarea.send_keys(note)
-            send_btn = driver.find_element(By.XPATH, "//button[contains(., 'Send')]")
-            send_btn.click()
+            find(driver, 'connect.send').click()
         except Exception:
             # Fallback: some flows auto-send
             pass
 
         # Record success
-        if output_csv:
-            os.makedirs(os.path.dirname(output_csv), exist_ok=True)
-            write_header = not os.path.exists(output_csv) or os.path.getsize(output_csv) == 0
-            with open(output_csv, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                if write_header:
-                    writer.writerow(['profile_url', 'name', 'role', 'company', 'request_sent_at', 'status', 'note'])
-                writer.writerow([profile_url, '', '', '', datetime.utcnow().isoformat(), 'sent', note or ''])
+        _record(store, profile_url, note, 'sent')
 
         info('send_connection', f'Connection request sent to {profile_url}')
         random_delay(2, 5)
         return True
+    except CircuitOpen:
+        # navigation keeps failing; the breaker logged it once, skip the lead quietly
+        return False
     except Exception as e:
         error('send_connection', f'Failed to send connection: {e}')
+        # network trouble says nothing about the profile; only count failures that do
+        if classify(e) == PERMANENT:
+            _record(store, profile_url, note, 'failed')
         return False
@@ -1,43 +1,71 @@
 """Send AI-generated follow-up messages to connected profiles."""
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import time
 
 from utils.logger import info, error
 from utils.helpers import random_delay
+from utils.timing import span, timed
+from automation.login import use_flow
+from automation.locators import find
+from utils.resilience import PERMANENT, CircuitOpen, call, classify, get_breaker
+from utils.quota import get_ledger
 
+# outcomes of message_profile: only FAILED says something about the profile itself; RETRY
+# (network trouble), NO_QUOTA and CIRCUIT_OPEN are about this run
+SENT, FAILED, RETRY, NO_QUOTA, CIRCUIT_OPEN = 'sent', 'failed', 'retry', 'no_quota', 'circuit_open'
 
-def send_message(driver, profile_url: str, message: str) -> bool:
+
+@timed('send_message')
+def send_message(driver, profile_url: str, message: str, action: str = 'message') -> bool:
     """Open a profile and send a message if messaging is available.
     Note: for many connections, messaging requires being connected.
+    Counts against the daily quota of `action` ('message' or 'follow_up'); returns False
+    without loading the profile once that quota is used up.
     """
+    return message_profile(driver, profile_url, message, action) == SENT
+
+
+def message_profile(driver, profile_url: str, message: str, action: str = 'message') -> str:
+    """Like `send_message`, but returns the outcome (SENT, FAILED, RETRY, NO_QUOTA or CIRCUIT_OPEN)."""
+    ledger = get_ledger()
+    if not ledger.try_acquire(action):
+        return NO_QUOTA
+    outcome = _send_message(driver, profile_url, message)
+    if outcome != SENT:
+        ledger.release(action)
+    return outcome
+
+
+def _failed(e: Exception) -> str:
+    return FAILED if classify(e) == PERMANENT else RETRY
+
+
+def _send_message(driver, profile_url: str, message: str) -> str:
+    use_flow(driver, 'message')
     try:
-        driver.get(profile_url)
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
+        with span('send_message', 'driver.get', 'page'):
+            call(driver.get, profile_url, breaker=get_breaker('navigation'))
         # Open message dialog
         try:
-            message_btn = driver.find_element(By.XPATH, "//button[contains(., 'Message')]")
-            message_btn.click()
+            find(driver, 'profile.message', timeout=10).click()
         except Exception:
+            # e.g. not connected (yet): the profile offers no way to message it
             error('send_message', 'Message button not available')
-            return False
+            return FAILED
 
         # Fill message textbox in dialog
         try:
-            textarea = WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//div[contains(@role,'textbox') and @contenteditable='true']"))
-            )
+            textarea = find(driver, 'message.textbox', timeout=10, condition='visible')
             textarea.click()
             textarea.send_keys(message)
-            send = driver.find_element(By.XPATH, "//button[contains(., 'Send')]")
-            send.click()
+            find(driver, 'message.send').click()
             info('send_message', f'Message sent to {profile_url}')
             random_delay(1, 3)
-            return True
+            return SENT
         except Exception as e:
             error('send_message', f'Failed to send message: {e}')
-            return False
+            return _failed(e)
+    except CircuitOpen:
+        return CIRCUIT_OPEN
     except Exception as e:
         error('send_message', f'Navigation failed: {e}')
-        return False
+        return _failed(e)
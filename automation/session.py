@@ -0,0 +1,131 @@
+"""Browser session reuse: a warm driver per process and logins that survive between runs.
+The driver uses a persistent Chrome profile (CHROME_PROFILE_DIR) and the session cookies are
+also saved to SESSION_COOKIES_PATH. `ensure_logged_in` checks the saved session with a single
+feed request and only submits the login form when the session is gone.
+"""
+import atexit
+import json
+import os
+import threading
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+from config import settings
+from automation.login import create_driver, login, use_flow
+from utils.logger import info, error
+from utils.timing import span, timed
+
+# 'in' on the feed (search box rendered), 'out' on a login form / auth wall, null while loading
+SESSION_STATE_JS = """
+if (document.querySelector("input[placeholder*='Search']")) { return 'in'; }
+if (document.getElementById('username') || /\\/(login|authwall|checkpoint|uas)/.test(location.pathname)) {
+    return 'out';
+}
+return null;
+"""
+
+_driver = None
+_driver_lock = threading.Lock()
+
+
+def _alive(driver) -> bool:
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+def get_driver(headless: bool = None):
+    """Return this process's warm driver, starting (or restarting) it when needed."""
+    global _driver
+    with _driver_lock:
+        if _driver is None or not _alive(_driver):
+            if _driver is not None:
+                info('session', 'Warm driver is gone; starting a new one')
+            _driver = create_driver(settings.HEADLESS if headless is None else headless,
+                                    profile_dir=settings.CHROME_PROFILE_DIR or None)
+        return _driver
+
+
+@atexit.register
+def quit_driver():
+    """Close the warm driver, if any."""
+    global _driver
+    with _driver_lock:
+        if _driver is not None:
+            try:
+                _driver.quit()
+            except Exception:
+                pass
+            _driver = None
+
+
+def save_cookies(driver, path: str = None):
+    path = path or settings.SESSION_COOKIES_PATH
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f'{path}.tmp'
+        # the cookies are credentials: keep the file private to the user
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(driver.get_cookies(), f)
+        os.replace(tmp, path)
+    except Exception as e:
+        error('session', f'Failed to save session cookies: {e}')
+
+
+def load_cookies(driver, path: str = None) -> bool:
+    """Add saved cookies to the current site; True if any were loaded."""
+    path = path or settings.SESSION_COOKIES_PATH
+    try:
+        with open(path, encoding='utf-8') as f:
+            cookies = json.load(f)
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        error('session', f'Failed to read session cookies: {e}')
+        return False
+    loaded = 0
+    for cookie in cookies:
+        if cookie.get('sameSite') not in ('Strict', 'Lax', 'None'):
+            cookie.pop('sameSite', None)
+        try:
+            driver.add_cookie(cookie)
+            loaded += 1
+        except Exception:
+            continue
+    return loaded > 0
+
+
+def session_state(driver, timeout: float = None) -> str:
+    """Open the feed and report 'in' or 'out' (or 'unknown' if neither shows up in time)."""
+    use_flow(driver, 'login')
+    with span('session', 'driver.get', 'page'):
+        driver.get(f'{settings.LINKEDIN_BASE_URL}/feed/')
+    try:
+        with span('session', 'wait:session_state', 'wait'):
+            return WebDriverWait(driver, timeout or settings.SESSION_CHECK_TIMEOUT, poll_frequency=0.1).until(
+                lambda d: d.execute_script(SESSION_STATE_JS)
+            )
+    except TimeoutException:
+        return 'unknown'
+
+
+@timed('session')
+def ensure_logged_in(driver, email: str, password: str) -> bool:
+    """Reuse the browser profile's or the saved cookies' session; log in only when both are invalid."""
+    state = session_state(driver)
+    if state == 'in':
+        info('session', 'Reusing existing browser session')
+        save_cookies(driver)
+        return True
+    # the feed request put the browser on the site's domain, so saved cookies can be added now
+    if load_cookies(driver) and session_state(driver) == 'in':
+        info('session', 'Restored session from saved cookies')
+        return True
+    if not login(driver, email, password):
+        return False
+    save_cookies(driver)
+    return True
@@ -0,0 +1,54 @@
+"""Benchmark: batch size vs latency/throughput for batched multi-lead generation.
+The stub endpoint charges a fixed per-request latency plus a per-note cost, roughly like
+output tokens; every lead has a distinct company so nothing is served from the cache.
+Run as: python -m benchmarks.bench_batch [leads] [request_latency] [per_note_seconds]
+"""
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+from benchmarks.stub_openai import start_stub_server
+
+LEADS = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+LATENCY = float(sys.argv[2]) if len(sys.argv) > 2 else 0.8
+PER_NOTE = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+
+
+def _responder(prompt):
+    ids = re.findall(r'^(\d+): ', prompt, flags=re.M)
+    time.sleep(PER_NOTE * max(1, len(ids)))
+    if not ids:
+        return 'Hi {{name}}, I enjoyed reading about your work and would love to connect.'
+    return json.dumps({'notes': [{'id': int(i), 'note': f'Hi {{{{name}}}}, loved your work (#{i}).'} for i in ids]})
+
+
+SERVER, API_BASE = start_stub_server(LATENCY, responder=_responder)
+os.environ['OPENAI_API_BASE'] = API_BASE
+os.environ.setdefault('OPENAI_API_KEY', 'sk-stub')
+os.environ['MESSAGE_CACHE_PATH'] = os.path.join(tempfile.mkdtemp(), 'message_cache.db')
+
+from ai import message_generator  # noqa: E402  (must import after the environment is set)
+
+
+def run(workers: int = 4):
+    print(f'leads={LEADS} request_latency={LATENCY}s per_note={PER_NOTE}s workers={workers}')
+    print(f'{"batch":>5} {"requests":>8} {"wall":>8} {"first note":>10} {"leads/min":>10}')
+    for batch_size in (1, 5, 10, 25, 50):
+        leads = [{'name': f'Lead {i}', 'role': 'Data Scientist', 'company': f'B{batch_size} Co {i}'}
+                 for i in range(LEADS)]
+        before = SERVER.requests
+        start = time.perf_counter()
+        first = None
+        for _lead, _msg in message_generator.generate_messages(leads, max_workers=workers, batch_size=batch_size):
+            first = first or time.perf_counter() - start
+        wall = time.perf_counter() - start
+        print(f'{batch_size:>5} {SERVER.requests - before:>8} {wall:>7.2f}s {first:>9.2f}s {LEADS / wall * 60:>10.1f}')
+        if SERVER.requests == before:
+            sys.exit(f'stub served 0 requests at batch size {batch_size}: generation never reached the endpoint')
+
+
+if __name__ == '__main__':
+    run()
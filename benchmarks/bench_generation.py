@@ -0,0 +1,54 @@
+"""Benchmark: sequential generate-then-send vs pipelined concurrent generation.
+Uses the local stub OpenAI endpoint with injected latency; sending is simulated with a sleep.
+Run as: python -m benchmarks.bench_generation [leads] [openai_latency] [send_seconds]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.stub_openai import start_stub_server
+
+LATENCY = float(sys.argv[2]) if len(sys.argv) > 2 else 0.8
+SERVER, API_BASE = start_stub_server(LATENCY)
+os.environ['OPENAI_API_BASE'] = API_BASE
+os.environ.setdefault('OPENAI_API_KEY', 'sk-stub')
+os.environ['MESSAGE_CACHE_PATH'] = os.path.join(tempfile.mkdtemp(), 'message_cache.db')
+
+from ai import message_generator  # noqa: E402  (must import after the environment is set)
+
+
+def _leads(n, tag):
+    # distinct companies so every lead misses the template cache
+    return [{'name': f'Lead {i}', 'role': 'Software Engineer', 'company': f'{tag} Co {i}'} for i in range(n)]
+
+
+def sequential(leads, send_seconds):
+    start = time.perf_counter()
+    for lead in leads:
+        message_generator.generate_message(lead['name'], lead['role'], lead['company'])
+        time.sleep(send_seconds)
+    return time.perf_counter() - start
+
+
+def pipelined(leads, send_seconds, workers):
+    start = time.perf_counter()
+    for _lead, _msg in message_generator.generate_messages(leads, max_workers=workers):
+        time.sleep(send_seconds)
+    return time.perf_counter() - start
+
+
+def run(n: int = 20, send_seconds: float = 0.5):
+    print(f'leads={n} openai_latency={LATENCY}s send={send_seconds}s')
+    elapsed = sequential(_leads(n, 'seq'), send_seconds)
+    print(f'{"sequential":<16} {elapsed:7.2f}s  {n / elapsed * 60:7.1f} leads/min')
+    for workers in (2, 4, 8):
+        elapsed = pipelined(_leads(n, f'pipe{workers}'), send_seconds, workers)
+        print(f'{f"pipelined x{workers}":<16} {elapsed:7.2f}s  {n / elapsed * 60:7.1f} leads/min')
+    print(f'stub served {SERVER.requests} requests')
+    if not SERVER.requests:
+        sys.exit('stub served 0 requests: generation never reached the endpoint, timings are for the fallback')
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20, float(sys.argv[3]) if len(sys.argv) > 3 else 0.5)
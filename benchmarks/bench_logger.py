@@ -0,0 +1,63 @@
+"""Micro-benchmark: per-call latency of CSV logging, synchronous append vs background writer.
+Run as: python -m benchmarks.bench_logger [calls]
+"""
+import csv
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from utils.logger import CsvLogWriter, LOG_CSV_HEADER
+
+
+def _sync_log_to_csv(path, level, component, message):
+    """The previous implementation: makedirs, stat, open, write one row, close."""
+    timestamp = datetime.utcnow().isoformat()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(LOG_CSV_HEADER)
+        writer.writerow([timestamp, level, component, message])
+
+
+def _percentile(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def _report(label, samples, total):
+    print(f'{label:<12} calls={len(samples):>7}  p50={_percentile(samples, 50) * 1e6:8.1f}us  '
+          f'p99={_percentile(samples, 99) * 1e6:8.1f}us  total={total:.3f}s')
+
+
+def run(calls: int = 20000):
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_path = os.path.join(tmp, 'sync', 'logs.csv')
+        samples = []
+        start = time.perf_counter()
+        for i in range(calls):
+            t0 = time.perf_counter()
+            _sync_log_to_csv(sync_path, 'INFO', 'helpers', f'Sleeping for {i % 10}.00s')
+            samples.append(time.perf_counter() - t0)
+        _report('sync', samples, time.perf_counter() - start)
+
+        writer = CsvLogWriter(os.path.join(tmp, 'async', 'logs.csv'))
+        writer.start()
+        samples = []
+        start = time.perf_counter()
+        for i in range(calls):
+            t0 = time.perf_counter()
+            writer.submit([datetime.utcnow().isoformat(), 'INFO', 'helpers', f'Sleeping for {i % 10}.00s'])
+            samples.append(time.perf_counter() - t0)
+        enqueue_total = time.perf_counter() - start
+        writer.flush(timeout=60)
+        _report('background', samples, enqueue_total)
+        print(f'{"":<12} drained to disk after {time.perf_counter() - start:.3f}s')
+        writer.stop()
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
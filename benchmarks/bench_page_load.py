@@ -0,0 +1,53 @@
+"""Benchmark: profile visits with default Chrome options vs lean page-load mode.
+Each visit opens a fixture profile (with images and a slow tracking script) and waits for the
+Connect button to be clickable. Reports time-to-interactive p50/p95 and bytes served per visit.
+Run as: python -m benchmarks.bench_page_load [visits] [latency] [media_delay]
+"""
+import sys
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+from automation.login import create_driver, use_flow
+from benchmarks.fixture_site import start_fixture_site
+from benchmarks.suite import summarize
+
+
+def _visit_profiles(server, base_url, lean: bool, visits: int):
+    driver = create_driver(headless=True, lean=lean)
+    try:
+        use_flow(driver, 'connect')
+        driver.get(f'{base_url}/feed/')
+        samples = []
+        start_bytes = server.bytes_sent
+        for i in range(visits):
+            start = time.perf_counter()
+            driver.get(f'{base_url}/in/{"lean" if lean else "default"}-member-{i:04d}')
+            WebDriverWait(driver, 10, poll_frequency=0.05).until(EC.element_to_be_clickable((By.ID, 'connect')))
+            samples.append(time.perf_counter() - start)
+        # let requests still in flight finish before reading the byte count
+        time.sleep(server.media_delay + server.latency + 0.5)
+        return summarize(samples), (server.bytes_sent - start_bytes) / visits
+    finally:
+        driver.quit()
+
+
+def run(visits: int = 20, latency: float = 0.05, media_delay: float = 0.3):
+    server, base_url = start_fixture_site(latency=latency, media_delay=media_delay)
+    try:
+        print(f'visits={visits} latency={latency}s media_delay={media_delay}s '
+              f'media={server.media_per_page}x{server.media_bytes // 1000}KB per profile')
+        for label, lean in (('default', False), ('lean', True)):
+            stats, per_visit = _visit_profiles(server, base_url, lean, visits)
+            print(f"{label:<8} time-to-interactive p50 {stats['p50'] * 1000:7.0f}ms  "
+                  f"p95 {stats['p95'] * 1000:7.0f}ms  {per_visit / 1000:8.1f} KB/visit")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    run(int(args[0]) if args else 20, float(args[1]) if len(args) > 1 else 0.05,
+        float(args[2]) if len(args) > 2 else 0.3)
@@ -0,0 +1,58 @@
+"""Benchmark: rendering connection notes for many leads, per-lead token replacement vs compiled templates.
+'legacy' is the old `personalize_template` (a `str.replace` per token, then a regex whitespace
+pass, for every lead); 'compiled' renders each lead through the cached render plan one call at a
+time; 'render_many' compiles once and renders the whole batch, including the note length check.
+Leads come from the scale mode of the fake data generator.
+Run as: python -m benchmarks.bench_personalization [leads]
+"""
+import re
+import sys
+import time
+
+import numpy as np
+
+from ai.personalization import compile_template, personalize_template, render_many
+from data.generate_fake_data import generate_shard
+
+# a flat template the legacy function can render too, and one using defaults and conditionals
+FLAT = ('Hi {{name}}, I came across your profile and your work as {{role}} at {{company}} in '
+        '{{location}}. I would love to connect and swap notes.')
+RICH = ('Hi {{name|there}}, {{#if company}}your work as {{role|a leader}} at {{company}}{{else}}your profile'
+        '{{/if}} caught my eye{{#if location}} while I was looking at teams in {{location}}{{/if}}. '
+        'Would love to connect!')
+
+
+def legacy_personalize(template: str, tokens: dict) -> str:
+    result = template
+    for k, v in tokens.items():
+        result = result.replace(f'{{{{{k}}}}}', str(v or ''))
+    return re.sub(r"\s+", ' ', result).strip()
+
+
+def _time(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(n: int = 100_000):
+    leads = generate_shard(0, 0, n, 42, np.datetime64('2026-01-01', 'us'))['leads'].to_dict('records')
+    fields = ['name', 'role', 'company', 'location']
+    tokens = [{k: lead[k] for k in fields} for lead in leads]
+    assert [legacy_personalize(FLAT, t) for t in tokens[:1000]] == render_many(FLAT, tokens[:1000], max_length=0)
+    print(f'leads={n}')
+    print(f'{"template":<8} {"method":<12} {"seconds":>8} {"notes/s":>10}')
+    timings = [
+        ('flat', 'legacy', lambda: [legacy_personalize(FLAT, t) for t in tokens]),
+        ('flat', 'compiled', lambda: [personalize_template(FLAT, t) for t in tokens]),
+        ('flat', 'render_many', lambda: render_many(FLAT, tokens)),
+        ('rich', 'render_many', lambda: render_many(RICH, tokens)),
+    ]
+    for template, method, func in timings:
+        compile_template.cache_clear()
+        elapsed = _time(func)
+        print(f'{template:<8} {method:<12} {elapsed:8.2f} {n / elapsed:10.0f}')
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,66 @@
+"""Benchmark: time-to-first-result per query, typed search vs planned search URLs.
+'typed' starts on the feed, types the query into the search box and clicks the People tab
+(the old flow); 'planned URL' opens the query planner's people-search URL directly; 'cached
+rerun' is a second `run_query` for the same query, served from the query cache. Each is timed
+until the first result card is shown (or returned). Runs against the local fixture site.
+Run as: python -m benchmarks.bench_query_planner [latency]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fixture_site import start_fixture_site
+
+LATENCY = float(sys.argv[1]) if len(sys.argv) > 1 else 0.2
+SERVER, BASE_URL = start_fixture_site(latency=LATENCY)
+WORKDIR = tempfile.mkdtemp(prefix='linkedin-planner-')
+os.environ.update({
+    'LINKEDIN_BASE_URL': BASE_URL,
+    'ACTION_DELAY_SCALE': '0',
+    'DB_PATH': os.path.join(WORKDIR, 'leads.db'),
+})
+
+from automation.login import create_driver  # noqa: E402  (must import after the environment is set)
+from automation.query_planner import QueryCache, plan_queries, run_query  # noqa: E402
+from automation.search_profiles import open_search, open_search_url  # noqa: E402
+from utils.storage import LeadStore  # noqa: E402
+
+CONFIG = {
+    'job_titles': ['Software Engineer', 'Product Manager', 'software  engineer'],
+    'locations': ['United States', 'India'],
+    'keywords': ['Python', 'Selenium'],
+    'experience_levels': ['Mid-Senior level'],
+}
+
+
+def _time(func) -> float:
+    start = time.perf_counter()
+    assert func()
+    return time.perf_counter() - start
+
+
+def run():
+    queries = plan_queries(CONFIG)
+    print(f'latency={LATENCY}s queries={len(queries)} (planned from {len(CONFIG["job_titles"])} titles x '
+          f'{len(CONFIG["locations"])} locations, duplicates removed)')
+    driver = create_driver(headless=True)
+    store = LeadStore(os.path.join(WORKDIR, 'leads.db'))
+    cache = QueryCache(store)
+    try:
+        print(f'{"query":<36} {"typed":>8} {"planned URL":>12} {"cached rerun":>13}')
+        for q in queries:
+            driver.get(f'{BASE_URL}/feed/')
+            typed = _time(lambda: open_search(driver, f'{q.title} {q.location}'))
+            planned = _time(lambda: open_search_url(driver, q.url()))
+            run_query(driver, q, max_results=5, store=store, cache=cache)
+            rerun = _time(lambda: run_query(driver, q, max_results=5, store=store, cache=cache))
+            print(f'{q.label:<36} {typed:7.2f}s {planned:11.2f}s {rerun:12.3f}s')
+    finally:
+        driver.quit()
+        store.close()
+        SERVER.shutdown()
+
+
+if __name__ == '__main__':
+    run()
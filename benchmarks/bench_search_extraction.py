@@ -0,0 +1,57 @@
+"""Benchmark: per-element WebDriver card extraction vs the single execute_script extraction.
+Loads the saved results page in benchmarks/fixtures under headless Chrome and reports cards/second.
+Run as: python -m benchmarks.bench_search_extraction [rounds] [implicit_wait_seconds]
+"""
+import os
+import sys
+import time
+
+from selenium.webdriver.common.by import By
+
+from automation.login import create_driver
+from automation.search_profiles import extract_cards
+from config import settings
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'search_results.html')
+
+
+def legacy_extract(driver) -> list:
+    """The previous approach: five WebDriver round trips per card, skipping cards with missing fields."""
+    results = []
+    for card in driver.find_elements(By.XPATH, "//div[contains(@class,'reusable-search__result-container')]"):
+        try:
+            link = card.find_element(By.XPATH, ".//a[contains(@href,'/in/')]")
+            profile_url = link.get_attribute('href')
+            name = card.find_element(By.XPATH, ".//span[contains(@class,'entity-result__title-text')]").text
+            subtitle = card.find_element(By.XPATH, ".//div[contains(@class,'entity-result__primary-subtitle')]").text
+            location = card.find_element(By.XPATH, ".//div[contains(@class,'entity-result__secondary-subtitle')]").text
+            results.append({'profile_url': profile_url, 'name': name, 'subtitle': subtitle, 'location': location})
+        except Exception:
+            continue
+    return results
+
+
+def _time(label, func, rounds):
+    cards = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        cards += len(func())
+    elapsed = time.perf_counter() - start
+    print(f'{label:<16} {cards // rounds:>4} cards/round  {elapsed / rounds:7.3f}s/round  {cards / elapsed:9.1f} cards/s')
+
+
+def run(rounds: int = 3, implicit_wait: float = None):
+    driver = create_driver(headless=True)
+    try:
+        driver.get(f'file://{FIXTURE}')
+        wait = settings.IMPLICIT_WAIT if implicit_wait is None else implicit_wait
+        driver.implicitly_wait(wait)
+        print(f'fixture={os.path.basename(FIXTURE)} implicit_wait={wait}s rounds={rounds}')
+        _time('legacy', lambda: legacy_extract(driver), rounds)
+        _time('execute_script', lambda: extract_cards(driver, reset=True), rounds)
+    finally:
+        driver.quit()
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3, float(sys.argv[2]) if len(sys.argv) > 2 else None)
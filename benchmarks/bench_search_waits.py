@@ -0,0 +1,73 @@
+"""Benchmark: per-query wall time of search with fixed sleeps vs event-driven waits.
+Runs against the local fixture site (server latency plus a delayed lazy-load of cards and a
+'Next' button) under headless Chrome. Both variants use the same card extraction.
+Run as: python -m benchmarks.bench_search_waits [max_results] [latency] [scroll_delay]
+"""
+import sys
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from automation.login import create_driver
+from automation.search_profiles import search_profiles, extract_cards
+from benchmarks.fixture_site import start_fixture_site
+
+QUERIES = ['Software Engineer United States', 'Product Manager India', 'Engineering Manager United Kingdom']
+
+
+def legacy_search(driver, query, max_results):
+    """The previous wait strategy: sleep 2 s after submitting and after every scroll, stop when
+    document.body.scrollHeight stops changing; no pagination."""
+    box = driver.find_element(By.XPATH, "//input[contains(@placeholder, 'Search')]")
+    box.clear()
+    box.send_keys(query)
+    box.send_keys(Keys.RETURN)
+    time.sleep(2)
+    try:
+        driver.find_element(By.XPATH, "//button[contains(., 'People')]").click()
+    except Exception:
+        pass
+    results = []
+    first = True
+    last_height = driver.execute_script('return document.body.scrollHeight')
+    while len(results) < max_results:
+        results.extend(extract_cards(driver, reset=first)[:max_results - len(results)])
+        first = False
+        driver.execute_script('window.scrollTo(0, document.body.scrollHeight);')
+        time.sleep(2)
+        new_height = driver.execute_script('return document.body.scrollHeight')
+        if new_height == last_height:
+            break
+        last_height = new_height
+    return results
+
+
+def _run(label, driver, base_url, search):
+    total = 0.0
+    for query in QUERIES:
+        driver.get(f'{base_url}/feed/')
+        start = time.perf_counter()
+        found = len(search(driver, query))
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        print(f'{label:<14} {query:<36} {found:>3} profiles  {elapsed:6.2f}s')
+    print(f'{label:<14} mean per query: {total / len(QUERIES):.2f}s')
+
+
+def run(max_results: int = 20, latency: float = 0.3, scroll_delay: float = 0.5):
+    server, base_url = start_fixture_site(latency=latency, scroll_delay=scroll_delay)
+    driver = create_driver(headless=True)
+    try:
+        print(f'max_results={max_results} latency={latency}s scroll_delay={scroll_delay}s')
+        _run('fixed sleeps', driver, base_url, lambda d, q: legacy_search(d, q, max_results))
+        _run('event waits', driver, base_url, lambda d, q: search_profiles(d, q, max_results=max_results))
+    finally:
+        driver.quit()
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    run(int(args[0]) if args else 20, float(args[1]) if len(args) > 1 else 0.3,
+        float(args[2]) if len(args) > 2 else 0.5)
@@ -0,0 +1,76 @@
+"""Benchmark: startup-to-first-action time with a fresh login vs a reused session.
+'fresh login' starts Chrome on a throwaway profile and submits the login form (the old flow);
+'saved profile' starts Chrome on the persistent profile and only checks the session;
+'warm driver' reuses the process's running driver. Timed until the feed's search box is ready.
+Runs against the local fixture site with login required.
+Run as: python -m benchmarks.bench_session [rounds] [latency]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.fixture_site import start_fixture_site
+from benchmarks.suite import summarize
+
+ROUNDS = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+LATENCY = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+SERVER, BASE_URL = start_fixture_site(latency=LATENCY, require_login=True)
+WORKDIR = tempfile.mkdtemp(prefix='linkedin-session-')
+os.environ.update({
+    'LINKEDIN_BASE_URL': BASE_URL,
+    'ACTION_DELAY_SCALE': '0',
+    'CHROME_PROFILE_DIR': os.path.join(WORKDIR, 'chrome-profile'),
+    'SESSION_COOKIES_PATH': os.path.join(WORKDIR, 'session_cookies.json'),
+})
+
+from config import settings  # noqa: E402  (must import after the environment is set)
+from automation.login import create_driver, login  # noqa: E402
+from automation.session import ensure_logged_in, get_driver, quit_driver  # noqa: E402
+
+EMAIL, PASSWORD = 'bench@example.com', 'bench-password'
+
+
+def fresh_login():
+    driver = create_driver(headless=True)
+    try:
+        assert login(driver, EMAIL, PASSWORD)
+    finally:
+        driver.quit()
+
+
+def saved_profile():
+    driver = create_driver(headless=True, profile_dir=settings.CHROME_PROFILE_DIR)
+    try:
+        assert ensure_logged_in(driver, EMAIL, PASSWORD)
+    finally:
+        driver.quit()
+
+
+def warm_driver():
+    assert ensure_logged_in(get_driver(headless=True), EMAIL, PASSWORD)
+
+
+def _time(label, func):
+    samples = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    stats = summarize(samples)
+    print(f"{label:<14} p50 {stats['p50']:6.2f}s  p95 {stats['p95']:6.2f}s  mean {stats['mean']:6.2f}s")
+
+
+def run():
+    print(f'rounds={ROUNDS} latency={LATENCY}s (driver quit time included for the first two)')
+    _time('fresh login', fresh_login)
+    saved_profile()  # log in once so the profile holds a session
+    _time('saved profile', saved_profile)
+    warm_driver()
+    _time('warm driver', warm_driver)
+    quit_driver()
+    SERVER.shutdown()
+
+
+if __name__ == '__main__':
+    run()
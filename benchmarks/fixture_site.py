@@ -0,0 +1,276 @@
+"""Local stand-in for the LinkedIn pages the automation touches, served with controlled delays.
+Search results render `initial` cards, lazily append the rest of the page `scroll_delay`
+seconds after the user scrolls to the bottom, then render the 'Next' button (disabled on page `pages`; later pages have no results).
+People search also accepts the filters of planned search URLs (titleFreeText, geoUrn).
+Profiles (/in/<slug>) have Connect (with the 'Add a note' dialog) and Message (with a message
+box) actions; each completed send is reported to /api/actions and counted in `server.actions`.
+Profiles also pull `media_per_page` images of `media_bytes` each and an async tracking script,
+all served after an extra `media_delay`, so they hold back the page's load event.
+With `require_login`, the feed redirects to /login until the login form has set a session cookie.
+Run as: python -m benchmarks.fixture_site [port] [latency_seconds] [scroll_delay_seconds]
+"""
+import hashlib
+import html
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, quote, urlencode
+
+FIRST = ['Avery', 'Jordan', 'Priya', 'Wei', 'Lucas', 'Maya', 'Omar', 'Sofia', 'Ethan', 'Hana', 'Diego', 'Nina']
+LAST = ['Patel', 'Nguyen', 'Garcia', 'Kim', 'Schmidt', 'Okafor', 'Rossi', 'Chen', 'Silva', 'Haddad', 'Novak']
+ROLES = ['Software Engineer', 'Engineering Manager', 'Product Manager', 'Data Scientist']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Vandelay Imports']
+LOCATIONS = ['San Francisco Bay Area', 'Bengaluru, India', 'London, United Kingdom', 'Austin, Texas']
+
+PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{title} | LinkedIn</title></head>
+<body>
+<input class="search-global-typeahead__input" placeholder="Search" value="{keywords}">
+{body}
+<script>
+document.querySelector('input[placeholder="Search"]').addEventListener('keydown', function (e) {{
+    if (e.key === 'Enter') {{ location.href = '/search/results/all/?keywords=' + encodeURIComponent(this.value); }}
+}});
+{script}
+</script>
+</body></html>
+"""
+
+RESULTS_SCRIPT = """
+const pending = {pending};
+const delay = {delay_ms};
+const list = document.getElementById('results');
+let loading = false;
+function showNext() {{
+    const disabled = {has_next} ? '' : ' disabled';
+    document.getElementById('pagination').innerHTML =
+        '<button id="next" aria-label="Next" class="artdeco-pagination__button--next"' + disabled + '>Next</button>';
+    document.getElementById('next').addEventListener('click', function () {{ location.href = {next_url}; }});
+}}
+window.addEventListener('scroll', function () {{
+    if (loading || !pending.length) {{ return; }}
+    if (window.innerHeight + window.scrollY < document.body.scrollHeight - 5) {{ return; }}
+    loading = true;
+    setTimeout(function () {{
+        list.insertAdjacentHTML('beforeend', pending.splice(0).join(''));
+        loading = false;
+        showNext();
+    }}, delay);
+}});
+if (!pending.length) {{ showNext(); }}
+"""
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Sign In | LinkedIn</title></head>
+<body>
+<form id="login" action="/login-submit" method="get">
+<input id="username" name="session_key" type="text"> <input id="password" name="session_password" type="password">
+<button type="submit">Sign in</button>
+</form>
+</body></html>
+"""
+
+PROFILE_SCRIPT = """
+const overlay = document.getElementById('overlay');
+function report(kind) {{
+    fetch('/api/actions?kind=' + kind + '&slug=' + encodeURIComponent({slug}));
+    overlay.innerHTML = '<p class="artdeco-toast">Sent</p>';
+}}
+document.getElementById('connect').addEventListener('click', function () {{
+    overlay.innerHTML = '<div role="dialog"><button id="add-note">Add a note</button>'
+        + ' <button id="send-now">Send without a note</button></div>';
+    document.getElementById('send-now').addEventListener('click', function () {{ report('connect'); }});
+    document.getElementById('add-note').addEventListener('click', function () {{
+        overlay.innerHTML = '<div role="dialog"><textarea name="message" maxlength="300"></textarea>'
+            + '<button id="send">Send</button></div>';
+        document.getElementById('send').addEventListener('click', function () {{ report('connect'); }});
+    }});
+}});
+document.getElementById('message').addEventListener('click', function () {{
+    overlay.innerHTML = '<div role="dialog" class="msg-overlay"><div role="textbox" contenteditable="true"'
+        + ' class="msg-form__contenteditable"></div><button id="send">Send</button></div>';
+    document.getElementById('send').addEventListener('click', function () {{ report('message'); }});
+}});
+"""
+
+SESSION_COOKIE = 'li_at'
+
+
+def fake_profile(keywords: str, page: int, i: int) -> dict:
+    """Deterministic profile for the i-th card of a results page."""
+    seed = int(hashlib.sha1(f'{keywords}|{page}|{i}'.encode('utf-8')).hexdigest(), 16)
+    name = f'{FIRST[seed % len(FIRST)]} {LAST[(seed // 7) % len(LAST)]}'
+    return {
+        'slug': f"{name.lower().replace(' ', '-')}-{seed % 100000:05d}",
+        'name': name,
+        'role': ROLES[(seed // 11) % len(ROLES)],
+        'company': COMPANIES[(seed // 13) % len(COMPANIES)],
+        'location': LOCATIONS[(seed // 17) % len(LOCATIONS)],
+    }
+
+
+def render_card(p: dict) -> str:
+    return (
+        '<div class="reusable-search__result-container"><div class="entity-result">'
+        f'<span class="entity-result__title-text"><a href="/in/{p["slug"]}">'
+        f'<span aria-hidden="true">{html.escape(p["name"])}</span></a></span>'
+        f'<div class="entity-result__primary-subtitle">{html.escape(p["role"])} at {html.escape(p["company"])}</div>'
+        f'<div class="entity-result__secondary-subtitle">{html.escape(p["location"])}</div>'
+        '<div style="height: 120px"></div></div></div>'
+    )
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Routes: /login, /login-submit, /feed/, /search/results/all/, /search/results/people/, /in/<slug>,
+    /api/actions (see module docstring)."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        time.sleep(self.server.latency)
+        self.server.hits += 1
+        route = self.server.routes.get(url.path)
+        if route is None:
+            route = next((r for prefix, r in self.server.prefix_routes if url.path.startswith(prefix)), None)
+        if route is None:
+            self._send(404, '<html><body>Not found</body></html>')
+            return
+        route(self, url.path, params)
+
+    def _send(self, status: int, body, content_type: str = 'text/html; charset=utf-8'):
+        data = body if isinstance(body, bytes) else body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.server.bytes_sent += len(data)
+
+    def _redirect(self, location: str, cookie: str = None):
+        self.send_response(302)
+        self.send_header('Location', location)
+        if cookie:
+            self.send_header('Set-Cookie', cookie)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def login_page(handler, path, params):
+    handler._send(200, LOGIN_PAGE)
+
+
+def login_submit(handler, path, params):
+    handler._redirect('/feed/', cookie=f'{SESSION_COOKIE}=fixture-session; Path=/; Max-Age=86400')
+
+
+def feed_page(handler, path, params):
+    if handler.server.require_login and f'{SESSION_COOKIE}=' not in (handler.headers.get('Cookie') or ''):
+        handler._redirect('/login')
+        return
+    handler._send(200, PAGE.format(title='Feed', keywords='', body='<main id="feed"></main>', script=''))
+
+
+def all_results_page(handler, path, params):
+    keywords = params.get('keywords', '')
+    body = ('<div class="search-reusables__filter-list">'
+            '<button id="people" class="artdeco-pill">People</button> <button class="artdeco-pill">Posts</button></div>')
+    script = ("document.getElementById('people').addEventListener('click', function () {"
+              f" location.href = '/search/results/people/?keywords={quote(keywords)}&page=1'; }});")
+    handler._send(200, PAGE.format(title='Search', keywords=html.escape(keywords), body=body, script=script))
+
+
+def people_results_page(handler, path, params):
+    server = handler.server
+    keywords = params.get('keywords', '')
+    page = max(1, int(params.get('page', 1)))
+    # filters from a planned search URL (titleFreeText, geoUrn) also pick the profiles
+    seed = ' '.join(params[k] for k in ('titleFreeText', 'keywords', 'geoUrn') if params.get(k))
+    cards = [render_card(fake_profile(seed, page, i)) for i in range(server.per_page)] if page <= server.pages else []
+    body = (f'<div id="results">{"".join(cards[:server.initial])}</div>'
+            '<div id="pagination"></div>')
+    script = RESULTS_SCRIPT.format(
+        pending=json.dumps(cards[server.initial:]),
+        delay_ms=int(server.scroll_delay * 1000),
+        has_next='true' if page < server.pages else 'false',
+        next_url=json.dumps('/search/results/people/?' + urlencode(dict(params, page=page + 1))),
+    )
+    handler._send(200, PAGE.format(title='People', keywords=html.escape(keywords), body=body, script=script))
+
+
+def profile_page(handler, path, params):
+    slug = path[len('/in/'):].strip('/')
+    name = ' '.join(part.capitalize() for part in slug.split('-')[:2]) or 'Member'
+    body = (f'<main class="pv-top-card"><h1>{html.escape(name)}</h1>'
+            '<div class="pvs-profile-actions"><button id="connect" class="artdeco-button">Connect</button> '
+            '<button id="message" class="artdeco-button">Message</button></div>'
+            '<div id="overlay"></div></main>'
+            + ''.join(f'<img src="/media/{quote(slug)}-{i}.jpg" width="96" height="96" alt="">'
+                      for i in range(handler.server.media_per_page))
+            + '<script async src="/li/track.js"></script>')
+    script = PROFILE_SCRIPT.format(slug=json.dumps(slug))
+    handler._send(200, PAGE.format(title=html.escape(name), keywords='', body=body, script=script))
+
+
+def media_asset(handler, path, params):
+    time.sleep(handler.server.media_delay)
+    handler._send(200, b'\0' * handler.server.media_bytes, content_type='image/jpeg')
+
+
+def tracking_script(handler, path, params):
+    time.sleep(handler.server.media_delay)
+    handler._send(200, '/* analytics */', content_type='application/javascript')
+
+
+def actions_api(handler, path, params):
+    handler.server.actions[params.get('kind', 'unknown')] += 1
+    handler._send(200, json.dumps({'ok': True}), content_type='application/json')
+
+
+def start_fixture_site(latency: float = 0.2, scroll_delay: float = 0.5, per_page: int = 10, initial: int = 5,
+                       pages: int = 3, port: int = 0, require_login: bool = False, media_per_page: int = 6,
+                       media_bytes: int = 80_000, media_delay: float = 0.3):
+    """Start the fixture site in a daemon thread; returns (server, base_url)."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), FixtureHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.scroll_delay = scroll_delay
+    server.per_page = per_page
+    server.initial = initial
+    server.pages = pages
+    server.require_login = require_login
+    server.media_per_page = media_per_page
+    server.media_bytes = media_bytes
+    server.media_delay = media_delay
+    server.hits = 0
+    server.bytes_sent = 0
+    server.actions = Counter()
+    server.routes = {
+        '/login': login_page,
+        '/login-submit': login_submit,
+        '/feed/': feed_page,
+        '/search/results/all/': all_results_page,
+        '/search/results/people/': people_results_page,
+        '/api/actions': actions_api,
+        '/li/track.js': tracking_script,
+    }
+    server.prefix_routes = [('/in/', profile_page), ('/media/', media_asset)]
+    threading.Thread(target=server.serve_forever, name='fixture-site', daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8766
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    scroll_delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0.5
+    server, base_url = start_fixture_site(latency, scroll_delay, port=port)
+    print(f'Fixture site at {base_url}/feed/ (latency {latency}s, scroll delay {scroll_delay}s); Ctrl+C to stop')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,61 @@
+"""Local stand-in for the OpenAI chat completions endpoint with injected latency.
+Run as: python -m benchmarks.stub_openai [port] [latency_seconds]
+"""
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    """Answers POST .../chat/completions with a canned name-agnostic note after `server.latency` seconds."""
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}')
+        time.sleep(self.server.latency)
+        self.server.requests += 1
+        prompt = body.get('messages', [{}])[-1].get('content', '')
+        content = self.server.responder(prompt) if self.server.responder else (
+            'Hi {{name}}, I enjoyed reading about your work and would love to connect.')
+        payload = {
+            'id': f'chatcmpl-stub-{self.server.requests}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'stub'),
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+        }
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(latency: float = 0.5, port: int = 0, responder=None):
+    """Start the stub in a daemon thread; returns (server, api_base). `responder(prompt)` may override the reply."""
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubOpenAIHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.requests = 0
+    server.responder = responder
+    threading.Thread(target=server.serve_forever, name='stub-openai', daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/v1'
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    server, api_base = start_stub_server(latency, port)
+    print(f'Stub OpenAI endpoint at {api_base} (latency {latency}s); Ctrl+C to stop')
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,220 @@
+"""Offline benchmark suite: each automation step and the end-to-end flow against local stand-ins.
+Starts the fixture site (login, search, profile and message pages) and the stub OpenAI endpoint,
+points the automation at them through the environment and drives headless Chrome with the
+human-like delays disabled. Reports per-step p50/p95, leads/minute of `run_once` and memory.
+Results can be saved as a baseline; later runs are compared against it and exit with status 1
+when a step regresses by more than the tolerance.
+Run as: python -m benchmarks.suite [--rounds N] [--save-baseline] [--baseline PATH] [--output PATH]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from benchmarks.fixture_site import start_fixture_site
+from benchmarks.stub_openai import start_stub_server
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+QUERIES = ['Software Engineer United States', 'Product Manager India', 'Engineering Manager United Kingdom']
+EMAIL, PASSWORD = 'bench@example.com', 'bench-password'
+
+
+def percentile(samples, pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize(samples) -> dict:
+    return {'n': len(samples), 'p50': round(percentile(samples, 50), 4),
+            'p95': round(percentile(samples, 95), 4), 'mean': round(sum(samples) / len(samples), 4)}
+
+
+class StepTimer:
+    """Collects wall-time samples per named step."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    @contextmanager
+    def step(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[name].append(time.perf_counter() - start)
+
+    def summary(self) -> dict:
+        return {name: summarize(samples) for name, samples in self.samples.items()}
+
+
+def configure(args):
+    """Start the stand-ins and point settings at them; must run before automation modules are imported."""
+    site, site_url = start_fixture_site(latency=args.latency, scroll_delay=args.scroll_delay)
+    stub, api_base = start_stub_server(args.openai_latency)
+    workdir = tempfile.mkdtemp(prefix='linkedin-bench-')
+    os.environ.update({
+        'LINKEDIN_BASE_URL': site_url,
+        'OPENAI_API_BASE': api_base,
+        'DATA_DIR': workdir,
+        'DB_PATH': os.path.join(workdir, 'linkedin.db'),
+        'CONTACTED_INDEX_PATH': os.path.join(workdir, 'contacted.bloom'),
+        'MESSAGE_CACHE_PATH': os.path.join(workdir, 'message_cache.db'),
+        'HEADLESS': 'true',
+        'ACTION_DELAY_SCALE': '0',
+    })
+    os.environ.setdefault('OPENAI_API_KEY', 'sk-stub')
+    return site, site_url, stub
+
+
+def bench_steps(args, timer: StepTimer, site_url: str):
+    """Time login, search, generation, connection and message steps on one browser."""
+    from automation.login import create_driver, login
+    from automation.search_profiles import search_profiles
+    from automation.send_connection import send_connection
+    from automation.send_message import send_message
+    from ai.message_generator import generate_message
+    from utils.storage import get_store
+
+    store = get_store()
+    driver = create_driver(headless=True)
+    try:
+        for _ in range(args.rounds):
+            driver.delete_all_cookies()
+            with timer.step('login'):
+                if not login(driver, EMAIL, PASSWORD):
+                    raise RuntimeError('login failed against the fixture site')
+        leads = []
+        for i in range(args.rounds):
+            driver.get(f'{site_url}/feed/')
+            # distinct keywords give distinct profiles
+            with timer.step('search_profiles'):
+                leads.extend(search_profiles(driver, f'{QUERIES[i % len(QUERIES)]} {i}',
+                                             max_results=args.leads, store=store))
+        for lead in leads[:args.rounds]:
+            with timer.step('generate_message'):
+                note = generate_message(lead['name'], lead['role'], lead['company'], use_cache=False)
+            with timer.step('send_connection'):
+                send_connection(driver, lead['profile_url'], note, store=store)
+            with timer.step('send_message'):
+                send_message(driver, lead['profile_url'], note)
+    finally:
+        driver.quit()
+
+
+def bench_flow(args, timer: StepTimer) -> float:
+    """Time `run_once` end to end (browser start, login, search, generate, send); returns leads/minute."""
+    from workflows.automation_flow import run_once
+    from utils.storage import get_store
+
+    store = get_store()
+    sent = 0
+    for i in range(args.flow_rounds):
+        before = store.count('sent_requests', "status = 'sent'")
+        with timer.step('run_once'):
+            run_once(EMAIL, PASSWORD, [f'{q} flow {i}' for q in QUERIES], max_per_query=args.leads)
+        sent += store.count('sent_requests', "status = 'sent'") - before
+    elapsed = sum(timer.samples['run_once'])
+    return round(sent / elapsed * 60, 2) if elapsed else 0.0
+
+
+def memory_usage() -> dict:
+    """Peak resident set size (MB) of this process and of the largest finished child (the browser)."""
+    if resource is None:
+        return {}
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024  # ru_maxrss is bytes on macOS, KB elsewhere
+    return {'python_max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1),
+            'browser_max_rss_mb': round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale, 1)}
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Print results next to the baseline; returns the regressions beyond `tolerance`."""
+    regressions = []
+    base_steps = baseline.get('steps', {})
+    if baseline.get('config') and baseline['config'] != results['config']:
+        print(f"note: baseline was recorded with {baseline['config']}")
+    print(f"{'step':<18} {'n':>3} {'p50 s':>8} {'p95 s':>8} {'base p95':>9} {'change':>8}")
+    for name, stats in results['steps'].items():
+        base = base_steps.get(name)
+        change = ''
+        if base and base['p95'] > 0:
+            ratio = stats['p95'] / base['p95'] - 1
+            change = f'{ratio * 100:+.0f}%'
+            for metric in ('p50', 'p95'):
+                if base[metric] > 0 and stats[metric] > base[metric] * (1 + tolerance):
+                    regressions.append(f'{name} {metric} {base[metric]}s -> {stats[metric]}s')
+        print(f"{name:<18} {stats['n']:>3} {stats['p50']:>8.3f} {stats['p95']:>8.3f} "
+              f"{base['p95'] if base else '-':>9} {change:>8}")
+    base_lpm = baseline.get('leads_per_minute')
+    print(f"leads/minute: {results['leads_per_minute']}" + (f' (baseline {base_lpm})' if base_lpm else ''))
+    if base_lpm and results['leads_per_minute'] < base_lpm * (1 - tolerance):
+        regressions.append(f"leads/minute {base_lpm} -> {results['leads_per_minute']}")
+    for key, value in results['memory'].items():
+        base = baseline.get('memory', {}).get(key)
+        print(f'{key}: {value}' + (f' (baseline {base})' if base else ''))
+        if base and value > base * (1 + tolerance):
+            regressions.append(f'{key} {base} -> {value}')
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rounds', type=int, default=5, help='samples per step')
+    parser.add_argument('--flow-rounds', type=int, default=2, help='end-to-end run_once samples')
+    parser.add_argument('--leads', type=int, default=10, help='max results per query')
+    parser.add_argument('--latency', type=float, default=0.1, help='fixture site latency (s)')
+    parser.add_argument('--scroll-delay', type=float, default=0.3, help='lazy-load delay of results (s)')
+    parser.add_argument('--openai-latency', type=float, default=0.3, help='stub OpenAI latency (s)')
+    parser.add_argument('--baseline', default=BASELINE, help='baseline JSON to compare against or save')
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown before failing (0.25 = 25%%)')
+    parser.add_argument('--output', help='also write the results JSON here')
+    args = parser.parse_args(argv)
+
+    site, site_url, stub = configure(args)
+    timer = StepTimer()
+    try:
+        bench_steps(args, timer, site_url)
+        leads_per_minute = bench_flow(args, timer)
+    finally:
+        site.shutdown()
+        stub.shutdown()
+    results = {
+        'config': {k: getattr(args, k) for k in ('rounds', 'flow_rounds', 'leads', 'latency', 'scroll_delay',
+                                                  'openai_latency')},
+        'platform': f'{platform.system()} {platform.machine()} Python {platform.python_version()}',
+        'steps': timer.summary(),
+        'leads_per_minute': leads_per_minute,
+        'memory': memory_usage(),
+        'requests': {'fixture_site': site.hits, 'openai': stub.requests, 'actions': dict(site.actions)},
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f'Saved baseline to {args.baseline}')
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for r in regressions:
+        print(f'REGRESSION: {r}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
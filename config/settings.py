@@ -5,20 +5,119 @@ load_dotenv()
 
 # Max daily connections (can be overridden from .env)
 MAX_DAILY_CONNECTIONS = int(os.getenv('MAX_DAILY_REQUESTS', 50))
+# Max daily direct messages and follow-up messages
+MAX_DAILY_MESSAGES = int(os.getenv('MAX_DAILY_MESSAGES', 50))
+MAX_DAILY_FOLLOW_UPS = int(os.getenv('MAX_DAILY_FOLLOW_UPS', 30))
+# Longest connection note LinkedIn accepts; longer rendered notes are shortened
+CONNECTION_NOTE_LIMIT = int(os.getenv('CONNECTION_NOTE_LIMIT', 300))
 
 # Delay range in seconds between actions to mimic human behavior
 DELAY_RANGE = (3, 10)
 
+# Base URL of the site being automated (e.g. a local fixture site for offline benchmarks)
+LINKEDIN_BASE_URL = os.getenv('LINKEDIN_BASE_URL', 'https://www.linkedin.com').rstrip('/')
+
+# Multiplier for the human-like random delays between actions (0 disables them)
+ACTION_DELAY_SCALE = float(os.getenv('ACTION_DELAY_SCALE', 1.0))
+
+# Lean page loads: 'eager' page-load strategy, fewer Chrome background features, and the URL
+# patterns below blocked via DevTools for the listed flows (login, search, connect, message)
+LEAN_MODE = os.getenv('LEAN_MODE', 'true').lower() in ('1', 'true', 'yes')
+LEAN_FLOWS = [f.strip() for f in os.getenv('LEAN_FLOWS', 'login,search,connect,message').split(',') if f.strip()]
+LEAN_BLOCKED_URLS = [u.strip() for u in os.getenv(
+    'LEAN_BLOCKED_URLS',
+    '*.jpg,*.jpeg,*.png,*.gif,*.webp,*.svg,*.ico,*.mp4,*.webm,*.m3u8,*.woff,*.woff2,*.ttf,'
+    '*media.licdn.com/*,*/li/track*,*google-analytics.com/*,*doubleclick.net/*',
+).split(',') if u.strip()]
+
+# Record per-step timing spans to data/spans.csv
+TIMING_ENABLED = os.getenv('TIMING_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
 # Headless browser flag
 HEADLESS = os.getenv('HEADLESS', 'true').lower() in ('1', 'true', 'yes')
 
 # Retry logic
 RETRY_ATTEMPTS = int(os.getenv('RETRY_ATTEMPTS', 3))
 RETRY_BACKOFF = float(os.getenv('RETRY_BACKOFF', 2.0))
+# Max seconds between attempts (delays are jittered) and max retries per run across all dependencies
+RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', 30))
+RETRY_BUDGET = int(os.getenv('RETRY_BUDGET', 20))
+# Circuit breakers (OpenAI, page navigation): open after this many consecutive failures, probe again after the cool-down
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', 5))
+BREAKER_COOLDOWN = float(os.getenv('BREAKER_COOLDOWN', 60))
 
 # Follow-up days
 FOLLOW_UP_DAYS = int(os.getenv('FOLLOW_UP_DAYS', 5))
 
-# Selenium timeouts
+# Selenium timeouts; element lookups use explicit waits (automation/locators.py), so the
+# implicit wait stays 0 and a missing element never costs more than LOCATOR_TIMEOUT
 PAGE_LOAD_TIMEOUT = int(os.getenv('PAGE_LOAD_TIMEOUT', 30))
-IMPLICIT_WAIT = int(os.getenv('IMPLICIT_WAIT', 5))
+IMPLICIT_WAIT = int(os.getenv('IMPLICIT_WAIT', 0))
+LOCATOR_TIMEOUT = float(os.getenv('LOCATOR_TIMEOUT', 3))
+
+# Local data directory and SQLite lead/outreach store
+DATA_DIR = os.getenv('DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data'))
+DB_PATH = os.getenv('DB_PATH', os.path.join(DATA_DIR, 'linkedin.db'))
+
+# Per-day counters of connections, messages and follow-ups sent (see utils/quota.py)
+QUOTA_PATH = os.getenv('QUOTA_PATH', os.path.join(DATA_DIR, 'quota.db'))
+
+# Which alternative of each element locator worked last, plus hit/fallback/miss counters
+LOCATOR_STATS_PATH = os.getenv('LOCATOR_STATS_PATH', os.path.join(DATA_DIR, 'locator_stats.json'))
+
+# Persistent "already contacted" index (Bloom filter sized for capacity at the given error rate)
+CONTACTED_INDEX_PATH = os.getenv('CONTACTED_INDEX_PATH', os.path.join(DATA_DIR, 'contacted.bloom'))
+CONTACTED_INDEX_CAPACITY = int(os.getenv('CONTACTED_INDEX_CAPACITY', 1_000_000))
+CONTACTED_INDEX_ERROR_RATE = float(os.getenv('CONTACTED_INDEX_ERROR_RATE', 0.001))
+
+# Generated-message template cache (TTL in seconds; memory LRU size; max rows on disk)
+MESSAGE_CACHE_PATH = os.getenv('MESSAGE_CACHE_PATH', os.path.join(DATA_DIR, 'message_cache.db'))
+MESSAGE_CACHE_TTL = float(os.getenv('MESSAGE_CACHE_TTL', 7 * 24 * 3600))
+MESSAGE_CACHE_MEMORY_SIZE = int(os.getenv('MESSAGE_CACHE_MEMORY_SIZE', 256))
+MESSAGE_CACHE_MAX_ENTRIES = int(os.getenv('MESSAGE_CACHE_MAX_ENTRIES', 10000))
+
+# OpenAI generation: concurrent requests and per-call timeout in seconds
+OPENAI_CONCURRENCY = int(os.getenv('OPENAI_CONCURRENCY', 4))
+OPENAI_TIMEOUT = float(os.getenv('OPENAI_TIMEOUT', 20))
+# Leads per chat completion when generating in batch mode (1 = one request per lead)
+OPENAI_BATCH_SIZE = int(os.getenv('OPENAI_BATCH_SIZE', 1))
+
+# Max seconds to wait for search results to appear after a query, scroll or page change
+SEARCH_WAIT_TIMEOUT = float(os.getenv('SEARCH_WAIT_TIMEOUT', 8))
+# Planned searches: how long a query's harvested pages and leads are reused, and max new pages per query per run
+QUERY_CACHE_TTL = float(os.getenv('QUERY_CACHE_TTL', 7 * 24 * 3600))
+QUERY_PAGES_PER_RUN = int(os.getenv('QUERY_PAGES_PER_RUN', 3))
+
+# Leads buffered between pipeline stages (search -> dedupe -> generate -> send)
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', 20))
+
+# Days to keep the checkpoints of finished pipeline runs
+PIPELINE_KEEP_DAYS = int(os.getenv('PIPELINE_KEEP_DAYS', 30))
+
+# Send to the best-scoring uncontacted leads of the whole pool instead of in search order
+# (see automation/lead_scoring.py), scoring LEAD_SCORE_CHUNK leads at a time; LEAD_SCORE_PRIOR is
+# how many requests' worth of weight the broader acceptance rate gets against a role's or company's own
+PRIORITIZE_LEADS = os.getenv('PRIORITIZE_LEADS', 'true').lower() in ('1', 'true', 'yes')
+LEAD_SCORE_CHUNK = int(os.getenv('LEAD_SCORE_CHUNK', 100000))
+LEAD_SCORE_PRIOR = float(os.getenv('LEAD_SCORE_PRIOR', 20))
+# Days a profile whose connection request failed is left out of the pick, and failures before it is dropped
+LEAD_RETRY_DAYS = int(os.getenv('LEAD_RETRY_DAYS', 7))
+LEAD_MAX_ATTEMPTS = int(os.getenv('LEAD_MAX_ATTEMPTS', 3))
+
+# Scheduler: daily HH:MM (local time) of the browser jobs, seconds between the background jobs
+SCHEDULE_OUTREACH_AT = os.getenv('SCHEDULE_OUTREACH_AT', '09:00')
+SCHEDULE_FOLLOW_UP_AT = os.getenv('SCHEDULE_FOLLOW_UP_AT', '15:00')
+SCHEDULE_ANALYTICS_EVERY = float(os.getenv('SCHEDULE_ANALYTICS_EVERY', 3600))
+SCHEDULE_MAINTENANCE_EVERY = float(os.getenv('SCHEDULE_MAINTENANCE_EVERY', 6 * 3600))
+# Jobs that can run at once, and where job schedules, durations and queue depth are saved
+SCHEDULER_WORKERS = int(os.getenv('SCHEDULER_WORKERS', 2))
+SCHEDULER_STATE_PATH = os.getenv('SCHEDULER_STATE_PATH', os.path.join(DATA_DIR, 'scheduler_state.json'))
+
+# Browser session reuse: Chrome user-data directory (empty disables it) and saved session cookies
+CHROME_PROFILE_DIR = os.getenv('CHROME_PROFILE_DIR', os.path.join(DATA_DIR, 'chrome-profile'))
+SESSION_COOKIES_PATH = os.getenv('SESSION_COOKIES_PATH', os.path.join(DATA_DIR, 'session_cookies.json'))
+# Max seconds to wait for the feed (or the login form) when checking a saved session
+SESSION_CHECK_TIMEOUT = float(os.getenv('SESSION_CHECK_TIMEOUT', 5))
+
+# Follow-up attempts per unanswered profile (each at least FOLLOW_UP_DAYS apart)
+FOLLOW_UP_MAX = int(os.getenv('FOLLOW_UP_MAX', 2))
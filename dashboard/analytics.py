@@ -1,33 +1,112 @@
 """Analytics utilities for computing acceptance and response rates."""
 import pandas as pd
 
+from dashboard.data_loader import get_frame_cache
+from dashboard.funnel import update_funnel, funnel_totals
+from utils.log_rollup import LogRollup, rollup_path
+from utils.logger import log_csv_files
+from utils.timing import SPANS_CSV
 
-def acceptance_rate(sent_csv: str, responses_csv: str) -> float:
-    try:
-        sent = pd.read_csv(sent_csv)
-    except Exception:
-        return 0.0
+
+def current_totals(store) -> dict:
+    """Fold in new activity, then read the funnel totals; call once per render and pass the result on."""
     try:
-        resp = pd.read_csv(responses_csv)
+        update_funnel(store)
+        return funnel_totals(store)
     except Exception:
-        resp = pd.DataFrame()
-    if sent.empty:
+        return {}
+
+
+def _funnel_rate(store, stage: str, totals: dict = None) -> float:
+    """Distinct profiles reaching `stage` per distinct profile successfully sent to (%)."""
+    totals = current_totals(store) if totals is None else totals
+    if not totals.get('sent'):
         return 0.0
-    accepted = len(resp)
-    return round(accepted / len(sent) * 100, 2)
+    return round(totals[stage] / totals['sent'] * 100, 2)
+
 
+def acceptance_rate(store, totals: dict = None) -> float:
+    return _funnel_rate(store, 'accepted', totals)
 
-def response_rate(sent_csv: str, responses_csv: str) -> float:
-    return acceptance_rate(sent_csv, responses_csv)
+
+def response_rate(store, totals: dict = None) -> float:
+    return _funnel_rate(store, 'replied', totals)
+
+
+def logs_need_rollup(logs_csv: str) -> bool:
+    """True when log files exist but nothing was counted for them yet (e.g. logs written before
+    rollups existed); `python -m utils.log_rollup rebuild` counts them. Page loads never rebuild,
+    since that would race the writer's merges."""
+    if not log_csv_files(logs_csv):
+        return False
+    rollup = LogRollup(rollup_path(logs_csv))
+    try:
+        return rollup.is_empty()
+    finally:
+        rollup.close()
 
 
 def daily_performance(logs_csv: str):
+    """Log lines per day and level, read from the write-time rollups."""
     try:
-        logs = pd.read_csv(logs_csv, parse_dates=['timestamp'])
+        rollup = LogRollup(rollup_path(logs_csv))
+        rows = rollup.daily()
+        rollup.close()
     except Exception:
         return pd.DataFrame()
-    if logs.empty:
+    if not rows:
         return pd.DataFrame()
-    logs['date'] = logs['timestamp'].dt.date
-    summary = logs.groupby(['date','level']).size().unstack(fill_value=0)
+    logs = pd.DataFrame(rows, columns=['date', 'level', 'count'])
+    summary = logs.pivot_table(index='date', columns='level', values='count', aggfunc='sum', fill_value=0)
     return summary
+
+
+def component_error_rates(logs_csv: str) -> pd.DataFrame:
+    """Log lines, errors and error rate (%) per component."""
+    try:
+        rollup = LogRollup(rollup_path(logs_csv))
+        rates = rollup.error_rates()
+        rollup.close()
+    except Exception:
+        return pd.DataFrame()
+    return pd.DataFrame.from_dict(rates, orient='index')
+
+
+def load_spans(path: str = SPANS_CSV, frames=None) -> pd.DataFrame:
+    """Timing spans from the live spans CSV and its archives (appended rows only are parsed)."""
+    frames = frames or get_frame_cache()
+    try:
+        return frames.read_csvs(log_csv_files(path), parse_dates=['timestamp'])
+    except Exception:
+        return pd.DataFrame()
+
+
+def step_latency(spans: pd.DataFrame) -> pd.DataFrame:
+    """Count and p50/p95/p99 duration (ms) per component, step and category."""
+    if spans.empty:
+        return pd.DataFrame()
+    grouped = spans.groupby(['component', 'step', 'category'])['duration_ms']
+    summary = grouped.quantile([0.5, 0.95, 0.99]).unstack()
+    summary.columns = ['p50_ms', 'p95_ms', 'p99_ms']
+    summary.insert(0, 'count', grouped.size())
+    summary['errors'] = spans[spans['outcome'] != 'ok'].groupby(['component', 'step', 'category']).size()
+    return summary.fillna({'errors': 0}).astype({'errors': int}).round(1).sort_values('p95_ms', ascending=False)
+
+
+def run_breakdown(spans: pd.DataFrame, by: str = 'category') -> pd.DataFrame:
+    """Share (%) of each run's wall time per category or step, from self time (time outside child spans).
+    Spans recorded on worker threads (e.g. concurrent OpenAI calls) overlap the main thread,
+    so a run's shares can add up to more than 100%."""
+    if spans.empty:
+        return pd.DataFrame()
+    roots = spans[(spans['component'] == 'automation_flow') & (spans['step'] == 'run_once')]
+    wall = roots.groupby('run_id')['duration_ms'].sum()
+    if wall.empty:
+        return pd.DataFrame()
+    spans = spans[spans['run_id'].isin(wall.index)]
+    if by == 'step':
+        spans = spans.assign(step=spans['component'] + '.' + spans['step'])
+    self_time = spans.pivot_table(index='run_id', columns=by, values='self_ms', aggfunc='sum', fill_value=0)
+    share = self_time.div(wall, axis=0).mul(100).round(1)
+    share.insert(0, 'wall_s', (wall / 1000).round(1))
+    return share.sort_index(ascending=False)
@@ -1,22 +1,87 @@
 """Streamlit dashboard showing basic metrics."""
+import pandas as pd
 import streamlit as st
-from dashboard.analytics import acceptance_rate, daily_performance
+from dashboard.analytics import (acceptance_rate, response_rate, current_totals, daily_performance,
+                                 component_error_rates, logs_need_rollup, load_spans, step_latency,
+                                 run_breakdown)
+from dashboard.data_loader import FrameCache
+from automation.locators import LocatorRegistry
+from dashboard.funnel import DIMENSIONS, funnel_table
+from utils.storage import get_store
+from workflows.scheduler import read_status
+from utils.quota import get_ledger
+from utils.logger import LOG_CSV
 
 st.title('LinkedIn Automation Dashboard')
 
-sent_csv = 'data/sent_requests.csv'
-responses_csv = 'data/responses.csv'
-logs_csv = 'data/logs.csv'
+store = get_store()
+
+
+@st.cache_resource
+def frame_cache():
+    """Parsed spans shared across reruns so each refresh only reads what changed."""
+    return FrameCache()
+
+
+logs_csv = LOG_CSV
 
 st.header('Key Metrics')
-acc = acceptance_rate(sent_csv, responses_csv)
-st.metric('Acceptance / Response Rate (%)', f'{acc}%')
+# one funnel update per render; the rates and the funnel table below all read its result
+totals = current_totals(store)
+acc = acceptance_rate(store, totals)
+st.metric('Acceptance Rate (%)', f'{acc}%')
+st.metric('Reply Rate (%)', f'{response_rate(store, totals)}%')
+
+st.header('Funnel')
+dimension = st.selectbox('Group by', DIMENSIONS)
+funnel = funnel_table(store, dimension)
+if funnel.empty:
+    st.info('No funnel data yet')
+else:
+    st.dataframe(funnel)
 
 st.header('Logs by Day')
 perf = daily_performance(logs_csv)
-if perf.empty:
+if logs_need_rollup(logs_csv):
+    st.info('Existing logs are not counted yet; run `python -m utils.log_rollup rebuild` once.')
+elif perf.empty:
     st.info('No logs yet')
 else:
     st.dataframe(perf)
+    st.subheader('Errors by Component')
+    st.dataframe(component_error_rates(logs_csv))
+
+st.header('Latency')
+spans = load_spans(frames=frame_cache())
+if spans.empty:
+    st.info('No timing spans yet')
+else:
+    st.subheader('Per-step latency (ms)')
+    st.dataframe(step_latency(spans))
+    st.subheader('Share of run wall time (%)')
+    st.caption("'delay' is deliberate random_delay sleeping; 'wait', 'find' and 'page' are time spent waiting on the site.")
+    breakdown_by = st.selectbox('Break down by', ['category', 'step'])
+    st.dataframe(run_breakdown(spans, by=breakdown_by))
+
+st.subheader('Locator health')
+locators = LocatorRegistry().report()
+if locators:
+    st.caption('Rising fallbacks or misses usually mean the LinkedIn UI changed.')
+    st.dataframe(pd.DataFrame.from_dict(locators, orient='index'))
+else:
+    st.info('No element lookups recorded yet')
+
+st.header('Daily quota')
+st.caption('Counters reset at midnight UTC.')
+st.dataframe(pd.DataFrame(get_ledger().usage()).set_index('action'))
+
+st.header('Scheduler')
+scheduler = read_status()
+if scheduler:
+    st.caption(f"Updated {scheduler['updated_at']}; queue depth {scheduler['queue_depth']}; "
+               f"running: {', '.join(scheduler['running']) or 'none'}")
+    st.dataframe(pd.DataFrame.from_dict(scheduler['jobs'], orient='index'))
+else:
+    st.info('The scheduler has not run yet')
 
 st.markdown('This dashboard is a lightweight visual for local runs. Refresh to update.')
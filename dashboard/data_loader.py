@@ -0,0 +1,97 @@
+"""Incremental data loading for the dashboard.
+Parsed frames are cached per source. A CSV that only grew since the last read is parsed
+from the remembered byte offset and appended; a replaced or truncated file (e.g. after log
+rotation) is parsed again in full, and compressed archives are parsed once.
+"""
+import io
+import os
+import threading
+
+import pandas as pd
+
+
+def _records_end(chunk: bytes) -> int:
+    """Length of the leading part of `chunk` made of complete CSV records (0 if there is none).
+    A newline only ends a record when an even number of quotes comes before it; otherwise it
+    is inside a quoted field."""
+    quotes = chunk.count(b'"')
+    end = len(chunk)
+    while True:
+        newline = chunk.rfind(b'\n', 0, end)
+        if newline < 0:
+            return 0
+        quotes -= chunk.count(b'"', newline, end)
+        if quotes % 2 == 0:
+            return newline + 1
+        end = newline
+
+
+class _CsvState:
+    def __init__(self):
+        self.key = None
+        self.offset = 0
+        self.columns = None
+        self.frame = pd.DataFrame()
+
+
+class FrameCache:
+    """Keeps parsed frames between dashboard reruns; safe to share across Streamlit sessions."""
+
+    def __init__(self):
+        self._csv = {}
+        self._lock = threading.Lock()
+
+    def read_csv(self, path: str, parse_dates=None) -> pd.DataFrame:
+        """Return the parsed CSV, reading only bytes appended since the previous call."""
+        path = os.path.abspath(path)
+        with self._lock:
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                self._csv.pop(path, None)
+                return pd.DataFrame()
+            state = self._csv.setdefault(path, _CsvState())
+            identity = (st.st_dev, st.st_ino)
+            if state.key is not None and state.key[0] == identity and state.key[1:] == (st.st_size, st.st_mtime_ns):
+                return state.frame
+            if state.key is None or state.key[0] != identity or st.st_size < state.offset:
+                state.__init__()
+            if path.endswith('.gz'):
+                # compressed archives are immutable once written; parse them whole
+                state.frame = pd.read_csv(path, parse_dates=parse_dates)
+                state.key = (identity, st.st_size, st.st_mtime_ns)
+                return state.frame
+            with open(path, 'rb') as f:
+                f.seek(state.offset)
+                chunk = f.read(st.st_size - state.offset)
+            # only consume complete records; a partially written row is picked up next time
+            end = _records_end(chunk)
+            if end:
+                chunk = chunk[:end]
+                if state.columns is None:
+                    new = pd.read_csv(io.BytesIO(chunk), parse_dates=parse_dates)
+                    state.columns = list(new.columns)
+                else:
+                    new = pd.read_csv(io.BytesIO(chunk), header=None, names=state.columns, parse_dates=parse_dates)
+                state.frame = new if state.frame.empty else pd.concat([state.frame, new], ignore_index=True)
+                state.offset += end
+            state.key = (identity, st.st_size, st.st_mtime_ns)
+            return state.frame
+
+    def read_csvs(self, paths, parse_dates=None) -> pd.DataFrame:
+        frames = [f for f in (self.read_csv(p, parse_dates) for p in paths) if not f.empty]
+        live = {os.path.abspath(p) for p in paths}
+        with self._lock:
+            for stale in set(self._csv) - live:
+                del self._csv[stale]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+_frames = None
+
+
+def get_frame_cache() -> FrameCache:
+    global _frames
+    if _frames is None:
+        _frames = FrameCache()
+    return _frames
@@ -0,0 +1,208 @@
+"""Outreach funnel: searched -> sent -> accepted -> replied -> followed up.
+Counts are of distinct profiles. Failed sends do not count, and later stages only count for
+profiles with a successful send. "Accepted" means the profile has a response, and "replied"
+means that response carries a message. Each profile is attributed to the day it was first
+found (or sent to), its search query, role and company.
+
+Per-profile stage flags are kept in `funnel_profiles`. After each run only profiles touched
+since the last update are recomputed, and the differences are added to `funnel_rollup`, so
+the dashboard reads a few small aggregates instead of joining the full history.
+Run as: python -m dashboard.funnel rebuild
+"""
+import sys
+
+import pandas as pd
+
+from utils.logger import info, error
+from utils.storage import get_store
+
+STAGES = ['searched', 'sent', 'accepted', 'replied', 'followed_up']
+DIMENSIONS = ['day', 'query', 'role', 'company']
+UNKNOWN = '(unknown)'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS funnel_profiles (
+    profile_url TEXT PRIMARY KEY,
+    day TEXT, query TEXT, role TEXT, company TEXT,
+    searched INTEGER, sent INTEGER, accepted INTEGER, replied INTEGER, followed_up INTEGER
+);
+CREATE TABLE IF NOT EXISTS funnel_rollup (
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    searched INTEGER DEFAULT 0, sent INTEGER DEFAULT 0, accepted INTEGER DEFAULT 0,
+    replied INTEGER DEFAULT 0, followed_up INTEGER DEFAULT 0,
+    PRIMARY KEY (dimension, value)
+);
+"""
+
+# Sources whose new rows mark a profile as touched, with the meta key of their watermark
+WATERMARKS = {
+    'funnel_sent_id': "SELECT profile_url, id AS mark FROM sent_requests WHERE id > ?",
+    'funnel_response_id': "SELECT profile_url, id AS mark FROM responses WHERE id > ?",
+    'funnel_follow_up_id': "SELECT profile_url, id AS mark FROM follow_ups WHERE id > ?",
+    'funnel_lead_at': "SELECT profile_url, extracted_at AS mark FROM leads WHERE extracted_at > ?",
+}
+
+STATE_SQL = """
+SELECT t.profile_url,
+       l.extracted_at, l.query, l.role AS lead_role, l.company AS lead_company,
+       s.first_sent_at, s.sent, s.role AS sent_role, s.company AS sent_company,
+       r.responded, r.replied,
+       f.followed_up
+FROM _funnel_touched t
+LEFT JOIN leads l ON l.profile_url = t.profile_url
+LEFT JOIN (
+    SELECT profile_url, MIN(request_sent_at) AS first_sent_at, MAX(status = 'sent') AS sent,
+           MAX(NULLIF(role, '')) AS role, MAX(NULLIF(company, '')) AS company
+    FROM sent_requests WHERE profile_url IN (SELECT profile_url FROM _funnel_touched) GROUP BY profile_url
+) s ON s.profile_url = t.profile_url
+LEFT JOIN (
+    SELECT profile_url, 1 AS responded, MAX(COALESCE(TRIM(message), '') != '') AS replied
+    FROM responses WHERE profile_url IN (SELECT profile_url FROM _funnel_touched) GROUP BY profile_url
+) r ON r.profile_url = t.profile_url
+LEFT JOIN (
+    SELECT profile_url, 1 AS followed_up
+    FROM follow_ups WHERE status = 'sent' AND profile_url IN (SELECT profile_url FROM _funnel_touched)
+    GROUP BY profile_url
+) f ON f.profile_url = t.profile_url
+"""
+
+
+def _ensure_schema(store):
+    with store._lock:
+        store.conn.executescript(SCHEMA)
+
+
+def _text(series: pd.Series) -> pd.Series:
+    """Strings with blanks turned into missing values."""
+    series = series.astype(object)
+    return series.where(series.notna() & (series.astype(str).str.strip() != ''))
+
+
+def _flag(series: pd.Series) -> pd.Series:
+    return pd.to_numeric(series, errors='coerce').fillna(0).astype(int)
+
+
+def _profile_states(raw: pd.DataFrame) -> pd.DataFrame:
+    """Vectorized per-profile stage flags and attribution from the joined source rows."""
+    sent = _flag(raw['sent'])
+    day = _text(raw['extracted_at']).fillna(_text(raw['first_sent_at'])).str.slice(0, 10)
+    states = pd.DataFrame({
+        'profile_url': raw['profile_url'],
+        'day': day.fillna(UNKNOWN),
+        'query': _text(raw['query']).fillna(UNKNOWN),
+        'role': _text(raw['lead_role']).fillna(_text(raw['sent_role'])).fillna(UNKNOWN),
+        'company': _text(raw['lead_company']).fillna(_text(raw['sent_company'])).fillna(UNKNOWN),
+        'searched': raw['extracted_at'].notna().astype(int),
+        'sent': sent,
+        'accepted': sent & _flag(raw['responded']),
+        'replied': sent & _flag(raw['replied']),
+        'followed_up': sent & _flag(raw['followed_up']),
+    })
+    return states
+
+
+def _rollup(states: pd.DataFrame) -> pd.DataFrame:
+    """Stage sums for every (dimension, value) pair."""
+    if states.empty:
+        return pd.DataFrame(columns=['dimension', 'value'] + STAGES)
+    parts = []
+    for dim in DIMENSIONS:
+        grouped = states.groupby(dim)[STAGES].sum().reset_index().rename(columns={dim: 'value'})
+        grouped.insert(0, 'dimension', dim)
+        parts.append(grouped)
+    return pd.concat(parts, ignore_index=True)
+
+
+def update_funnel(store=None) -> int:
+    """Fold everything recorded since the last update into the rollups; returns profiles touched."""
+    store = store or get_store()
+    _ensure_schema(store)
+    with store._lock:
+        conn = store.conn
+        marks = {k: v for k, v in conn.execute(
+            f"SELECT key, value FROM meta WHERE key IN ({', '.join('?' * len(WATERMARKS))})", list(WATERMARKS))}
+        touched = set()
+        new_marks = {}
+        for key, sql in WATERMARKS.items():
+            start = marks.get(key, 0 if key.endswith('_id') else '')
+            rows = conn.execute(sql, (int(start) if key.endswith('_id') else start,)).fetchall()
+            touched.update(r[0] for r in rows)
+            new_marks[key] = max([start] + [r[1] for r in rows if r[1] is not None],
+                                 key=lambda m: (int(m) if key.endswith('_id') else str(m)))
+        if not touched:
+            return 0
+        try:
+            with conn:
+                conn.execute('CREATE TEMP TABLE IF NOT EXISTS _funnel_touched (profile_url TEXT PRIMARY KEY)')
+                conn.execute('DELETE FROM _funnel_touched')
+                conn.executemany('INSERT INTO _funnel_touched VALUES (?)', [(u,) for u in touched])
+                raw = pd.read_sql_query(STATE_SQL, conn)
+                old = pd.read_sql_query(
+                    'SELECT p.* FROM funnel_profiles p JOIN _funnel_touched t ON t.profile_url = p.profile_url', conn)
+                new = _profile_states(raw)
+                delta = _rollup(new).set_index(['dimension', 'value']).sub(
+                    _rollup(old).set_index(['dimension', 'value']), fill_value=0).astype(int).reset_index()
+                delta = delta[(delta[STAGES] != 0).any(axis=1)]
+                conn.executemany(
+                    f"INSERT INTO funnel_rollup (dimension, value, {', '.join(STAGES)}) "
+                    f"VALUES (?, ?, {', '.join('?' * len(STAGES))}) "
+                    "ON CONFLICT(dimension, value) DO UPDATE SET "
+                    + ', '.join(f'{s} = {s} + excluded.{s}' for s in STAGES),
+                    delta[['dimension', 'value'] + STAGES].itertuples(index=False, name=None),
+                )
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO funnel_profiles VALUES ({', '.join('?' * (5 + len(STAGES)))})",
+                    new[['profile_url'] + DIMENSIONS + STAGES].itertuples(index=False, name=None),
+                )
+                conn.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                                 [(k, str(v)) for k, v in new_marks.items()])
+        except Exception as e:
+            error('funnel', f'Funnel update failed: {e}')
+            return 0
+    info('funnel', f'Updated funnel rollups for {len(touched)} profiles')
+    return len(touched)
+
+
+def rebuild_funnel(store=None) -> int:
+    """Drop the rollups and recompute them from the full history."""
+    store = store or get_store()
+    _ensure_schema(store)
+    with store._lock, store.conn:
+        store.conn.execute('DELETE FROM funnel_profiles')
+        store.conn.execute('DELETE FROM funnel_rollup')
+        store.conn.execute(f"DELETE FROM meta WHERE key IN ({', '.join('?' * len(WATERMARKS))})", list(WATERMARKS))
+    return update_funnel(store)
+
+
+def funnel_table(store=None, dimension: str = 'day') -> pd.DataFrame:
+    """Rollup rows for one dimension with stage-to-stage conversion rates (%)."""
+    store = store or get_store()
+    _ensure_schema(store)
+    rows = store.query(
+        f"SELECT value AS {dimension}, {', '.join(STAGES)} FROM funnel_rollup WHERE dimension = ? ORDER BY value",
+        (dimension,),
+    )
+    table = pd.DataFrame(rows, columns=[dimension] + STAGES)
+    sent = table['sent'].where(table['sent'] > 0)
+    table['acceptance_rate'] = (table['accepted'] / sent * 100).round(2).fillna(0.0)
+    table['reply_rate'] = (table['replied'] / sent * 100).round(2).fillna(0.0)
+    return table.set_index(dimension)
+
+
+def funnel_totals(store=None) -> dict:
+    """Overall distinct-profile counts per stage (sums of the per-day rollup)."""
+    store = store or get_store()
+    _ensure_schema(store)
+    row = store.query(
+        f"SELECT {', '.join(f'COALESCE(SUM({s}), 0) AS {s}' for s in STAGES)} "
+        "FROM funnel_rollup WHERE dimension = 'day'"
+    )[0]
+    return {s: int(row[s]) for s in STAGES}
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] not in ('update', 'rebuild'):
+        print('Usage: python -m dashboard.funnel update|rebuild')
+        sys.exit(1)
+    print((update_funnel if sys.argv[1] == 'update' else rebuild_funnel)())
@@ -1,14 +1,39 @@
 """Generate realistic fake datasets for leads, sent requests, responses, and logs using Faker.
+Leads, sent requests and responses go to the SQLite lead store; logs go to logs.csv.
+
+Scale mode generates millions of consistent rows for load tests. Names, companies, locations
+and log messages are drawn from pools pre-generated with Faker, and the per-row sampling is
+vectorized with NumPy. Shards of SHARD_SIZE leads are generated in parallel processes, each
+with its own seed derived from `seed` and the shard number, so the output depends only on the
+seed, lead count and end date (not on the number of workers). Leads are contacted with an
+exponential delay. Requests are accepted at per-role rates, with log-normal response times,
+and only responses that land before the end date are kept. Responses always belong to
+profiles that were sent to. Output is CSV (the legacy file names), SQLite (a lead store
+database plus logs.csv) or Parquet (one directory of part files per table; needs pyarrow).
 Run as: python data/generate_fake_data.py
+        python data/generate_fake_data.py scale <leads> [csv|sqlite|parquet] [out_dir] [workers] [seed]
 """
 import csv
 import os
+import shutil
+import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from faker import Faker
 from datetime import datetime, timedelta
 import random
 
+import numpy as np
+import pandas as pd
+
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
+sys.path.insert(0, BASE_DIR)
+
+from config import settings
+from utils.storage import LeadStore, LEAD_COLUMNS, SENT_COLUMNS, RESPONSE_COLUMNS, get_store
+from utils.log_rollup import rebuild_log_rollups
+from utils.logger import LOG_CSV
 
 fake = Faker()
 Faker.seed(42)
@@ -23,88 +48,72 @@ def _rand_past_datetime(days=30):
     return datetime.utcnow() - timedelta(days=random.randint(0, days), hours=random.randint(0,23), minutes=random.randint(0,59))
 
 
-def generate_leads(n=100, out='data/leads_input.csv'):
-    path = os.path.join(BASE_DIR, out)
-    _ensure_dir(path)
-    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
-    with open(path, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        if write_header:
-            writer.writerow(['profile_url', 'name', 'role', 'company', 'location', 'extracted_at'])
-        for _ in range(n):
-            name = fake.name()
-            role = random.choice(['Software Engineer','Engineering Manager','Product Manager','Data Scientist','Product Designer'])
-            company = fake.company()
-            profile_slug = fake.user_name()
-            profile_url = f'https://www.linkedin.com/in/{profile_slug}'
-            location = fake.city() + ', ' + fake.country()
-            extracted_at = _rand_past_datetime().isoformat()
-            writer.writerow([profile_url, name, role, company, location, extracted_at])
+def generate_leads(n=100, store=None):
+    store = store or get_store()
+    rows = []
+    for _ in range(n):
+        name = fake.name()
+        role = random.choice(['Software Engineer','Engineering Manager','Product Manager','Data Scientist','Product Designer'])
+        company = fake.company()
+        profile_slug = fake.user_name()
+        profile_url = f'https://www.linkedin.com/in/{profile_slug}'
+        location = fake.city() + ', ' + fake.country()
+        extracted_at = _rand_past_datetime().isoformat()
+        rows.append({'profile_url': profile_url, 'name': name, 'role': role, 'company': company,
+                     'location': location, 'extracted_at': extracted_at})
+    store.add_leads(rows)
 
 
-def generate_sent_requests(n=80, out='data/sent_requests.csv'):
-    path = os.path.join(BASE_DIR, out)
-    _ensure_dir(path)
-    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
-    with open(path, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        if write_header:
-            writer.writerow(['profile_url', 'name', 'role', 'company', 'request_sent_at', 'status', 'note'])
-        for _ in range(n):
+def generate_sent_requests(n=80, store=None):
+    store = store or get_store()
+    rows = []
+    for _ in range(n):
+        name = fake.name()
+        role = random.choice(['Software Engineer','Engineering Manager','Product Manager','Data Scientist'])
+        company = fake.company()
+        profile_slug = fake.user_name()
+        profile_url = f'https://www.linkedin.com/in/{profile_slug}'
+        sent_at = _rand_past_datetime().isoformat()
+        status = random.choice(['sent','failed']) if random.random() < 0.95 else 'failed'
+        note = f"Hi {name.split()[0]}, I came across your profile at {company} and wanted to connect." 
+        rows.append({'profile_url': profile_url, 'name': name, 'role': role, 'company': company,
+                     'request_sent_at': sent_at, 'status': status, 'note': note})
+    store.record_sent(rows)
+
+
+def generate_responses(n=30, store=None):
+    store = store or get_store()
+    choose_from = store.query('SELECT profile_url, name, role, company FROM sent_requests')
+    rows = []
+    for _ in range(n):
+        if choose_from:
+            row = random.choice(choose_from)
+            profile_url = row.get('profile_url')
+            name = row.get('name')
+            role = row.get('role')
+            company = row.get('company')
+            resp_at = _rand_past_datetime().isoformat()
+            message = random.choice([
+                f"Thanks for reaching out, happy to connect!",
+                f"Appreciate the note — let's connect and chat.",
+                f"Thanks! Looking forward to staying in touch."
+            ])
+        else:
             name = fake.name()
-            role = random.choice(['Software Engineer','Engineering Manager','Product Manager','Data Scientist'])
+            role = random.choice(['Software Engineer','Product Manager','Data Scientist'])
             company = fake.company()
             profile_slug = fake.user_name()
             profile_url = f'https://www.linkedin.com/in/{profile_slug}'
-            sent_at = _rand_past_datetime().isoformat()
-            status = random.choice(['sent','failed']) if random.random() < 0.95 else 'failed'
-            note = f"Hi {name.split()[0]}, I came across your profile at {company} and wanted to connect." 
-            writer.writerow([profile_url, name, role, company, sent_at, status, note])
+            resp_at = _rand_past_datetime().isoformat()
+            message = "Thanks — happy to connect!"
+        rows.append({'profile_url': profile_url, 'name': name, 'role': role, 'company': company,
+                     'response_at': resp_at, 'message': message})
+    store.record_responses(rows)
 
 
-def generate_responses(n=30, sent_csv='data/sent_requests.csv', out='data/responses.csv'):
-    sent_path = os.path.join(BASE_DIR, sent_csv)
-    path = os.path.join(BASE_DIR, out)
-    _ensure_dir(path)
-    sent = []
-    if os.path.exists(sent_path):
-        with open(sent_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for r in reader:
-                sent.append(r)
-    choose_from = sent if sent else None
-    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
-    with open(path, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        if write_header:
-            writer.writerow(['profile_url', 'name', 'role', 'company', 'response_at', 'message'])
-        for _ in range(n):
-            if choose_from:
-                row = random.choice(choose_from)
-                profile_url = row.get('profile_url')
-                name = row.get('name')
-                role = row.get('role')
-                company = row.get('company')
-                resp_at = _rand_past_datetime().isoformat()
-                message = random.choice([
-                    f"Thanks for reaching out, happy to connect!",
-                    f"Appreciate the note — let's connect and chat.",
-                    f"Thanks! Looking forward to staying in touch."
-                ])
-                writer.writerow([profile_url, name, role, company, resp_at, message])
-            else:
-                name = fake.name()
-                role = random.choice(['Software Engineer','Product Manager','Data Scientist'])
-                company = fake.company()
-                profile_slug = fake.user_name()
-                profile_url = f'https://www.linkedin.com/in/{profile_slug}'
-                resp_at = _rand_past_datetime().isoformat()
-                message = "Thanks — happy to connect!"
-                writer.writerow([profile_url, name, role, company, resp_at, message])
-
-
-def generate_logs(n=200, out='data/logs.csv'):
-    path = os.path.join(BASE_DIR, out)
+def generate_logs(n=200, out=None):
+    # default to the live log under DATA_DIR, where the dashboard and the rollups look
+    path = os.path.join(BASE_DIR, out) if out else LOG_CSV
     _ensure_dir(path)
     write_header = not os.path.exists(path) or os.path.getsize(path) == 0
     levels = ['INFO', 'ERROR', 'WARNING']
@@ -119,12 +128,248 @@ def generate_logs(n=200, out='data/logs.csv'):
             comp = random.choice(components)
             msg = fake.sentence(nb_words=8)
             writer.writerow([ts, level, comp, msg])
+    # the rows bypass the logger, so recount the log rollups
+    rebuild_log_rollups(path)
+
+
+# --- scale mode ---------------------------------------------------------
+
+SHARD_SIZE = 200_000
+POOL_SIZE = 5000
+# window the timestamps are spread over, in days before the end date
+SCALE_DAYS = 90
+LOGS_PER_LEAD = 2
+SENT_RATE = 0.8
+SEND_FAILURE_RATE = 0.05
+# mean hours from finding a lead to sending the request
+SEND_DELAY_HOURS = 12
+# share of successful requests that are accepted, per role
+ACCEPTANCE = {'Software Engineer': 0.28, 'Engineering Manager': 0.35, 'Product Manager': 0.42,
+              'Data Scientist': 0.31, 'Product Designer': 0.38}
+ROLE_WEIGHTS = [0.4, 0.12, 0.2, 0.18, 0.1]
+# share of accepted requests that come with a reply message
+REPLY_RATE = 0.6
+# response time is log-normal: median hours and sigma of the underlying normal
+RESPONSE_MEDIAN_HOURS = 20
+RESPONSE_SIGMA = 1.2
+QUERY_LOCATIONS = ['United States', 'India', 'United Kingdom', 'Germany', 'Canada']
+LOG_LEVELS = ['INFO', 'ERROR', 'WARNING']
+LOG_LEVEL_WEIGHTS = [0.8, 0.1, 0.1]
+LOG_COMPONENTS = ['login', 'search_profiles', 'send_connection', 'send_message', 'follow_up', 'automation_flow',
+                  'scheduler']
+REPLIES = ["Thanks for reaching out, happy to connect!", "Appreciate the note — let's connect and chat.",
+           "Thanks! Looking forward to staying in touch."]
+LOG_COLUMNS = ['timestamp', 'level', 'component', 'message']
+# output name per table and format; SQLite output keeps the logs in CSV, where the app reads them
+SCALE_FILES = {'leads': 'leads_input', 'sent_requests': 'sent_requests', 'responses': 'responses', 'logs': 'logs'}
+TABLE_COLUMNS = {'leads': LEAD_COLUMNS, 'sent_requests': SENT_COLUMNS, 'responses': RESPONSE_COLUMNS,
+                 'logs': LOG_COLUMNS}
+FORMATS = ['csv', 'sqlite', 'parquet']
+
+_pools = {}
+
+
+def _faker_pools(seed: int) -> dict:
+    """Value pools for vectorized sampling, built once per process and seed."""
+    if seed not in _pools:
+        pool_fake = Faker()
+        pool_fake.seed_instance(seed)
+        first = np.array(sorted({pool_fake.first_name() for _ in range(POOL_SIZE)}), dtype=object)
+        last = np.array(sorted({pool_fake.last_name() for _ in range(POOL_SIZE)}), dtype=object)
+        _pools[seed] = {
+            'first': first,
+            'last': last,
+            'first_slug': np.array([n.lower().replace(' ', '') for n in first], dtype=object),
+            'last_slug': np.array([n.lower().replace(' ', '') for n in last], dtype=object),
+            'company': np.array([pool_fake.company() for _ in range(POOL_SIZE)], dtype=object),
+            'location': np.array([f'{pool_fake.city()}, {pool_fake.country()}' for _ in range(POOL_SIZE)],
+                                 dtype=object),
+            'sentence': np.array([pool_fake.sentence(nb_words=8) for _ in range(POOL_SIZE)], dtype=object),
+        }
+    return _pools[seed]
+
+
+def _iso(ts: np.ndarray) -> np.ndarray:
+    """datetime64 values as isoformat() strings, like the rest of the app writes them."""
+    return np.datetime_as_string(ts.astype('datetime64[us]'), unit='us').astype(object)
+
+
+def _hours(hours: np.ndarray) -> np.ndarray:
+    return (hours * 3_600_000_000).astype('timedelta64[us]')
+
+
+def generate_shard(shard: int, start: int, stop: int, seed: int, end: np.datetime64) -> dict:
+    """DataFrames for leads `start`..`stop` (global numbering) and their sends, responses and logs."""
+    rng = np.random.default_rng([seed, shard])
+    pools = _faker_pools(seed)
+    n = stop - start
+    roles = np.array(list(ACCEPTANCE), dtype=object)
+
+    # leads
+    fi = rng.integers(len(pools['first']), size=n)
+    li = rng.integers(len(pools['last']), size=n)
+    role_idx = rng.choice(len(roles), size=n, p=ROLE_WEIGHTS)
+    role = roles[role_idx]
+    first = pools['first'][fi]
+    name = first + ' ' + pools['last'][li]
+    # the global lead number keeps profile URLs unique across shards
+    ids = np.char.mod('%x', np.arange(start, stop)).astype(object)
+    profile_url = 'https://www.linkedin.com/in/' + pools['first_slug'][fi] + '-' + pools['last_slug'][li] + '-' + ids
+    company = pools['company'][rng.integers(POOL_SIZE, size=n)]
+    extracted = end - _hours(rng.uniform(0, SCALE_DAYS * 24, size=n))
+    query = role + ' / ' + np.array(QUERY_LOCATIONS, dtype=object)[rng.integers(len(QUERY_LOCATIONS), size=n)]
+    leads = pd.DataFrame({'profile_url': profile_url, 'name': name, 'role': role, 'company': company,
+                          'location': pools['location'][rng.integers(POOL_SIZE, size=n)],
+                          'extracted_at': _iso(extracted), 'query': query})
+
+    # sent requests: some leads are contacted a while after being found
+    sent_at = extracted + _hours(rng.exponential(SEND_DELAY_HOURS, size=n))
+    sent = (rng.random(n) < SENT_RATE) & (sent_at <= end)
+    ok = rng.random(n) >= SEND_FAILURE_RATE
+    note = 'Hi ' + first + ', I came across your profile at ' + company + ' and wanted to connect.'
+    sent_requests = pd.DataFrame({'profile_url': profile_url[sent], 'name': name[sent], 'role': role[sent],
+                                  'company': company[sent], 'request_sent_at': _iso(sent_at[sent]),
+                                  'status': np.where(ok[sent], 'sent', 'failed').astype(object),
+                                  'note': note[sent]})
+
+    # responses: accepted successful sends whose response time falls before the end date
+    acceptance = np.array(list(ACCEPTANCE.values()))[role_idx]
+    response_at = sent_at + _hours(rng.lognormal(np.log(RESPONSE_MEDIAN_HOURS), RESPONSE_SIGMA, size=n))
+    responded = sent & ok & (rng.random(n) < acceptance) & (response_at <= end)
+    replies = np.array(REPLIES + [''], dtype=object)
+    reply = np.where(rng.random(n) < REPLY_RATE, rng.integers(len(REPLIES), size=n), len(REPLIES))
+    responses = pd.DataFrame({'profile_url': profile_url[responded], 'name': name[responded],
+                              'role': role[responded], 'company': company[responded],
+                              'response_at': _iso(response_at[responded]), 'message': replies[reply[responded]]})
+
+    # logs, in time order within the shard
+    n_logs = n * LOGS_PER_LEAD
+    logged = np.sort(end - _hours(rng.uniform(0, SCALE_DAYS * 24, size=n_logs)))
+    logs = pd.DataFrame({'timestamp': _iso(logged),
+                         'level': np.array(LOG_LEVELS, dtype=object)[rng.choice(len(LOG_LEVELS), size=n_logs,
+                                                                                  p=LOG_LEVEL_WEIGHTS)],
+                         'component': np.array(LOG_COMPONENTS, dtype=object)[rng.integers(len(LOG_COMPONENTS),
+                                                                                          size=n_logs)],
+                         'message': pools['sentence'][rng.integers(POOL_SIZE, size=n_logs)]})
+    return {'leads': leads, 'sent_requests': sent_requests, 'responses': responses, 'logs': logs}
+
+
+def _part_path(parts_dir: str, table: str, shard: int, ext: str) -> str:
+    return os.path.join(parts_dir, table, f'part-{shard:05d}.{ext}')
+
+
+def _write_shard(shard: int, start: int, stop: int, seed: int, end: np.datetime64, fmt: str, parts_dir: str) -> dict:
+    """Generate one shard and write it as part files; returns the row count per table."""
+    frames = generate_shard(shard, start, stop, seed, end)
+    for table, frame in frames.items():
+        if fmt == 'parquet':
+            frame.to_parquet(_part_path(parts_dir, table, shard, 'parquet'), index=False)
+        elif fmt == 'sqlite' and table != 'logs':
+            # one small database per shard; the parent merges them with INSERT ... SELECT
+            conn = sqlite3.connect(_part_path(parts_dir, table, shard, 'db'))
+            try:
+                frame.to_sql(table, conn, index=False, chunksize=50_000)
+            finally:
+                conn.close()
+        else:
+            frame.to_csv(_part_path(parts_dir, table, shard, 'csv'), header=False, index=False)
+    return {table: len(frame) for table, frame in frames.items()}
+
+
+def _concat_csv(parts: list, path: str, columns: list):
+    with open(path, 'w', newline='', encoding='utf-8') as out:
+        csv.writer(out).writerow(columns)
+    with open(path, 'ab') as out:
+        for part in parts:
+            with open(part, 'rb') as f:
+                shutil.copyfileobj(f, out, 1 << 20)
+
+
+def _merge_sqlite(parts_dir: str, shards: int, db_path: str):
+    store = LeadStore(db_path)
+    try:
+        with store._lock:
+            for table in ('leads', 'sent_requests', 'responses'):
+                cols = ', '.join(TABLE_COLUMNS[table])
+                for shard in range(shards):
+                    store.conn.execute('ATTACH DATABASE ? AS part', (_part_path(parts_dir, table, shard, 'db'),))
+                    with store.conn:
+                        store.conn.execute(f'INSERT INTO main.{table} ({cols}) SELECT {cols} FROM part.{table}')
+                    store.conn.execute('DETACH DATABASE part')
+    finally:
+        store.close()
+
+
+def _clear_outputs(out_dir: str):
+    """Remove what an earlier scale run (in any format) left in `out_dir`, so runs never mix."""
+    names = [os.path.join(out_dir, '.parts'), os.path.join(out_dir, 'logs.rollup.db')]
+    names += [os.path.join(out_dir, table) for table in SCALE_FILES]
+    names += [os.path.join(out_dir, f'{name}.csv') for name in SCALE_FILES.values()]
+    names += [os.path.join(out_dir, f'linkedin.db{suffix}') for suffix in ('', '-wal', '-shm')]
+    for path in names:
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+
+def generate_scale(n_leads: int, fmt: str = 'csv', out_dir: str = None, workers: int = None, seed: int = 42,
+                   end: datetime = None) -> dict:
+    """Write `n_leads` leads with matching sent requests, responses and logs to `out_dir` in `fmt`.
+    Timestamps fall in the SCALE_DAYS before `end` (default: the start of today, UTC).
+    Outputs of an earlier run in `out_dir` are replaced; the application's own data directory is
+    refused. Returns the row count per table."""
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    if fmt == 'parquet':
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise RuntimeError('Parquet output needs pyarrow (pip install pyarrow)')
+    out_dir = os.path.abspath(out_dir or os.path.join(DATA_DIR, 'scale'))
+    if out_dir in (os.path.abspath(DATA_DIR), os.path.abspath(settings.DATA_DIR)):
+        raise ValueError(f'{out_dir} holds the application data; pick another output directory')
+    _clear_outputs(out_dir)
+    end = np.datetime64(end or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0), 'us')
+    shards = [(k, start, min(start + SHARD_SIZE, n_leads)) for k, start in enumerate(range(0, n_leads, SHARD_SIZE))]
+    parts_dir = out_dir if fmt == 'parquet' else os.path.join(out_dir, '.parts')
+    for table in SCALE_FILES:
+        os.makedirs(os.path.join(parts_dir, table), exist_ok=True)
+
+    counts = dict.fromkeys(SCALE_FILES, 0)
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [pool.submit(_write_shard, k, start, stop, seed, end, fmt, parts_dir)
+                       for k, start, stop in shards]
+            for future in futures:
+                for table, count in future.result().items():
+                    counts[table] += count
+
+        if fmt != 'parquet':
+            for table, name in SCALE_FILES.items():
+                if fmt == 'csv' or table == 'logs':
+                    _concat_csv([_part_path(parts_dir, table, k, 'csv') for k, _, _ in shards],
+                                os.path.join(out_dir, f'{name}.csv'), TABLE_COLUMNS[table])
+            if fmt == 'sqlite':
+                _merge_sqlite(parts_dir, len(shards), os.path.join(out_dir, 'linkedin.db'))
+            rebuild_log_rollups(os.path.join(out_dir, 'logs.csv'))
+    finally:
+        if parts_dir != out_dir:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+    return counts
 
 
 if __name__ == '__main__':
+    if len(sys.argv) > 2 and sys.argv[1] == 'scale':
+        args = sys.argv[2:] + [None] * 4
+        n, fmt, out, workers, seed = int(args[0]), args[1] or 'csv', args[2], args[3], args[4]
+        start = datetime.utcnow()
+        counts = generate_scale(n, fmt, out, int(workers) if workers else None, int(seed) if seed else 42)
+        print(f'Generated {counts} as {fmt} in {(datetime.utcnow() - start).total_seconds():.1f}s')
+        sys.exit(0)
     # Generate datasets with default sizes
     generate_leads(100)
     generate_sent_requests(80)
     generate_responses(30)
     generate_logs(200)
-    print('Fake datasets generated in data/ (leads_input.csv, sent_requests.csv, responses.csv, logs.csv)')
+    print(f'Fake datasets generated in {settings.DATA_DIR} (linkedin.db: leads, sent_requests, responses; logs.csv)')
@@ -1,5 +1,6 @@
 """Entry point for running the LinkedIn automation workflow."""
 import os
+import sys
 import json
 from dotenv import load_dotenv
 
@@ -7,7 +8,9 @@ load_dotenv()
 
 from config import settings
 from utils.logger import info, error
+from automation.query_planner import PlannedQuery, plan_queries
 from workflows.automation_flow import run_once
+from workflows.scheduler import default_jobs, run_scheduler
 
 
 def load_linkedin_config(path='config/linkedin_config.json'):
@@ -19,57 +22,25 @@ def load_linkedin_config(path='config/linkedin_config.json'):
         return {}
 
 
-def main():
+def main(dry_run: bool = False, schedule: bool = False):
     email = os.getenv('LINKEDIN_EMAIL')
     password = os.getenv('LINKEDIN_PASSWORD')
     if not email or not password:
         error('main', 'Missing LINKEDIN_EMAIL or LINKEDIN_PASSWORD in environment')
         return
-    cfg = load_linkedin_config()
-    queries = []
-    # build search queries from config
-    titles = cfg.get('job_titles', [])
-    locations = cfg.get('locations', [])
-    """Entry point for running the LinkedIn automation workflow."""
-    import os
-    import json
-    from dotenv import load_dotenv
-
-    load_dotenv()
-
-    from config import settings
-    from utils.logger import info, error
-    from workflows.automation_flow import run_once
-
-
-    def load_linkedin_config(path='config/linkedin_config.json'):
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            error('main', f'Failed to load config: {e}')
-            return {}
-
-
-    def main():
-        email = os.getenv('LINKEDIN_EMAIL')
-        password = os.getenv('LINKEDIN_PASSWORD')
-        if not email or not password:
-            error('main', 'Missing LINKEDIN_EMAIL or LINKEDIN_PASSWORD in environment')
-            return
-        cfg = load_linkedin_config()
-        queries = []
-        # build search queries from config
-        titles = cfg.get('job_titles', [])
-        locations = cfg.get('locations', [])
-        for t in titles:
-            for loc in locations:
-                queries.append(f'{t} {loc}')
-        if not queries:
-            queries = ['Software Engineer United States']
-        info('main', 'Starting automation run')
-        run_once(email, password, queries, max_per_query=5)
+    # build direct people-search URLs from config (titles x locations, keywords, experience levels)
+    queries = plan_queries(load_linkedin_config())
+    if not queries:
+        queries = [PlannedQuery('Software Engineer', 'United States')]
+    if schedule:
+        info('main', f'Starting scheduler with {len(queries)} searches')
+        run_scheduler(default_jobs(email, password, queries))
+        return
+    info('main', f"Starting automation run with {len(queries)} searches{' (dry run)' if dry_run else ''}")
+    run_once(email, password, queries, max_per_query=5, dry_run=dry_run)
 
 
-    if __name__ == '__main__':
-        main()
+if __name__ == '__main__':
+    # --dry-run: search and generate notes without sending anything
+    # --schedule: keep running outreach, follow-up, analytics and maintenance jobs on their cadences
+    main(dry_run='--dry-run' in sys.argv[1:], schedule='--schedule' in sys.argv[1:])
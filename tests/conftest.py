@@ -0,0 +1,9 @@
+"""Run the tests from a scratch directory (also used as DATA_DIR) so they never touch the real
+ledger, store or logs, including the relative automation.log."""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['DATA_DIR'] = tempfile.mkdtemp(prefix='linkedin-tests-')
+os.chdir(os.environ['DATA_DIR'])
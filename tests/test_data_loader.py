@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from dashboard.data_loader import FrameCache, _records_end
+
+
+@pytest.mark.parametrize('chunk, end', [
+    (b'', 0),
+    (b'1,a', 0),
+    (b'1,a\n2,b', 4),
+    (b'1,a\n2,b\n', 8),
+    (b'1,"a\nb"\n2,"c', 8),
+    (b'1,"a\n', 0),
+    (b'1,"say ""hi""\nthere"\n', 21),
+])
+def test_records_end(chunk, end):
+    assert _records_end(chunk) == end
+
+
+def _append(path, data: bytes):
+    with open(path, 'ab') as f:
+        f.write(data)
+
+
+def test_partial_trailing_record_is_read_once_complete(tmp_path):
+    path = str(tmp_path / 'spans.csv')
+    _append(path, b'step,ms\nlogin,12\nsear')
+    frames = FrameCache()
+    assert frames.read_csv(path).to_dict('records') == [{'step': 'login', 'ms': 12}]
+    _append(path, b'ch,30\n')
+    assert frames.read_csv(path).to_dict('records') == [{'step': 'login', 'ms': 12}, {'step': 'search', 'ms': 30}]
+
+
+def test_quoted_newline_is_not_split(tmp_path):
+    path = str(tmp_path / 'logs.csv')
+    _append(path, b'level,message\nINFO,"first\nline"\nERROR,"broken')
+    frames = FrameCache()
+    assert frames.read_csv(path).to_dict('records') == [{'level': 'INFO', 'message': 'first\nline'}]
+    _append(path, b'\nacross writes"\n')
+    assert frames.read_csv(path).to_dict('records') == [
+        {'level': 'INFO', 'message': 'first\nline'},
+        {'level': 'ERROR', 'message': 'broken\nacross writes'},
+    ]
+
+
+def test_replaced_file_is_read_again(tmp_path):
+    path = str(tmp_path / 'logs.csv')
+    _append(path, b'level,message\nINFO,old\nINFO,older\n')
+    frames = FrameCache()
+    assert len(frames.read_csv(path)) == 2
+    os.remove(path)
+    _append(path, b'level,message\nERROR,new\n')
+    assert frames.read_csv(path).to_dict('records') == [{'level': 'ERROR', 'message': 'new'}]
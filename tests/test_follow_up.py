@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from automation import follow_up, send_message
+from config import settings
+from utils import quota, resilience
+from utils.quota import QuotaLedger
+from utils.storage import LeadStore
+
+PROFILES = ['https://www.linkedin.com/in/a', 'https://www.linkedin.com/in/b', 'https://www.linkedin.com/in/c']
+
+
+class OfflineDriver:
+    def get(self, url):
+        raise WebDriverException('unknown error: net::ERR_INTERNET_DISCONNECTED')
+
+
+class OnlineDriver:
+    def get(self, url):
+        pass
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(quota, '_ledger', QuotaLedger(str(tmp_path / 'quota.db')))
+    monkeypatch.setattr(resilience, '_breakers', {})
+    monkeypatch.setattr(settings, 'RETRY_BACKOFF', 0)
+    resilience.reset_retry_budget()
+    store = LeadStore(str(tmp_path / 'leads.db'))
+    sent_at = (datetime.utcnow() - timedelta(days=settings.FOLLOW_UP_DAYS + 1)).isoformat()
+    store.record_sent([{'profile_url': url, 'name': '', 'role': '', 'company': '', 'request_sent_at': sent_at,
+                        'status': 'sent', 'note': ''} for url in PROFILES])
+    return store
+
+
+def _candidates(store):
+    cutoff = datetime.utcnow() - timedelta(days=settings.FOLLOW_UP_DAYS)
+    return [(row['profile_url'], row['follow_ups'])
+            for chunk in store.iter_follow_up_candidates(cutoff, cutoff, settings.FOLLOW_UP_MAX) for row in chunk]
+
+
+def test_outage_records_no_attempts(store):
+    before = _candidates(store)
+    assert len(before) == len(PROFILES)
+    assert follow_up.follow_up_unanswered(OfflineDriver(), store=store) == 0
+    assert store.query('SELECT * FROM follow_ups') == []
+    assert _candidates(store) == before
+    # the slots taken for the failed sends were given back
+    assert quota.get_ledger().used('follow_up') == 0
+
+
+def test_used_up_quota_records_no_attempts(store, monkeypatch):
+    monkeypatch.setattr(quota, '_ledger', QuotaLedger(store.path + '.quota', dict(quota.default_limits(), follow_up=0)))
+    assert follow_up.follow_up_unanswered(OfflineDriver(), store=store) == 0
+    assert store.query('SELECT * FROM follow_ups') == []
+
+
+def test_profile_failure_counts_as_an_attempt(store, monkeypatch):
+    def no_button(driver, name, timeout=None, condition='clickable'):
+        raise TimeoutException(f'No element for locator {name}')
+
+    monkeypatch.setattr(send_message, 'find', no_button)
+    assert follow_up.follow_up_unanswered(OnlineDriver(), store=store) == 0
+    rows = store.query('SELECT profile_url, status FROM follow_ups ORDER BY profile_url')
+    assert [(r['profile_url'], r['status']) for r in rows] == [(url, 'failed') for url in PROFILES]
+    # not due again until FOLLOW_UP_DAYS have passed
+    assert _candidates(store) == []
@@ -0,0 +1,42 @@
+import csv
+import gzip
+import os
+
+from utils.logger import CsvLogWriter
+
+
+def _writer(path):
+    # rows are written synchronously through _write; the thread is never started
+    return CsvLogWriter(str(path), rollup=False)
+
+
+def _rows(path, opener=open):
+    with opener(path, 'rt', newline='', encoding='utf-8') as f:
+        return [row for row in csv.reader(f) if row[0] != 'timestamp']
+
+
+def test_rotates_by_the_first_row_of_the_live_file(tmp_path):
+    path = tmp_path / 'logs.csv'
+    writer = _writer(path)
+    writer._write([['2026-01-01T23:59:00', 'INFO', 'a', 'day one']])
+    writer._write([['2026-01-02T00:01:00', 'INFO', 'a', 'day two']])
+    writer._close()
+    assert _rows(tmp_path / 'logs-2026-01-01.csv.gz', gzip.open) == [['2026-01-01T23:59:00', 'INFO', 'a', 'day one']]
+    assert _rows(path) == [['2026-01-02T00:01:00', 'INFO', 'a', 'day two']]
+
+
+def test_second_process_does_not_rotate_a_fresh_file(tmp_path):
+    path = tmp_path / 'logs.csv'
+    scheduler, dashboard = _writer(path), _writer(path)
+    scheduler._write([['2026-01-01T10:00:00', 'INFO', 'scheduler', 'a']])
+    dashboard._write([['2026-01-01T11:00:00', 'INFO', 'funnel', 'b']])
+    # the scheduler rotates at midnight; the dashboard still holds yesterday's file open
+    scheduler._write([['2026-01-02T00:01:00', 'INFO', 'scheduler', 'c']])
+    dashboard._write([['2026-01-02T00:02:00', 'INFO', 'funnel', 'd']])
+    # a late row for yesterday goes to the live file, not the unlinked one
+    dashboard._write([['2026-01-01T23:59:59', 'INFO', 'funnel', 'e']])
+    scheduler._close()
+    dashboard._close()
+    assert [r[3] for r in _rows(tmp_path / 'logs-2026-01-01.csv.gz', gzip.open)] == ['a', 'b']
+    assert [r[3] for r in _rows(path)] == ['c', 'd', 'e']
+    assert not os.path.exists(tmp_path / 'logs-2026-01-02.csv.gz')
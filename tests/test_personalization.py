@@ -0,0 +1,63 @@
+import pytest
+
+from ai.personalization import (IF, LITERAL, TOKEN, TemplateError, Template, _parse, personalize_template,
+                                render_many)
+
+
+def test_parse_tokens_and_literals():
+    assert _parse('Hi {{name}}, at {{company|your team}}') == (
+        (LITERAL, 'Hi '), (TOKEN, 'name', None, '{{name}}'), (LITERAL, ', at '),
+        (TOKEN, 'company', 'your team', '{{company|your team}}'),
+    )
+
+
+def test_parse_if_else():
+    assert _parse('{{#if company}}at {{company}}{{else}}hello{{/if}}') == (
+        (IF, 'company', ((LITERAL, 'at '), (TOKEN, 'company', None, '{{company}}')), ((LITERAL, 'hello'),)),
+    )
+
+
+def test_parse_nested_blocks():
+    plan = _parse('{{#if role}}{{#if company}}{{role}} at {{company}}{{else}}{{role}}{{/if}}{{/if}}!')
+    outer, bang = plan
+    assert outer[:2] == (IF, 'role') and outer[3] == ()
+    inner, = outer[2]
+    assert inner[:2] == (IF, 'company')
+    assert inner[3] == ((TOKEN, 'role', None, '{{role}}'),)
+    assert bang == (LITERAL, '!')
+
+
+@pytest.mark.parametrize('source', [
+    '{{#if name}}Hi',
+    'Hi{{/if}}',
+    '{{else}} stray',
+    '{{#if a}}x{{else}}y{{else}}z{{/if}}',
+    '{{#if a}}{{#if b}}x{{/if}}',
+])
+def test_parse_rejects_malformed_blocks(source):
+    with pytest.raises(TemplateError):
+        _parse(source)
+
+
+def test_lenient_parse_keeps_control_tags_as_text():
+    assert _parse('{{#if name}}Hi {{name}}', strict=False) == (
+        (LITERAL, '{{#if name}}'), (LITERAL, 'Hi '), (TOKEN, 'name', None, '{{name}}'),
+    )
+
+
+def test_render_branches_and_fallbacks():
+    template = Template('Hi {{name}}{{#if company}}, {{role|someone}} at {{company}}{{else}}!{{/if}}')
+    assert template.fields == ['company', 'name', 'role']
+    assert template.render({'name': 'Ana', 'company': 'Acme'}) == 'Hi Ana, someone at Acme'
+    assert template.render({'name': 'Ana', 'company': '  '}) == 'Hi Ana!'
+    # tokens for fields that are not given at all are left for a later pass
+    assert template.render({'company': ''}) == 'Hi {{name}}!'
+
+
+def test_personalize_template_tolerates_malformed_notes():
+    assert personalize_template('Hi {{name}} {{/if}}', {'name': 'Ana'}) == 'Hi Ana {{/if}}'
+
+
+def test_render_many_stays_strict():
+    with pytest.raises(TemplateError):
+        render_many('{{#if name}}Hi', [{'name': 'Ana'}])
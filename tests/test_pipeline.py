@@ -0,0 +1,59 @@
+import queue
+from datetime import datetime
+
+import pytest
+
+from utils import quota
+from utils.quota import QuotaLedger
+from utils.storage import LeadStore
+from workflows.pipeline import POOL, SENT, Pipeline
+
+QUERIES = ['python engineer']
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    limits = dict(quota.default_limits(), connect=2)
+    monkeypatch.setattr(quota, '_ledger', QuotaLedger(str(tmp_path / 'quota.db'), limits))
+    monkeypatch.setattr(quota, 'today', lambda: '2026-01-01')
+    store = LeadStore(str(tmp_path / 'leads.db'))
+    store.add_leads([{'profile_url': f'https://www.linkedin.com/in/lead-{i}', 'name': f'Lead {i}',
+                      'role': 'Python Engineer', 'company': f'Co {i}', 'location': '',
+                      'extracted_at': datetime(2025, 12, 1).isoformat(), 'query': QUERIES[0]} for i in range(5)])
+    return store
+
+
+def _pick(store) -> list:
+    """Run the search stage of a (possibly resumed) prioritized run whose queries were all searched."""
+    pipeline = Pipeline(None, QUERIES, store=store, prioritize=True)
+    pipeline.checkpoint.record_search(QUERIES[0], [])
+    pipeline._search()
+    picked = []
+    while True:
+        try:
+            picked.append(pipeline.found.get_nowait())
+        except queue.Empty:
+            return pipeline, picked
+
+
+def test_resumed_run_picks_from_the_pool_again(store, monkeypatch):
+    first, picked = _pick(store)
+    assert len(picked) == 2
+    # the day's quota goes to these two and the run halts, to be resumed
+    for lead in picked:
+        assert quota.get_ledger().try_acquire('connect')
+        first.checkpoint.advance(lead['profile_url'], SENT)
+    assert POOL in first.checkpoint.searched()
+
+    monkeypatch.setattr(quota, 'today', lambda: '2026-01-02')
+    resumed, repicked = _pick(store)
+    assert resumed.checkpoint.resumed and resumed.checkpoint.run_id == first.checkpoint.run_id
+    assert len(repicked) == 2
+    assert not {l['profile_url'] for l in repicked} & {l['profile_url'] for l in picked}
+
+
+def test_pending_leads_use_up_the_quota_before_a_new_pick(store):
+    _first, picked = _pick(store)
+    # nothing sent yet: the resumed run passes on its two pending leads and picks no more
+    _resumed, repicked = _pick(store)
+    assert [l['profile_url'] for l in repicked] == [l['profile_url'] for l in picked]
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from utils import quota
+from utils.quota import QuotaLedger
+
+LIMITS = {'connect': 3, 'message': 2, 'follow_up': 1}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'quota.db')
+
+
+def test_acquire_stops_at_the_cap(path):
+    ledger = QuotaLedger(path, LIMITS)
+    assert [ledger.try_acquire('connect') for _ in range(5)] == [True, True, True, False, False]
+    assert ledger.used('connect') == 3
+    assert ledger.remaining('connect') == 0
+    # other actions keep their own counters
+    assert ledger.try_acquire('message')
+    assert ledger.used('message') == 1
+
+
+def test_release_gives_a_slot_back(path):
+    ledger = QuotaLedger(path, LIMITS)
+    assert ledger.try_acquire('follow_up')
+    assert not ledger.try_acquire('follow_up')
+    ledger.release('follow_up')
+    assert ledger.remaining('follow_up') == 1
+    assert ledger.try_acquire('follow_up')
+
+
+def test_release_never_goes_below_zero(path):
+    ledger = QuotaLedger(path, LIMITS)
+    ledger.release('connect')
+    ledger.release('connect')
+    assert ledger.used('connect') == 0
+    assert ledger.remaining('connect') == 3
+
+
+def test_cap_is_shared_across_connections(path):
+    first, second = QuotaLedger(path, LIMITS), QuotaLedger(path, LIMITS)
+    assert first.try_acquire('connect')
+    assert second.try_acquire('connect')
+    assert first.try_acquire('connect')
+    assert not second.try_acquire('connect')
+    assert second.used('connect') == 3
+    first.release('connect')
+    assert second.try_acquire('connect')
+    assert not first.try_acquire('connect')
+
+
+def test_concurrent_acquires_never_exceed_the_cap(path):
+    limits = dict(LIMITS, connect=25)
+    taken = []
+
+    def worker():
+        # a connection per thread, as separate processes would have
+        ledger = QuotaLedger(path, limits)
+        taken.extend(ledger.try_acquire('connect') for _ in range(10))
+        ledger.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(taken) == 25
+    assert QuotaLedger(path, limits).used('connect') == 25
+
+
+def test_counters_reset_on_a_new_day(path, monkeypatch):
+    ledger = QuotaLedger(path, LIMITS)
+    monkeypatch.setattr(quota, 'today', lambda: '2026-01-01')
+    assert ledger.try_acquire('follow_up')
+    assert not ledger.try_acquire('follow_up')
+    monkeypatch.setattr(quota, 'today', lambda: '2026-01-02')
+    assert ledger.try_acquire('follow_up')
+    assert ledger.used('follow_up', '2026-01-01') == 1
@@ -0,0 +1,135 @@
+"""Persistent membership index of contacted profiles plus per-run duplicate tracking.
+Contacted profile URLs are kept in a Bloom filter on disk (about 2 bytes per URL at the
+default error rate), loaded once per run and caught up from the lead store incrementally.
+Positive hits are confirmed against the store, so false positives never skip a lead.
+"""
+import hashlib
+import json
+import math
+import os
+
+from config import settings
+from utils.helpers import normalize_profile_url
+from utils.logger import info, error
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing on a blake2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001, bits: bytearray = None, count: int = 0):
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self.m = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.k = max(1, round(self.m / self.capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.m + 7) // 8)
+        self.count = count
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.m for i in range(self.k)]
+
+    def add(self, key: str) -> bool:
+        """Set the key's bits; returns True (and counts it) if any bit was newly set."""
+        added = False
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                added = True
+        self.count += added
+        return added
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class ContactedIndex:
+    """Answers "already contacted?" and "already seen this run?" before any page load or OpenAI call."""
+
+    def __init__(self, store, path: str = None, capacity: int = None, error_rate: float = None):
+        self.store = store
+        self.path = path or settings.CONTACTED_INDEX_PATH
+        self.capacity = capacity or settings.CONTACTED_INDEX_CAPACITY
+        self.error_rate = error_rate or settings.CONTACTED_INDEX_ERROR_RATE
+        self.bloom = None
+        self.last_id = 0
+        self.run_seen = set()
+        self.skipped = {'contacted': 0, 'duplicate': 0}
+
+    def load(self):
+        """Load the filter from disk (or rebuild it) and add sends recorded since it was saved."""
+        try:
+            with open(self.path, 'rb') as f:
+                header = json.loads(f.readline())
+                self.bloom = BloomFilter(header['capacity'], header['error_rate'],
+                                         bytearray(f.read()), header['count'])
+                self.last_id = header['last_id']
+        except FileNotFoundError:
+            self.bloom = None
+        except Exception as e:
+            error('contacted_index', f'Failed to load {self.path}: {e}; rebuilding')
+            self.bloom = None
+        if self.bloom is None:
+            self.bloom = BloomFilter(self.capacity, self.error_rate)
+            self.last_id = 0
+        self._catch_up()
+        info('contacted_index', f'Loaded contacted index with {self.bloom.count} profiles')
+        return self
+
+    def _catch_up(self):
+        rows = self.store.query(
+            "SELECT id, profile_url FROM sent_requests WHERE id > ? AND status = 'sent' ORDER BY id",
+            (self.last_id,),
+        )
+        if self.bloom.count + len(rows) > self.bloom.capacity:
+            # grow by rebuilding from the full history
+            self.bloom = BloomFilter(max(self.bloom.capacity, self.bloom.count + len(rows)) * 2, self.error_rate)
+            rows = self.store.query("SELECT id, profile_url FROM sent_requests WHERE status = 'sent' ORDER BY id")
+        for r in rows:
+            self.bloom.add(r['profile_url'])
+            self.last_id = r['id']
+
+    def save(self):
+        if self.bloom is None:
+            return
+        try:
+            self._catch_up()
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = f'{self.path}.tmp'
+            header = {'capacity': self.bloom.capacity, 'error_rate': self.bloom.error_rate,
+                      'count': self.bloom.count, 'last_id': self.last_id}
+            with open(tmp, 'wb') as f:
+                f.write(json.dumps(header).encode('utf-8') + b'\n')
+                f.write(self.bloom.bits)
+            os.replace(tmp, self.path)
+        except Exception as e:
+            error('contacted_index', f'Failed to save {self.path}: {e}')
+
+    def is_contacted(self, profile_url: str) -> bool:
+        url = normalize_profile_url(profile_url)
+        return url in self.bloom and self.store.is_contacted(url)
+
+    def should_skip(self, profile_url: str, mark_seen: bool = True) -> bool:
+        """True (and counted) if the profile was contacted before or, with `mark_seen`,
+        already seen earlier in this run."""
+        url = normalize_profile_url(profile_url)
+        if mark_seen:
+            if url in self.run_seen:
+                self.skipped['duplicate'] += 1
+                return True
+            self.run_seen.add(url)
+        if self.is_contacted(url):
+            self.skipped['contacted'] += 1
+            return True
+        return False
+
+    def add_contacted(self, profile_url: str):
+        """Record a successful send; the store row is picked up by id on the next catch-up."""
+        self.bloom.add(normalize_profile_url(profile_url))
+
+    def report(self):
+        info('contacted_index', f"Skipped {self.skipped['contacted']} already-contacted and "
+                                f"{self.skipped['duplicate']} duplicate profiles this run")
+        return dict(self.skipped)
@@ -3,31 +3,30 @@ import random
 import functools
 import logging
 
+from config import settings
 from utils.logger import info, error
+from utils.timing import span
+from utils import resilience
 
 
 def random_delay(min_seconds: int, max_seconds: int):
-    """Sleep for a random duration between min and max seconds."""
-    delay = random.uniform(min_seconds, max_seconds)
+    """Sleep for a random duration between min and max seconds (scaled by ACTION_DELAY_SCALE)."""
+    delay = random.uniform(min_seconds, max_seconds) * settings.ACTION_DELAY_SCALE
+    if delay <= 0:
+        return
     info('helpers', f'Sleeping for {delay:.2f}s')
-    time.sleep(delay)
+    with span('helpers', 'random_delay', 'delay'):
+        time.sleep(delay)
 
 
-def retry(attempts=3, backoff=1.5):
-    """Retry decorator with exponential backoff."""
+def retry(attempts=None, backoff=None, breaker: str = None):
+    """Retry decorator: transient errors only, jittered exponential backoff, within the run's retry budget.
+    `breaker` names the dependency's circuit breaker (see utils.resilience)."""
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            last_exc = None
-            for attempt in range(1, attempts + 1):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    last_exc = e
-                    wait = backoff * (2 ** (attempt - 1))
-                    error('helpers', f'Attempt {attempt} failed: {e}; retrying in {wait}s')
-                    time.sleep(wait)
-            raise last_exc
+            return resilience.call(func, *args, breaker=resilience.get_breaker(breaker) if breaker else None,
+                                   attempts=attempts, backoff=backoff, **kwargs)
         return wrapper
     return decorator
 
@@ -41,3 +40,18 @@ def safe_click(driver, element):
     except Exception as e:
         error('helpers', f'Failed to click element: {e}')
         return False
+
+
+def normalize_profile_url(url: str) -> str:
+    """Canonical form of a LinkedIn profile URL used as the dedupe key (no query, fragment or trailing slash)."""
+    if not url:
+        return ''
+    url = url.strip().split('#', 1)[0].split('?', 1)[0].rstrip('/')
+    scheme, sep, rest = url.partition('://')
+    if not sep:
+        scheme, rest = 'https', url
+    host, _, path = rest.partition('/')
+    host = host.lower()
+    if host == 'linkedin.com' or host.endswith('.linkedin.com'):
+        host = 'www.linkedin.com'
+    return f'https://{host}/{path}' if path else f'https://{host}'
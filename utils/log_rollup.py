@@ -0,0 +1,125 @@
+"""Write-time rollups of the CSV log: row counts per (day, level, component).
+The CSV log writer merges each batch's counts in one upsert transaction, so views and
+alerts read O(days x components) rows instead of parsing every log line. Rollups live in a
+small SQLite file next to the CSV (`logs.csv` -> `logs.rollup.db`).
+Run as: python -m utils.log_rollup rebuild|show
+"""
+import csv
+import gzip
+import os
+import sqlite3
+import sys
+from collections import Counter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS log_rollup (
+    day TEXT NOT NULL,
+    level TEXT NOT NULL,
+    component TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, level, component)
+);
+"""
+
+UPSERT = ('INSERT INTO log_rollup (day, level, component, count) VALUES (?, ?, ?, ?) '
+          'ON CONFLICT(day, level, component) DO UPDATE SET count = count + excluded.count')
+
+
+def rollup_path(csv_path: str) -> str:
+    return f'{os.path.splitext(os.path.abspath(csv_path))[0]}.rollup.db'
+
+
+def count_rows(rows) -> Counter:
+    """Counter of (day, level, component) for [timestamp, level, component, ...] rows."""
+    return Counter((row[0][:10], row[1], row[2]) for row in rows if len(row) >= 3 and row[0])
+
+
+class LogRollup:
+    """Per-day, per-level, per-component counters of CSV log rows."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = None
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def merge(self, counts: Counter):
+        """Add `counts` to the stored totals atomically."""
+        if not counts:
+            return
+        db = self._db()
+        with db:
+            db.executemany(UPSERT, [(day, level, comp, n) for (day, level, comp), n in counts.items()])
+
+    def rebuild(self, files) -> int:
+        """Replace the rollups with counts from the given CSV logs (plain or .gz); returns rows counted."""
+        counts = Counter()
+        for path in files:
+            opener = gzip.open if path.endswith('.gz') else open
+            with opener(path, 'rt', newline='', encoding='utf-8') as f:
+                reader = csv.reader(f)
+                # archives may hold several concatenated files, each with its own header
+                counts.update(count_rows(r for r in reader if r and r[0] != 'timestamp'))
+        db = self._db()
+        with db:
+            db.execute('DELETE FROM log_rollup')
+            db.executemany(UPSERT, [(day, level, comp, n) for (day, level, comp), n in counts.items()])
+        return sum(counts.values())
+
+    def is_empty(self) -> bool:
+        return self._db().execute('SELECT 1 FROM log_rollup LIMIT 1').fetchone() is None
+
+    def daily(self, since: str = None) -> list:
+        """Rows of (day, level, count), oldest day first."""
+        return self._db().execute(
+            'SELECT day, level, SUM(count) FROM log_rollup WHERE day >= ? GROUP BY day, level ORDER BY day, level',
+            (since or '',),
+        ).fetchall()
+
+    def error_rates(self, since: str = None) -> dict:
+        """{component: {'total', 'errors', 'error_rate'}} with the error rate in percent."""
+        rows = self._db().execute(
+            "SELECT component, SUM(count), SUM(CASE WHEN level = 'ERROR' THEN count ELSE 0 END) "
+            'FROM log_rollup WHERE day >= ? GROUP BY component ORDER BY component',
+            (since or '',),
+        ).fetchall()
+        return {comp: {'total': total, 'errors': errors, 'error_rate': round(errors / total * 100, 2)}
+                for comp, total, errors in rows if total}
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def rebuild_log_rollups(csv_path: str = None) -> int:
+    """Regenerate the rollups of `csv_path` (default: the application CSV log) from its archives and live file."""
+    from utils.logger import LOG_CSV, flush_csv_logs, log_csv_files
+    csv_path = csv_path or LOG_CSV
+    flush_csv_logs()
+    rollup = LogRollup(rollup_path(csv_path))
+    try:
+        return rollup.rebuild(log_csv_files(csv_path))
+    finally:
+        rollup.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] not in ('rebuild', 'show'):
+        print('Usage: python -m utils.log_rollup rebuild|show [logs.csv]')
+        sys.exit(1)
+    if sys.argv[1] == 'rebuild':
+        print(f'Counted {rebuild_log_rollups(sys.argv[2] if len(sys.argv) > 2 else None)} log rows')
+    else:
+        from utils.logger import LOG_CSV
+        rollup = LogRollup(rollup_path(sys.argv[2] if len(sys.argv) > 2 else LOG_CSV))
+        for row in rollup.daily():
+            print(*row, sep='\t')
+        for comp, stats in rollup.error_rates().items():
+            print(comp, stats, sep='\t')
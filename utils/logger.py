@@ -1,10 +1,34 @@
 import logging
 from logging.handlers import RotatingFileHandler
+import atexit
+import contextlib
 import csv
+import glob
+import gzip
 import os
+import queue
+import shutil
+import threading
+import time
 from datetime import datetime
 
-LOG_CSV = os.path.join(os.path.dirname(__file__), '..', 'data', 'logs.csv')
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from config import settings
+from utils.log_rollup import LogRollup, count_rows, rollup_path
+
+LOG_CSV = os.path.join(settings.DATA_DIR, 'logs.csv')
+LOG_CSV_HEADER = ['timestamp', 'level', 'component', 'message']
+
+# CSV sink tuning: rows are flushed when a batch fills up or the interval elapses
+LOG_CSV_BATCH_SIZE = int(os.getenv('LOG_CSV_BATCH_SIZE', 200))
+LOG_CSV_FLUSH_INTERVAL = float(os.getenv('LOG_CSV_FLUSH_INTERVAL', 1.0))
+# Number of dated, gzip-compressed archives of logs.csv to keep
+LOG_CSV_BACKUP_DAYS = int(os.getenv('LOG_CSV_BACKUP_DAYS', 30))
 
 # Configure standard logger
 logger = logging.getLogger('linkedin_automation')
@@ -16,16 +40,213 @@ if not logger.handlers:
     logger.addHandler(handler)
 
 
+@contextlib.contextmanager
+def _file_lock(path: str):
+    """Exclusive inter-process lock on `path` (created if missing) for the duration of the block."""
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _csv_archives(path: str) -> list:
+    root, ext = os.path.splitext(path)
+    return sorted(glob.glob(f'{root}-*{ext}.gz'))
+
+
+def log_csv_files(path: str = LOG_CSV) -> list:
+    """Return rotated archives (oldest first) followed by the live CSV log, if present."""
+    files = _csv_archives(path)
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+class CsvLogWriter(threading.Thread):
+    """Background thread that drains queued log rows into the CSV log in batches.
+
+    Keeps a single file handle open, flushes on batch size or time threshold and
+    rotates the file into a dated `.csv.gz` archive when the UTC day changes. Each
+    written batch is also merged into the per-day/level/component rollups.
+    Several processes may write the same file: batches and rotation hold `<path>.lock`, the
+    handle is reopened when another process rotated or recreated the file, and the archive
+    date comes from the live file's first row.
+    """
+
+    def __init__(self, path: str = LOG_CSV, batch_size: int = LOG_CSV_BATCH_SIZE,
+                 flush_interval: float = LOG_CSV_FLUSH_INTERVAL, backup_days: int = LOG_CSV_BACKUP_DAYS,
+                 header: list = None, rollup: bool = True, name: str = 'csv-log-writer'):
+        super().__init__(name=name, daemon=True)
+        self.path = os.path.abspath(path)
+        self.lock_path = f'{self.path}.lock'
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.backup_days = backup_days
+        self.header = header or LOG_CSV_HEADER
+        self.rollup = LogRollup(rollup_path(self.path)) if rollup else None
+        self.queue = queue.SimpleQueue()
+        self._file = None
+        self._writer = None
+        self._file_date = None
+        self._flushed = threading.Condition()
+        self._pending = 0
+
+    def submit(self, row):
+        with self._flushed:
+            self._pending += 1
+        self.queue.put(row)
+
+    def flush(self, timeout: float = 5.0):
+        """Block until every row submitted so far has been written to disk."""
+        self.queue.put(None)
+        with self._flushed:
+            self._flushed.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def stop(self, timeout: float = 5.0):
+        self.queue.put(StopIteration)
+        self.join(timeout)
+
+    def run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is StopIteration:
+                self._write(batch)
+                self._close()
+                if self.rollup is not None:
+                    self.rollup.close()
+                return
+            if item is not None:
+                batch.append(item)
+            if item is None or len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with _file_lock(self.lock_path):
+                if self._file is not None and self._replaced():
+                    self._close()
+                for row in batch:
+                    row_date = row[0][:10]
+                    if self._file is None or row_date != self._file_date:
+                        self._open(row_date)
+                    self._writer.writerow(row)
+                self._file.flush()
+        except Exception as e:
+            logger.error(f'logger - Failed to write CSV log batch: {e}')
+        else:
+            try:
+                if self.rollup is not None:
+                    self.rollup.merge(count_rows(batch))
+            except Exception as e:
+                logger.error(f'logger - Failed to update log rollups: {e}')
+        finally:
+            with self._flushed:
+                self._pending -= len(batch)
+                self._flushed.notify_all()
+
+    def _replaced(self) -> bool:
+        """True when the live file is no longer the one we hold open (rotated or recreated elsewhere)."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return True
+        own = os.fstat(self._file.fileno())
+        return (st.st_dev, st.st_ino) != (own.st_dev, own.st_ino)
+
+    def _live_date(self) -> str:
+        """UTC day of the live file's first row (None when it has no rows yet)."""
+        try:
+            with open(self.path, newline='', encoding='utf-8') as f:
+                for row in csv.reader(f):
+                    if row and row[0] != self.header[0]:
+                        return row[0][:10]
+        except FileNotFoundError:
+            return None
+        except Exception:
+            return datetime.utcfromtimestamp(os.path.getmtime(self.path)).date().isoformat()
+        return None
+
+    def _open(self, row_date: str):
+        """Open the live file for `row_date`, archiving it first if it holds an earlier day. Caller holds the lock."""
+        self._close()
+        file_date = self._live_date()
+        if file_date is not None and file_date < row_date:
+            self._rotate(file_date)
+        write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._file = open(self.path, 'a', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._file_date = row_date
+        if write_header:
+            self._writer.writerow(self.header)
+
+    def _rotate(self, file_date: str):
+        """Compress the live CSV into `logs-YYYY-MM-DD.csv.gz` and prune old archives."""
+        root, ext = os.path.splitext(self.path)
+        archive = f'{root}-{file_date}{ext}.gz'
+        with open(self.path, 'rb') as src, gzip.open(archive, 'ab') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(self.path)
+        if self.backup_days > 0:
+            for old in _csv_archives(self.path)[:-self.backup_days]:
+                os.remove(old)
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+
+_csv_writer = None
+_csv_writer_lock = threading.Lock()
+
+
+def _get_csv_writer() -> CsvLogWriter:
+    global _csv_writer
+    if _csv_writer is None or not _csv_writer.is_alive():
+        with _csv_writer_lock:
+            if _csv_writer is None or not _csv_writer.is_alive():
+                _csv_writer = CsvLogWriter()
+                _csv_writer.start()
+    return _csv_writer
+
+
+def flush_csv_logs(timeout: float = 5.0):
+    """Wait for queued CSV log rows to reach disk."""
+    if _csv_writer is not None and _csv_writer.is_alive():
+        _csv_writer.flush(timeout)
+
+
+@atexit.register
+def _shutdown_csv_writer():
+    if _csv_writer is not None and _csv_writer.is_alive():
+        _csv_writer.stop()
+
+
 def log_to_csv(level: str, component: str, message: str):
-    """Append a structured log entry to the CSV logs file."""
+    """Queue a structured log entry for the CSV logs file; written by a background thread."""
     timestamp = datetime.utcnow().isoformat()
-    os.makedirs(os.path.dirname(LOG_CSV), exist_ok=True)
-    write_header = not os.path.exists(LOG_CSV) or os.path.getsize(LOG_CSV) == 0
-    with open(LOG_CSV, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        if write_header:
-            writer.writerow(['timestamp', 'level', 'component', 'message'])
-        writer.writerow([timestamp, level, component, message])
+    _get_csv_writer().submit([timestamp, level, component, message])
 
 
 def info(component: str, message: str):
@@ -0,0 +1,114 @@
+"""Daily quota ledger for outbound actions (connections, messages, follow-ups).
+One counter row per (UTC day, action) in a small SQLite file (QUOTA_PATH). A slot is taken with
+a single conditional UPDATE on the primary key, so checks are constant time and stay atomic
+across threads and processes. Caps come from MAX_DAILY_CONNECTIONS, MAX_DAILY_MESSAGES and
+MAX_DAILY_FOLLOW_UPS.
+Run as: python -m utils.quota show [days]
+"""
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+
+from config import settings
+from utils.logger import info
+
+ACTIONS = ['connect', 'message', 'follow_up']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_ledger (
+    day TEXT NOT NULL,
+    action TEXT NOT NULL,
+    used INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, action)
+);
+"""
+
+
+def default_limits() -> dict:
+    return {'connect': settings.MAX_DAILY_CONNECTIONS, 'message': settings.MAX_DAILY_MESSAGES,
+            'follow_up': settings.MAX_DAILY_FOLLOW_UPS}
+
+
+def today() -> str:
+    return datetime.utcnow().date().isoformat()
+
+
+class QuotaLedger:
+    """Per-day, per-action counters with atomic take/give-back against the daily caps."""
+
+    def __init__(self, path: str = None, limits: dict = None):
+        self.path = path or settings.QUOTA_PATH
+        self.limits = limits or default_limits()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # autocommit: every statement is its own transaction
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._warned = set()
+
+    def close(self):
+        self.conn.close()
+
+    def used(self, action: str, day: str = None) -> int:
+        with self._lock:
+            row = self.conn.execute('SELECT used FROM quota_ledger WHERE day = ? AND action = ?',
+                                    (day or today(), action)).fetchone()
+        return row[0] if row else 0
+
+    def remaining(self, action: str) -> int:
+        return max(0, self.limits[action] - self.used(action))
+
+    def try_acquire(self, action: str) -> bool:
+        """Take one of today's slots for `action`; False (nothing taken) once the cap is reached."""
+        day = today()
+        with self._lock:
+            self.conn.execute('INSERT OR IGNORE INTO quota_ledger (day, action, used) VALUES (?, ?, 0)', (day, action))
+            taken = self.conn.execute('UPDATE quota_ledger SET used = used + 1 WHERE day = ? AND action = ? AND used < ?',
+                                      (day, action, self.limits[action])).rowcount == 1
+        if not taken and (day, action) not in self._warned:
+            self._warned.add((day, action))
+            info('quota', f'Daily {action} quota of {self.limits[action]} reached')
+        return taken
+
+    def release(self, action: str):
+        """Give back a slot taken by `try_acquire` when the action did not happen after all."""
+        with self._lock:
+            self.conn.execute('UPDATE quota_ledger SET used = used - 1 WHERE day = ? AND action = ? AND used > 0',
+                              (today(), action))
+
+    def usage(self, day: str = None) -> list:
+        """Limit, used and remaining per action for `day` (default today)."""
+        day = day or today()
+        rows = []
+        for action in ACTIONS:
+            used = self.used(action, day)
+            rows.append({'day': day, 'action': action, 'limit': self.limits[action], 'used': used,
+                         'remaining': max(0, self.limits[action] - used)})
+        return rows
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger() -> QuotaLedger:
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = QuotaLedger()
+        return _ledger
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'show':
+        print('Usage: python -m utils.quota show [days]')
+        sys.exit(1)
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    ledger = get_ledger()
+    for n in range(days):
+        day = (datetime.utcnow().date() - timedelta(days=n)).isoformat()
+        for row in ledger.usage(day):
+            print(row['day'], row['action'], f"{row['used']}/{row['limit']}", f"{row['remaining']} left", sep='\t')
@@ -0,0 +1,183 @@
+"""Resilience for calls to flaky dependencies (OpenAI, page navigation).
+- `classify` sorts exceptions into transient (worth retrying), permanent (this call will
+  never work, e.g. a bad request) and fatal (nothing will work until the setup changes, e.g.
+  a missing API key or rejected credentials).
+- `CircuitBreaker` short-circuits a dependency after BREAKER_FAILURE_THRESHOLD consecutive
+  transient failures (or one fatal failure) and lets a single probe through after
+  BREAKER_COOLDOWN seconds.
+- `call` retries transient errors with full-jitter exponential backoff, drawing every retry
+  from a per-run budget (RETRY_BUDGET) so an outage cannot stall a run with retries.
+"""
+import random
+import threading
+import time
+
+from config import settings
+from utils.logger import info, error
+
+TRANSIENT, PERMANENT, FATAL = 'transient', 'permanent', 'fatal'
+
+# matched on class names so both the legacy and current OpenAI clients (and Selenium) are covered
+TRANSIENT_ERRORS = {
+    'Timeout', 'APITimeoutError', 'APIConnectionError', 'RateLimitError', 'ServiceUnavailableError',
+    'InternalServerError', 'TryAgain', 'TimeoutException', 'TimeoutError', 'ConnectionError',
+}
+FATAL_ERRORS = {
+    'NotConfigured', 'AuthenticationError', 'PermissionError', 'PermissionDeniedError',
+    'InvalidSessionIdException', 'NoSuchWindowException',
+}
+# Chrome network failures surface as a generic WebDriverException
+TRANSIENT_MESSAGES = ('net::ERR_', 'ERR_CONNECTION', 'ERR_TIMED_OUT', 'ERR_INTERNET_DISCONNECTED')
+
+
+class NotConfigured(Exception):
+    """A dependency cannot be used with the current configuration (e.g. no API key)."""
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a dependency whose circuit breaker is open."""
+
+
+def classify(exc: BaseException) -> str:
+    names = {cls.__name__ for cls in type(exc).__mro__}
+    if names & FATAL_ERRORS:
+        return FATAL
+    if names & TRANSIENT_ERRORS:
+        return TRANSIENT
+    status = getattr(exc, 'http_status', None) or getattr(exc, 'status_code', None)
+    if isinstance(status, int):
+        return TRANSIENT if status >= 500 or status == 429 else PERMANENT
+    if 'APIError' in names or any(m in str(exc) for m in TRANSIENT_MESSAGES):
+        return TRANSIENT
+    return PERMANENT
+
+
+class CircuitBreaker:
+    """closed -> open after repeated failures -> half-open probe after the cool-down -> closed."""
+
+    def __init__(self, name: str, failure_threshold: int = None, cooldown: float = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.BREAKER_FAILURE_THRESHOLD
+        self.cooldown = settings.BREAKER_COOLDOWN if cooldown is None else cooldown
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.short_circuits = 0
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """True (and counted as a short-circuit) while the breaker is open and still cooling down.
+        Unlike `allow`, never starts the half-open probe."""
+        with self._lock:
+            if self.state == 'open' and time.monotonic() - self.opened_at < self.cooldown:
+                self.short_circuits += 1
+                return True
+            return False
+
+    def allow(self) -> bool:
+        """True if a call may go through; after the cool-down only one probe is let through."""
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = 'half_open'
+                info('resilience', f'{self.name} circuit half-open, probing')
+                return True
+            self.short_circuits += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != 'closed':
+                info('resilience', f'{self.name} circuit closed after a successful probe')
+            self.state = 'closed'
+            self.failures = 0
+
+    def record_failure(self, exc: BaseException):
+        kind = classify(exc)
+        with self._lock:
+            if kind == PERMANENT and self.state == 'closed':
+                # the dependency answered; only this request was bad
+                return
+            self.failures += 1
+            if kind == FATAL or self.state == 'half_open' or self.failures >= self.failure_threshold:
+                if self.state != 'open':
+                    error('resilience', f'{self.name} circuit open for {self.cooldown:.0f}s after '
+                                        f'{type(exc).__name__}: {exc}')
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """Retries allowed per run, shared by all dependencies and threads."""
+
+    def __init__(self, size: int = None):
+        self.size = settings.RETRY_BUDGET if size is None else size
+        self.remaining = self.size
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    def reset(self):
+        with self._lock:
+            self.remaining = self.size
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+_budget = RetryBudget()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def breaker_summary() -> dict:
+    """State, consecutive failures and short-circuited calls per dependency."""
+    with _breakers_lock:
+        return {name: {'state': b.state, 'failures': b.failures, 'short_circuits': b.short_circuits}
+                for name, b in _breakers.items()}
+
+
+def reset_retry_budget():
+    """Start a new run's retry budget."""
+    _budget.reset()
+
+
+def backoff_delay(attempt: int, backoff: float = None, max_delay: float = None) -> float:
+    """Full jitter: uniform in [0, min(max_delay, backoff * 2^(attempt-1))]."""
+    backoff = settings.RETRY_BACKOFF if backoff is None else backoff
+    max_delay = settings.RETRY_MAX_DELAY if max_delay is None else max_delay
+    return random.uniform(0, min(max_delay, backoff * 2 ** (attempt - 1)))
+
+
+def call(func, *args, breaker: CircuitBreaker = None, attempts: int = None, backoff: float = None, **kwargs):
+    """Call `func`, retrying transient errors within the run's retry budget.
+    Raises CircuitOpen without calling `func` while `breaker` is open."""
+    attempts = settings.RETRY_ATTEMPTS if attempts is None else attempts
+    for attempt in range(1, attempts + 1):
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpen(f'{breaker.name} circuit is open')
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if breaker is not None:
+                breaker.record_failure(e)
+            if classify(e) != TRANSIENT or attempt == attempts or not _budget.take():
+                raise
+            wait = backoff_delay(attempt, backoff)
+            error('resilience', f'{getattr(func, "__name__", "call")} attempt {attempt} failed: {e}; '
+                                f'retrying in {wait:.1f}s')
+            time.sleep(wait)
+            continue
+        if breaker is not None:
+            breaker.record_success()
+        return result
@@ -0,0 +1,255 @@
+"""SQLite-backed store for leads, sent connection requests and responses.
+Replaces the append-only CSV files; profile URLs are normalized and indexed so lookups
+such as "already contacted?" or "unanswered for N days" stay cheap on large histories.
+Run as: python -m utils.storage import-csv [data_dir] [--force]
+"""
+import csv
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+
+from config import settings
+from utils.helpers import normalize_profile_url
+from utils.logger import info, error
+
+LEAD_COLUMNS = ['profile_url', 'name', 'role', 'company', 'location', 'extracted_at', 'query']
+SENT_COLUMNS = ['profile_url', 'name', 'role', 'company', 'request_sent_at', 'status', 'note']
+RESPONSE_COLUMNS = ['profile_url', 'name', 'role', 'company', 'response_at', 'message']
+FOLLOW_UP_COLUMNS = ['profile_url', 'sent_at', 'status', 'message']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    profile_url TEXT PRIMARY KEY,
+    name TEXT,
+    role TEXT,
+    company TEXT,
+    location TEXT,
+    extracted_at TEXT,
+    query TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_leads_extracted ON leads(extracted_at);
+CREATE TABLE IF NOT EXISTS sent_requests (
+    id INTEGER PRIMARY KEY,
+    profile_url TEXT NOT NULL,
+    name TEXT,
+    role TEXT,
+    company TEXT,
+    request_sent_at TEXT,
+    status TEXT,
+    note TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sent_profile ON sent_requests(profile_url, status);
+CREATE INDEX IF NOT EXISTS idx_sent_at ON sent_requests(request_sent_at);
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY,
+    profile_url TEXT NOT NULL,
+    name TEXT,
+    role TEXT,
+    company TEXT,
+    response_at TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_responses_profile ON responses(profile_url);
+CREATE INDEX IF NOT EXISTS idx_responses_at ON responses(response_at);
+CREATE TABLE IF NOT EXISTS follow_ups (
+    id INTEGER PRIMARY KEY,
+    profile_url TEXT NOT NULL,
+    sent_at TEXT NOT NULL,
+    status TEXT,
+    message TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_follow_ups_profile ON follow_ups(profile_url, sent_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+BATCH_SIZE = 5000
+
+
+def _rows(records, columns):
+    """Turn dicts into tuples in column order with the profile URL normalized."""
+    for r in records:
+        row = [r.get(c) for c in columns]
+        row[0] = normalize_profile_url(row[0])
+        if row[0]:
+            yield tuple(row)
+
+
+def _batches(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class LeadStore:
+    """Repository over the local SQLite database (WAL mode, safe to share across threads)."""
+
+    def __init__(self, path: str = None):
+        self.path = path or settings.DB_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        # columns added after the first release of the schema
+        self.ensure_columns('leads', {'query': 'TEXT'})
+
+    def close(self):
+        self.conn.close()
+
+    def ensure_columns(self, table: str, columns: dict):
+        """Add any missing `name: type` columns to an existing table."""
+        with self._lock:
+            existing = {r[1] for r in self.conn.execute(f'PRAGMA table_info({table})')}
+            for name, sql_type in columns.items():
+                if name not in existing:
+                    with self.conn:
+                        self.conn.execute(f'ALTER TABLE {table} ADD COLUMN {name} {sql_type}')
+
+    def _insert_many(self, sql, rows) -> int:
+        count = 0
+        with self._lock:
+            for batch in _batches(rows):
+                with self.conn:
+                    self.conn.executemany(sql, batch)
+                count += len(batch)
+        return count
+
+    # --- writers -------------------------------------------------------
+
+    def add_leads(self, leads) -> int:
+        """Insert or refresh extracted leads keyed by profile URL."""
+        sql = (
+            f"INSERT INTO leads ({', '.join(LEAD_COLUMNS)}) VALUES ({', '.join('?' * len(LEAD_COLUMNS))}) "
+            "ON CONFLICT(profile_url) DO UPDATE SET name=excluded.name, role=excluded.role, "
+            "company=excluded.company, location=excluded.location, extracted_at=excluded.extracted_at, "
+            "query=COALESCE(excluded.query, leads.query)"
+        )
+        return self._insert_many(sql, _rows(leads, LEAD_COLUMNS))
+
+    def record_sent(self, requests) -> int:
+        sql = f"INSERT INTO sent_requests ({', '.join(SENT_COLUMNS)}) VALUES ({', '.join('?' * len(SENT_COLUMNS))})"
+        return self._insert_many(sql, _rows(requests, SENT_COLUMNS))
+
+    def record_responses(self, responses) -> int:
+        sql = f"INSERT INTO responses ({', '.join(RESPONSE_COLUMNS)}) VALUES ({', '.join('?' * len(RESPONSE_COLUMNS))})"
+        return self._insert_many(sql, _rows(responses, RESPONSE_COLUMNS))
+
+    def record_follow_ups(self, follow_ups) -> int:
+        sql = f"INSERT INTO follow_ups ({', '.join(FOLLOW_UP_COLUMNS)}) VALUES ({', '.join('?' * len(FOLLOW_UP_COLUMNS))})"
+        return self._insert_many(sql, _rows(follow_ups, FOLLOW_UP_COLUMNS))
+
+    # --- readers -------------------------------------------------------
+
+    def query(self, sql: str, params=()) -> list:
+        with self._lock:
+            return [dict(r) for r in self.conn.execute(sql, params)]
+
+    def count(self, table: str, where: str = '', params=()) -> int:
+        sql = f'SELECT COUNT(*) FROM {table}' + (f' WHERE {where}' if where else '')
+        with self._lock:
+            return self.conn.execute(sql, params).fetchone()[0]
+
+    def is_contacted(self, profile_url: str) -> bool:
+        """True if a connection request was successfully sent to this profile."""
+        sql = "SELECT 1 FROM sent_requests WHERE profile_url = ? AND status = 'sent' LIMIT 1"
+        with self._lock:
+            return self.conn.execute(sql, (normalize_profile_url(profile_url),)).fetchone() is not None
+
+    def iter_follow_up_candidates(self, first_cutoff: datetime, repeat_cutoff: datetime, max_follow_ups: int,
+                                  chunk_size: int = 1000):
+        """Yield chunks of distinct unanswered profiles due for a follow-up.
+
+        A profile qualifies when it has a successful send on or before `first_cutoff`, no
+        response, fewer than `max_follow_ups` follow-up attempts, and no attempt after
+        `repeat_cutoff`. Chunks are fetched by keyset pagination on profile_url, so memory
+        stays bounded and follow-ups recorded while iterating do not disturb the scan.
+        """
+        sql = (
+            "SELECT s.profile_url, MIN(s.request_sent_at) AS request_sent_at, "
+            "COUNT(DISTINCT f.id) AS follow_ups, MAX(f.sent_at) AS last_follow_up_at "
+            "FROM sent_requests s "
+            "LEFT JOIN follow_ups f ON f.profile_url = s.profile_url "
+            "WHERE s.status = 'sent' AND s.profile_url > ? "
+            "AND NOT EXISTS (SELECT 1 FROM responses r WHERE r.profile_url = s.profile_url) "
+            "GROUP BY s.profile_url "
+            "HAVING MIN(s.request_sent_at) <= ? AND COUNT(DISTINCT f.id) < ? "
+            "AND (MAX(f.sent_at) IS NULL OR MAX(f.sent_at) <= ?) "
+            "ORDER BY s.profile_url LIMIT ?"
+        )
+        last = ''
+        while True:
+            chunk = self.query(sql, (last, first_cutoff.isoformat(), max_follow_ups, repeat_cutoff.isoformat(),
+                                     chunk_size))
+            if not chunk:
+                return
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            last = chunk[-1]['profile_url']
+
+    # --- import --------------------------------------------------------
+
+    def import_csvs(self, data_dir: str = None, force: bool = False) -> dict:
+        """One-shot import of the legacy leads_input/sent_requests/responses CSVs."""
+        data_dir = data_dir or settings.DATA_DIR
+        with self._lock:
+            done = self.conn.execute("SELECT value FROM meta WHERE key = 'csv_import'").fetchone()
+        if done and not force:
+            info('storage', f'CSV import already done at {done[0]}; skipping')
+            return {}
+        counts = {}
+        for name, writer in (('leads_input.csv', self.add_leads),
+                             ('sent_requests.csv', self.record_sent),
+                             ('responses.csv', self.record_responses)):
+            path = os.path.join(data_dir, name)
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r', newline='', encoding='utf-8') as f:
+                    counts[name] = writer(csv.DictReader(f))
+            except Exception as e:
+                error('storage', f'Failed to import {path}: {e}')
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('csv_import', ?)",
+                              (datetime.utcnow().isoformat(),))
+        info('storage', f'Imported CSVs into {self.path}: {counts}')
+        return counts
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> LeadStore:
+    """Process-wide store; the first open of a new database imports the legacy CSVs."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            is_new = not os.path.exists(settings.DB_PATH)
+            _store = LeadStore(settings.DB_PATH)
+            if is_new:
+                _store.import_csvs(settings.DATA_DIR)
+    return _store
+
+
+if __name__ == '__main__':
+    args = [a for a in sys.argv[1:] if a != '--force']
+    if not args or args[0] != 'import-csv':
+        print('Usage: python -m utils.storage import-csv [data_dir] [--force]')
+        sys.exit(1)
+    store = LeadStore(settings.DB_PATH)
+    # --force imports again even if an import was already done; sent requests and responses
+    # have no unique key, so their rows are then added a second time
+    print(store.import_csvs(args[1] if len(args) > 1 else None, force='--force' in sys.argv[1:]))
@@ -0,0 +1,132 @@
+"""Lightweight timing spans for the automation steps.
+`span(component, step, category)` (or the `@timed` decorator) records nested spans with their
+outcome, total and self duration (time not spent in child spans). Categories separate the kinds
+of time: 'startup' (browser start), 'page' (driver.get), 'wait' (explicit WebDriverWait), 'find'
+(find_element, which may sit out the implicit wait), 'openai', 'delay' (deliberate random_delay
+sleeps) and 'work'.
+Spans are written by a background thread to the compact `data/spans.csv` (rotated daily like the
+CSV log), tagged with the current run id so the dashboard can break each run down. The run id
+is context-local: threads started for a run get it through `carry_run`.
+"""
+import atexit
+import contextvars
+import functools
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from config import settings
+from utils.logger import CsvLogWriter
+
+SPANS_CSV = os.path.join(settings.DATA_DIR, 'spans.csv')
+SPAN_HEADER = ['timestamp', 'run_id', 'component', 'step', 'category', 'outcome', 'duration_ms', 'self_ms', 'depth']
+
+_local = threading.local()
+_run_id = contextvars.ContextVar('run_id', default=f'proc-{os.getpid()}-{int(time.time())}')
+_writer = None
+_writer_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ('component', 'step', 'category', 'outcome', 'start', 'child_ms')
+
+    def __init__(self, component: str, step: str, category: str):
+        self.component = component
+        self.step = step
+        self.category = category
+        self.outcome = 'ok'
+        self.start = time.perf_counter()
+        self.child_ms = 0.0
+
+
+def start_run(run_id: str = None) -> str:
+    """Tag spans recorded from now on in this thread (and threads it starts via `carry_run`) with a
+    new run id; returns it."""
+    run_id = run_id or f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    _run_id.set(run_id)
+    return run_id
+
+
+def current_run() -> str:
+    return _run_id.get()
+
+
+def carry_run(func):
+    """`func` bound to a copy of the caller's context, so spans it records in another thread keep the run id."""
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+def _get_writer() -> CsvLogWriter:
+    global _writer
+    if _writer is None or not _writer.is_alive():
+        with _writer_lock:
+            if _writer is None or not _writer.is_alive():
+                _writer = CsvLogWriter(SPANS_CSV, header=SPAN_HEADER, rollup=False, name='span-writer')
+                _writer.start()
+    return _writer
+
+
+def flush_spans(timeout: float = 5.0):
+    if _writer is not None and _writer.is_alive():
+        _writer.flush(timeout)
+
+
+@atexit.register
+def _shutdown_writer():
+    if _writer is not None and _writer.is_alive():
+        _writer.stop()
+
+
+class span:
+    """Context manager timing one step; set `.outcome` on the yielded Span to label the result.
+    Exceptions propagate and mark the span 'timeout', 'not_found' or 'error'."""
+
+    def __init__(self, component: str, step: str, category: str = 'work'):
+        self.span = Span(component, step, category)
+
+    def __enter__(self) -> Span:
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.span.start = time.perf_counter()
+        stack.append(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        s = self.span
+        duration_ms = (time.perf_counter() - s.start) * 1000
+        stack = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].child_ms += duration_ms
+        if exc_type is not None:
+            if issubclass(exc_type, TimeoutException):
+                s.outcome = 'timeout'
+            elif issubclass(exc_type, NoSuchElementException):
+                s.outcome = 'not_found'
+            else:
+                s.outcome = 'error'
+        if settings.TIMING_ENABLED:
+            _get_writer().submit([datetime.utcnow().isoformat(), _run_id.get(), s.component, s.step, s.category,
+                                  s.outcome, round(duration_ms, 2), round(duration_ms - s.child_ms, 2),
+                                  len(stack)])
+        return False
+
+
+def timed(component: str, step: str = None, category: str = 'work'):
+    """Decorator recording each call of the function as a span (step defaults to the function name).
+    A False return value marks the span 'failed'."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(component, step or func.__name__, category) as s:
+                result = func(*args, **kwargs)
+                if result is False:
+                    s.outcome = 'failed'
+                return result
+        return wrapper
+    return decorator
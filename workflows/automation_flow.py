@@ -1,35 +1,68 @@
 """Orchestrates the end-to-end automation flow.
-This module composes login, search, send connections and optionally follow-ups.
+This module composes login, the staged search/generate/send pipeline and optionally follow-ups.
 """
-import os
 from config import settings
-from automation.login import create_driver, login
-from automation.search_profiles import search_profiles
-from automation.send_connection import send_connection
-from ai.message_generator import generate_message
-from ai.personalization import personalize_template
+from automation.login import create_driver
+from automation.session import ensure_logged_in
+from automation.follow_up import follow_up_unanswered
+from ai.message_generator import get_cache
+from workflows.pipeline import Pipeline
 from utils.logger import info, error
+from utils.storage import get_store
+from utils.contacted_index import ContactedIndex
+from dashboard.funnel import update_funnel
+from utils.timing import start_run, timed
+from utils.resilience import breaker_summary, reset_retry_budget
+from utils.quota import get_ledger
+from automation.locators import save_registry
 
 
-def run_once(email: str, password: str, queries: list, max_per_query=10):
-    driver = create_driver(settings.HEADLESS)
+@timed('automation_flow', 'run_once')
+def run_once(email: str, password: str, queries: list, max_per_query=10, driver=None, follow_up: bool = False,
+             dry_run: bool = False, resume: bool = True, run_id: str = None):
+    """Search, generate and send for each query, then optionally follow up on unanswered requests.
+    `queries` are free-text searches or PlannedQuery objects (see automation.query_planner).
+    The work runs as a checkpointed pipeline (see workflows.pipeline): a run that stopped midway is
+    resumed by the next call with the same queries unless `resume` is False. With `dry_run`,
+    leads are searched and notes generated but nothing is sent.
+    Pass a warm `driver` (see automation.session.get_driver) to reuse it; it is left open.
+    Otherwise a driver on the persistent Chrome profile is started and quit at the end.
+    Sends stop once today's quotas (see utils.quota) are used up; when nothing is left to send,
+    no browser is started at all.
+    Spans are tagged with `run_id` (e.g. the scheduler job's) or a new run id.
+    """
+    start_run(run_id)
+    reset_retry_budget()
+    if not dry_run and get_ledger().remaining('connect') <= 0 and not follow_up:
+        info('automation_flow', 'Daily connection quota already used up; nothing to do until tomorrow')
+        return
+    own_driver = driver is None
+    if own_driver:
+        driver = create_driver(settings.HEADLESS, profile_dir=settings.CHROME_PROFILE_DIR or None)
+    store = get_store()
+    index = ContactedIndex(store).load()
     try:
-        ok = login(driver, email, password)
+        ok = ensure_logged_in(driver, email, password)
         if not ok:
             error('automation_flow', 'Login failed, aborting flow')
             return
-        for q in queries:
-            results = search_profiles(driver, q, max_results=max_per_query, output_csv=os.path.join('data', 'leads_input.csv'))
-            for r in results:
-                # simple personalization
-                msg = generate_message(r.get('name') or '', r.get('role') or '', r.get('company') or '', intent='connect')
-                note = personalize_template(msg, {'name': r.get('name')})
-                send_connection(driver, r.get('profile_url'), note, output_csv=os.path.join('data', 'sent_requests.csv'))
+        Pipeline(driver, queries, max_per_query, store=store, index=index, dry_run=dry_run, resume=resume).run()
+        if follow_up and not dry_run:
+            follow_up_unanswered(driver, store=store)
     except Exception as e:
         error('automation_flow', f'Flow error: {e}')
     finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
+        if own_driver:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        index.save()
+        index.report()
+        save_registry()
+        update_funnel(store)
+        info('automation_flow', f'Message cache: {get_cache().summary()}')
+        breakers = breaker_summary()
+        if any(b['state'] != 'closed' or b['short_circuits'] for b in breakers.values()):
+            info('automation_flow', f'Circuit breakers: {breakers}')
         info('automation_flow', 'Flow completed')
@@ -0,0 +1,408 @@
+"""Staged outreach pipeline: search -> dedupe -> generate -> send.
+Each stage runs in its own thread and hands leads to the next through a bounded queue
+(PIPELINE_QUEUE_SIZE), so message generation overlaps with searching and sending. Search and
+send share the browser and take turns on it.
+Every stage transition is checkpointed in the lead store. The next run with the same queries
+resumes an interrupted run: searched queries are not searched again, and each lead continues
+from the stage it reached (generated notes are not regenerated).
+With `dry_run`, search and generation run but nothing is sent. Per-stage throughput is logged.
+Search only looks for as many leads as the daily connection quota still allows, and the run stops
+(to be resumed) as soon as the quota is used up, leaving unsent notes in the checkpoint.
+With `prioritize` (PRIORITIZE_LEADS), the searches only grow the lead pool; the search stage then
+passes on the best-scoring uncontacted leads of the whole pool, as many as the quota allows (see
+automation.lead_scoring). The pick is checkpointed like a query, under the name POOL, but is made
+again on every resume, so a run halted by the quota fills the next day's quota from the pool.
+Run as: python -m workflows.pipeline status
+"""
+import json
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+from config import settings
+from automation.lead_scoring import LeadScorer, top_leads
+from automation.query_planner import PlannedQuery, QueryCache, run_query
+from automation.search_profiles import search_profiles
+from automation.send_connection import send_connection
+from ai.message_generator import generate_messages
+from ai.personalization import fit_note, personalize_template
+from utils.helpers import normalize_profile_url
+from utils.logger import info, error
+from utils.quota import get_ledger
+from utils.storage import get_store
+from utils.timing import carry_run
+
+STAGES = ['search', 'dedupe', 'generate', 'send']
+# lead stages in the checkpoint; 'skipped', 'sent' and 'failed' are final
+FOUND, DEDUPED, GENERATED, SKIPPED, SENT, FAILED = 'found', 'deduped', 'generated', 'skipped', 'sent', 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+    id INTEGER PRIMARY KEY,
+    queries TEXT NOT NULL,
+    dry_run INTEGER DEFAULT 0,
+    started_at TEXT,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS pipeline_queries (
+    run_id INTEGER NOT NULL,
+    query TEXT NOT NULL,
+    searched_at TEXT,
+    PRIMARY KEY (run_id, query)
+);
+CREATE TABLE IF NOT EXISTS pipeline_leads (
+    run_id INTEGER NOT NULL,
+    profile_url TEXT NOT NULL,
+    query TEXT,
+    name TEXT,
+    role TEXT,
+    company TEXT,
+    stage TEXT,
+    message TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (run_id, profile_url)
+);
+CREATE INDEX IF NOT EXISTS idx_pipeline_leads_stage ON pipeline_leads(run_id, stage);
+"""
+
+# end-of-stream marker passed down the queues
+DONE = object()
+# checkpoint query name of the leads picked from the scored pool
+POOL = '(lead pool)'
+
+
+def query_name(q) -> str:
+    return q.label if isinstance(q, PlannedQuery) else str(q)
+
+
+class Checkpoint:
+    """Progress of one pipeline run: which queries were searched and the stage of every lead."""
+
+    def __init__(self, store, run_id: int, resumed: bool = False):
+        self.store = store
+        self.run_id = run_id
+        self.resumed = resumed
+
+    @classmethod
+    def open(cls, store, queries, dry_run: bool = False, resume: bool = True) -> 'Checkpoint':
+        """Resume the latest unfinished run with the same queries (and dry-run flag), or start one."""
+        with store._lock:
+            store.conn.executescript(SCHEMA)
+        names = json.dumps([query_name(q) for q in queries])
+        if resume:
+            rows = store.query('SELECT id FROM pipeline_runs WHERE queries = ? AND dry_run = ? AND finished_at IS NULL '
+                               'ORDER BY id DESC LIMIT 1', (names, int(dry_run)))
+            if rows:
+                return cls(store, rows[0]['id'], resumed=True)
+        with store._lock, store.conn:
+            cur = store.conn.execute('INSERT INTO pipeline_runs (queries, dry_run, started_at) VALUES (?, ?, ?)',
+                                     (names, int(dry_run), datetime.utcnow().isoformat()))
+        return cls(store, cur.lastrowid)
+
+    def searched(self) -> set:
+        return {r['query'] for r in self.store.query('SELECT query FROM pipeline_queries WHERE run_id = ?',
+                                                     (self.run_id,))}
+
+    def record_search(self, query: str, leads: list) -> list:
+        """Checkpoint a finished query and its leads; returns the leads not already in this run."""
+        now = datetime.utcnow().isoformat()
+        new = []
+        with self.store._lock, self.store.conn:
+            for lead in leads:
+                url = normalize_profile_url(lead.get('profile_url'))
+                if not url:
+                    continue
+                cur = self.store.conn.execute(
+                    'INSERT OR IGNORE INTO pipeline_leads (run_id, profile_url, query, name, role, company, stage, '
+                    'updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (self.run_id, url, query, lead.get('name'), lead.get('role'), lead.get('company'), FOUND, now),
+                )
+                if cur.rowcount:
+                    new.append(dict(lead, profile_url=url))
+            self.store.conn.execute('INSERT OR REPLACE INTO pipeline_queries (run_id, query, searched_at) '
+                                    'VALUES (?, ?, ?)', (self.run_id, query, now))
+        return new
+
+    def advance(self, profile_url: str, stage: str, message: str = None):
+        with self.store._lock, self.store.conn:
+            self.store.conn.execute(
+                'UPDATE pipeline_leads SET stage = ?, message = COALESCE(?, message), updated_at = ? '
+                'WHERE run_id = ? AND profile_url = ?',
+                (stage, message, datetime.utcnow().isoformat(), self.run_id, profile_url),
+            )
+
+    def urls(self) -> set:
+        return {r['profile_url'] for r in self.store.query('SELECT profile_url FROM pipeline_leads WHERE run_id = ?',
+                                                           (self.run_id,))}
+
+    def leads(self, stage: str) -> list:
+        return self.store.query('SELECT * FROM pipeline_leads WHERE run_id = ? AND stage = ? ORDER BY rowid',
+                                (self.run_id, stage))
+
+    def counts(self) -> dict:
+        return {r['stage']: r['n'] for r in self.store.query(
+            'SELECT stage, COUNT(*) AS n FROM pipeline_leads WHERE run_id = ? GROUP BY stage', (self.run_id,))}
+
+    def finish(self):
+        with self.store._lock, self.store.conn:
+            self.store.conn.execute('UPDATE pipeline_runs SET finished_at = ? WHERE id = ?',
+                                    (datetime.utcnow().isoformat(), self.run_id))
+
+
+def prune_checkpoints(store, days: int = None) -> int:
+    """Delete finished runs older than `days` (PIPELINE_KEEP_DAYS) with their checkpoints; returns how many."""
+    days = settings.PIPELINE_KEEP_DAYS if days is None else days
+    cutoff = (datetime.utcnow() - timedelta(days=days)).isoformat()
+    with store._lock, store.conn:
+        store.conn.executescript(SCHEMA)
+        ids = [r[0] for r in store.conn.execute('SELECT id FROM pipeline_runs WHERE finished_at < ?', (cutoff,))]
+        for table, column in (('pipeline_leads', 'run_id'), ('pipeline_queries', 'run_id'), ('pipeline_runs', 'id')):
+            store.conn.executemany(f'DELETE FROM {table} WHERE {column} = ?', [(i,) for i in ids])
+    return len(ids)
+
+
+class Pipeline:
+    """One outreach run over `queries`, checkpointed so it can be resumed (see module docstring)."""
+
+    def __init__(self, driver, queries: list, max_per_query: int = 10, store=None, index=None,
+                 dry_run: bool = False, resume: bool = True, queue_size: int = None, prioritize: bool = None):
+        self.driver = driver
+        self.queries = list(queries)
+        self.max_per_query = max_per_query
+        self.store = store or get_store()
+        self.index = index
+        self.dry_run = dry_run
+        self.prioritize = settings.PRIORITIZE_LEADS if prioritize is None else prioritize
+        self.cache = QueryCache(self.store)
+        self.checkpoint = Checkpoint.open(self.store, self.queries, dry_run, resume)
+        size = queue_size or settings.PIPELINE_QUEUE_SIZE
+        self.found, self.deduped, self.generated = (queue.Queue(maxsize=size) for _ in range(3))
+        # search and send both drive the browser; they take turns
+        self.driver_lock = threading.Lock()
+        self.ledger = get_ledger()
+        # set when a stage fails or the connection quota runs out; the stages then wind down
+        self.halted = threading.Event()
+        # 'failed', 'interrupted' or 'quota' (also set, without halting, when search stops for the quota)
+        self.halt_reason = None
+        self.stats = {name: {'items': 0, 'seconds': 0.0} for name in STAGES}
+
+    # --- queues --------------------------------------------------------
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Block until there is room; False (item dropped) once the pipeline is halted."""
+        while not self.halted.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue):
+        """Next item, or DONE at the end of the stream (or when the queue is empty after a halt)."""
+        while True:
+            try:
+                return q.get(timeout=0.5)
+            except queue.Empty:
+                if self.halted.is_set():
+                    return DONE
+
+    def _halt(self, reason: str):
+        if not self.halted.is_set():
+            self.halt_reason = reason
+            self.halted.set()
+
+    def _sendable(self) -> int:
+        """Leads this run can still send to: today's remaining connection quota minus the leads
+        of this run that are already on their way to the send stage (unlimited in a dry run)."""
+        if self.dry_run:
+            return self.max_per_query * len(self.queries)
+        counts = self.checkpoint.counts()
+        pending = sum(counts.get(stage, 0) for stage in (FOUND, DEDUPED, GENERATED))
+        return self.ledger.remaining('connect') - pending
+
+    def _items(self, q: queue.Queue):
+        while True:
+            item = self._get(q)
+            if item is DONE:
+                return
+            yield item
+
+    # --- stages --------------------------------------------------------
+
+    def _search(self):
+        # leads found before an interruption that never reached dedupe
+        for lead in self.checkpoint.leads(FOUND):
+            if not self._put(self.found, lead):
+                return
+        searched = self.checkpoint.searched()
+        for q in self.queries:
+            name = query_name(q)
+            if name in searched:
+                continue
+            sendable = self._sendable()
+            if sendable <= 0:
+                # the leads already found are still sent; the remaining queries wait for the next run
+                info('pipeline', 'Leads already found cover the daily connection quota; not searching further')
+                self.halt_reason = self.halt_reason or 'quota'
+                return
+            # when prioritizing, a wider search gives the ranking more to choose from
+            budget = self.max_per_query if self.prioritize else min(self.max_per_query, sendable)
+            with self.driver_lock:
+                if isinstance(q, PlannedQuery):
+                    results = run_query(self.driver, q, budget, self.store, self.index, self.cache)
+                else:
+                    results = search_profiles(self.driver, q, max_results=budget, store=self.store, index=self.index)
+            searched.add(name)
+            if self.prioritize:
+                # the results are in the lead store; they compete with the pool below
+                self.checkpoint.record_search(name, [])
+                self.stats['search']['items'] += len(results)
+                continue
+            for lead in self.checkpoint.record_search(name, results):
+                self.stats['search']['items'] += 1
+                if not self._put(self.found, lead):
+                    return
+        # not skipped when POOL was already picked: a resumed run still has quota to fill
+        sendable = self._sendable() if self.prioritize else 0
+        if sendable > 0:
+            picked = top_leads(self.store, LeadScorer.from_queries(self.queries), sendable,
+                               exclude=self.checkpoint.urls())
+            for lead in self.checkpoint.record_search(POOL, picked):
+                if not self._put(self.found, lead):
+                    return
+
+    def _dedupe(self):
+        for lead in self.checkpoint.leads(DEDUPED):
+            if not self._put(self.deduped, lead):
+                return
+        for lead in self._items(self.found):
+            url = lead['profile_url']
+            self.stats['dedupe']['items'] += 1
+            if not lead.get('name') or (self.index is not None and self.index.should_skip(url, mark_seen=False)):
+                self.checkpoint.advance(url, SKIPPED)
+                continue
+            self.checkpoint.advance(url, DEDUPED)
+            if not self._put(self.deduped, lead):
+                return
+
+    def _generate(self):
+        for lead in self.checkpoint.leads(GENERATED):
+            if not self._put(self.generated, lead):
+                return
+        batch_size = max(1, settings.OPENAI_CONCURRENCY * settings.OPENAI_BATCH_SIZE)
+        done = False
+        while not done:
+            # wait for one lead, then take whatever else is already queued (up to a batch)
+            batch = [self._get(self.deduped)]
+            while batch[-1] is not DONE and len(batch) < batch_size:
+                try:
+                    batch.append(self.deduped.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is DONE:
+                done = True
+                batch.pop()
+            for lead, msg in generate_messages(batch, intent='connect'):
+                # simple personalization, kept within LinkedIn's note length
+                note = fit_note(personalize_template(msg, {'name': lead.get('name')}), settings.CONNECTION_NOTE_LIMIT)
+                self.checkpoint.advance(lead['profile_url'], GENERATED, note)
+                self.stats['generate']['items'] += 1
+                if not self._put(self.generated, dict(lead, message=note)):
+                    return
+
+    def _send(self):
+        for lead in self._items(self.generated):
+            self.stats['send']['items'] += 1
+            if self.dry_run:
+                continue
+            url = lead['profile_url']
+            # sent just before an interruption, but not checkpointed
+            if self.index is not None and self.index.is_contacted(url):
+                self.checkpoint.advance(url, SKIPPED)
+                continue
+            # the lead keeps its note and is sent when the run is resumed
+            if self.ledger.remaining('connect') <= 0:
+                self._halt('quota')
+                return
+            with self.driver_lock:
+                ok = send_connection(self.driver, url, lead.get('message'), store=self.store)
+            if not ok and self.ledger.remaining('connect') <= 0:
+                # another process took the last slot first
+                self._halt('quota')
+                return
+            if ok and self.index is not None:
+                self.index.add_contacted(url)
+            self.checkpoint.advance(url, SENT if ok else FAILED)
+
+    def _stage(self, name: str, body, out: queue.Queue = None):
+        start = time.perf_counter()
+        try:
+            body()
+        except Exception as e:
+            error('pipeline', f'{name} stage failed: {e}')
+            self._halt('failed')
+        finally:
+            self.stats[name]['seconds'] = time.perf_counter() - start
+            if out is not None:
+                self._put(out, DONE)
+
+    # --- run -----------------------------------------------------------
+
+    def run(self) -> bool:
+        """Run all stages to completion; True if the run finished (False leaves it to be resumed)."""
+        info('pipeline', f"{'Resuming' if self.checkpoint.resumed else 'Starting'} run {self.checkpoint.run_id} "
+                         f"({len(self.queries)} queries{', dry run' if self.dry_run else ''})")
+        threads = [
+            threading.Thread(target=carry_run(self._stage), args=('search', self._search, self.found),
+                             name='pipeline-search'),
+            threading.Thread(target=carry_run(self._stage), args=('dedupe', self._dedupe, self.deduped),
+                             name='pipeline-dedupe'),
+            threading.Thread(target=carry_run(self._stage), args=('generate', self._generate, self.generated),
+                             name='pipeline-generate'),
+            threading.Thread(target=carry_run(self._stage), args=('send', self._send), name='pipeline-send'),
+        ]
+        for t in threads:
+            t.daemon = True
+            t.start()
+        try:
+            for t in threads:
+                t.join()
+        except BaseException:
+            # e.g. Ctrl+C: stop the stages; the checkpoint keeps the progress so far
+            self._halt('interrupted')
+            raise
+        finally:
+            self.report()
+        if self.halt_reason == 'quota':
+            info('pipeline', f'Daily connection quota reached; the next run resumes run {self.checkpoint.run_id}')
+            return False
+        if self.halted.is_set():
+            error('pipeline', f'Run {self.checkpoint.run_id} stopped early; the next run resumes it')
+            return False
+        self.checkpoint.finish()
+        return True
+
+    def report(self) -> dict:
+        for name in STAGES:
+            s = self.stats[name]
+            rate = s['items'] / s['seconds'] * 60 if s['seconds'] > 0 else 0.0
+            info('pipeline', f"{name}: {s['items']} leads in {s['seconds']:.1f}s ({rate:.1f}/min)")
+        counts = self.checkpoint.counts()
+        info('pipeline', f'Run {self.checkpoint.run_id} leads by stage: {counts}')
+        return counts
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'status':
+        print('Usage: python -m workflows.pipeline status')
+        sys.exit(1)
+    store = get_store()
+    with store._lock:
+        store.conn.executescript(SCHEMA)
+    for run in store.query('SELECT * FROM pipeline_runs ORDER BY id DESC LIMIT 10'):
+        counts = Checkpoint(store, run['id']).counts()
+        state = 'finished' if run['finished_at'] else 'resumable'
+        print(run['id'], run['started_at'], state, 'dry run' if run['dry_run'] else '', counts, sep='\t')
@@ -1,19 +1,312 @@
-"""Scheduler wrapper to run automation daily using `schedule`."""
-import schedule
-import time
+"""Runs the automation's recurring jobs, each on its own cadence.
+Jobs are outreach (search/connect), follow-up, analytics rollup and cache maintenance (see
+`default_jobs`). The loop sleeps until the next deadline and hands due jobs to a worker pool
+(SCHEDULER_WORKERS). A job never overlaps itself: a run that comes due while the previous one is
+still queued or running is skipped. Jobs that drive the browser take turns on it: a job whose
+resource is in use stays due, without taking a worker, until the job holding it finishes.
+Next-run and last-run state, queue depth and job durations are kept in SCHEDULER_STATE_PATH.
+After a restart, each job that missed a run while the scheduler was down runs once right away.
+Run as: python -m workflows.scheduler status
+"""
+import json
 import os
-from datetime import datetime
-from workflows.automation_flow import run_once
-from utils.logger import info
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from config import settings
+from utils.logger import info, error
+from utils.timing import current_run, start_run
+
+# durations kept per job for the status averages
+DURATION_HISTORY = 20
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts).isoformat() if ts else None
+
+
+def _ts(value) -> float:
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+class Job:
+    """A named callable run `every` N seconds or daily `at` HH:MM (local time).
+    Jobs with the same `resource` (e.g. 'browser') never run at the same time."""
+
+    def __init__(self, name: str, func, every: float = None, at: str = None, resource: str = None,
+                 catch_up: bool = True):
+        if (every is None) == (at is None):
+            raise ValueError(f'job {name}: give exactly one of every= or at=')
+        self.name = name
+        self.func = func
+        self.every = every
+        self.at = at
+        self.resource = resource
+        self.catch_up = catch_up
+
+    def next_after(self, ts: float) -> float:
+        """First scheduled time after `ts` (missed occurrences in between are coalesced)."""
+        if self.every:
+            return ts + self.every
+        hour, minute = (int(part) for part in self.at.split(':'))
+        when = datetime.fromtimestamp(ts).replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if when.timestamp() <= ts:
+            when += timedelta(days=1)
+        return when.timestamp()
+
+    def first_run(self, now: float) -> float:
+        return now if self.every else self.next_after(now)
+
+
+class Scheduler:
+    """Deadline-driven scheduler for a set of jobs (see module docstring)."""
+
+    def __init__(self, jobs: list, workers: int = None, state_path: str = None):
+        self.jobs = {job.name: job for job in jobs}
+        self.state_path = state_path or settings.SCHEDULER_STATE_PATH
+        self.state = self._load()
+        self._cond = threading.Condition()
+        self._pool = ThreadPoolExecutor(max_workers=workers or settings.SCHEDULER_WORKERS, thread_name_prefix='job')
+        # resources held by queued or running jobs, and due jobs waiting for one of them
+        self._busy = set()
+        self._waiting = set()
+        self._queued = set()
+        self._running = {}
+        self._stopped = False
+
+    # --- state ---------------------------------------------------------
+
+    def _load(self) -> dict:
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f).get('jobs', {})
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            error('scheduler', f'Failed to load {self.state_path}: {e}')
+            return {}
+
+    def _job_state(self, name: str) -> dict:
+        return self.state.setdefault(name, {'next_run': None, 'last_run': None, 'last_status': None,
+                                            'last_duration': None, 'durations': [], 'runs': 0, 'failures': 0,
+                                            'skipped': 0})
+
+    def status(self) -> dict:
+        """Queue depth, running jobs and per-job schedule and durations."""
+        with self._cond:
+            jobs = {}
+            for name in self.jobs:
+                st = dict(self._job_state(name))
+                durations = st.pop('durations')
+                st['avg_duration'] = round(sum(durations) / len(durations), 2) if durations else None
+                st['max_duration'] = round(max(durations), 2) if durations else None
+                jobs[name] = st
+            return {
+                'updated_at': _iso(time.time()),
+                'queue_depth': len(self._queued),
+                'queued': sorted(self._queued),
+                'running': {name: _iso(start) for name, start in self._running.items()},
+                'jobs': jobs,
+            }
+
+    def _save(self):
+        with self._cond:
+            snapshot = self.status()
+            snapshot['jobs'] = {name: dict(snapshot['jobs'][name], durations=self._job_state(name)['durations'])
+                                for name in snapshot['jobs']}
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+            tmp = f'{self.state_path}.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, indent=1)
+            os.replace(tmp, self.state_path)
+        except Exception as e:
+            error('scheduler', f'Failed to save {self.state_path}: {e}')
+
+    # --- running jobs --------------------------------------------------
+
+    def _run_job(self, job: Job):
+        with self._cond:
+            self._queued.discard(job.name)
+            self._running[job.name] = time.time()
+        # each job's spans get their own run id instead of the last one this worker thread saw
+        info('scheduler', f'Running {job.name} (run {start_run()})')
+        start = time.perf_counter()
+        status = 'ok'
+        try:
+            job.func()
+        except Exception as e:
+            status = 'error'
+            error('scheduler', f'{job.name} failed: {e}')
+        duration = time.perf_counter() - start
+        with self._cond:
+            st = self._job_state(job.name)
+            st['last_run'] = _iso(self._running.pop(job.name))
+            st['last_status'] = status
+            st['last_duration'] = round(duration, 2)
+            st['durations'] = (st['durations'] + [round(duration, 2)])[-DURATION_HISTORY:]
+            st['runs'] += 1
+            st['failures'] += status != 'ok'
+            # wake the loop for jobs waiting on the resource
+            self._busy.discard(job.resource)
+            self._cond.notify_all()
+        info('scheduler', f'{job.name} finished ({status}) in {duration:.1f}s')
+        self._save()
+
+    def _blocked(self, job: Job) -> bool:
+        return job.resource is not None and job.resource in self._busy
+
+    def _dispatch(self, job: Job, now: float):
+        st = self._job_state(job.name)
+        if job.name in self._queued or job.name in self._running:
+            st['next_run'] = _iso(job.next_after(now))
+            st['skipped'] += 1
+            info('scheduler', f'{job.name} is still queued or running; skipping this run')
+            return
+        if self._blocked(job):
+            # stays due; dispatched once the job holding the resource finishes
+            if job.name not in self._waiting:
+                self._waiting.add(job.name)
+                info('scheduler', f'{job.name} is waiting for the {job.resource}')
+            return
+        self._waiting.discard(job.name)
+        st['next_run'] = _iso(job.next_after(now))
+        if job.resource:
+            self._busy.add(job.resource)
+        self._queued.add(job.name)
+        self._pool.submit(self._run_job, job)
+
+    def _schedule_start(self):
+        """Set each job's first deadline; jobs that missed a run while stopped are due now."""
+        now = time.time()
+        for job in self.jobs.values():
+            st = self._job_state(job.name)
+            due = _ts(st['next_run'])
+            if due is None:
+                due = job.first_run(now)
+            elif due < now:
+                if job.catch_up:
+                    info('scheduler', f'{job.name} missed its run at {st["next_run"]}; catching up now')
+                    due = now
+                else:
+                    due = job.next_after(now)
+            st['next_run'] = _iso(due)
+
+    def run_forever(self):
+        """Dispatch jobs as they come due until `stop` is called; sleeps until the next deadline."""
+        with self._cond:
+            self._schedule_start()
+        self._save()
+        info('scheduler', f"Scheduler started with jobs: {', '.join(self.jobs)}")
+        try:
+            with self._cond:
+                while not self._stopped:
+                    now = time.time()
+                    due = [job for job in self.jobs.values() if _ts(self._job_state(job.name)['next_run']) <= now]
+                    for job in due:
+                        self._dispatch(job, now)
+                    if due:
+                        self._save()
+                    # jobs waiting for a resource are woken by the job that frees it
+                    deadlines = [_ts(self._job_state(job.name)['next_run']) for job in self.jobs.values()
+                                 if not self._blocked(job)]
+                    self._cond.wait(timeout=max(0.0, min(deadlines) - time.time()) if deadlines else None)
+        finally:
+            # let running jobs finish; queued ones are dropped and run again on their schedule
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+
+def default_jobs(email: str, password: str, queries: list) -> list:
+    """Outreach and follow-up (sharing the warm browser), analytics rollup and cache maintenance."""
+    from automation.follow_up import follow_up_unanswered
+    from automation.locators import save_registry
+    from automation.query_planner import QueryCache
+    from automation.session import ensure_logged_in, get_driver
+    from ai.message_generator import get_cache
+    from dashboard.funnel import update_funnel
+    from utils.storage import get_store
+    from workflows.automation_flow import run_once
+    from workflows.pipeline import prune_checkpoints
+
+    def outreach():
+        # one warm browser per scheduler process; its session persists in the Chrome profile
+        # keep the job's run id so the scheduler log and the spans agree
+        run_once(email, password, queries, driver=get_driver(), run_id=current_run())
+
+    def follow_up():
+        driver = get_driver()
+        try:
+            if ensure_logged_in(driver, email, password):
+                follow_up_unanswered(driver, store=get_store())
+        finally:
+            # the scheduler runs for days; don't leave the lookup stats to the exit hook
+            save_registry()
+
+    def analytics():
+        update_funnel(get_store())
+
+    def maintenance():
+        store = get_store()
+        info('scheduler', f'Maintenance removed {get_cache().prune()} cached messages, '
+                          f'{QueryCache(store).prune()} expired query caches and '
+                          f'{prune_checkpoints(store)} old pipeline runs')
+
+    return [
+        Job('outreach', outreach, at=settings.SCHEDULE_OUTREACH_AT, resource='browser'),
+        Job('follow_up', follow_up, at=settings.SCHEDULE_FOLLOW_UP_AT, resource='browser'),
+        Job('analytics', analytics, every=settings.SCHEDULE_ANALYTICS_EVERY),
+        Job('maintenance', maintenance, every=settings.SCHEDULE_MAINTENANCE_EVERY),
+    ]
+
+
+def run_scheduler(jobs: list):
+    """Run `jobs` until interrupted (Ctrl+C)."""
+    scheduler = Scheduler(jobs)
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+        info('scheduler', 'Scheduler stopped')
 
 
 def schedule_daily(run_time: str, email: str, password: str, queries: list):
-    """Schedule a daily run at `HH:MM` (24h)."""
-    def job():
-        info('scheduler', f'Starting scheduled run at {datetime.utcnow().isoformat()}')
-        run_once(email, password, queries)
-    schedule.every().day.at(run_time).do(job)
-    info('scheduler', f'Scheduled daily job at {run_time}')
-    while True:
-        schedule.run_pending()
-        time.sleep(5)
+    """Run only the outreach job daily at `HH:MM` (24h). See `default_jobs` for the full set."""
+    from automation.session import get_driver
+    from workflows.automation_flow import run_once
+
+    run_scheduler([Job('outreach', lambda: run_once(email, password, queries, driver=get_driver(), run_id=current_run()),
+                       at=run_time, resource='browser')])
+
+
+def read_status(path: str = None) -> dict:
+    """The status last saved by a running (or stopped) scheduler; {} if there is none."""
+    try:
+        with open(path or settings.SCHEDULER_STATE_PATH, encoding='utf-8') as f:
+            status = json.load(f)
+    except FileNotFoundError:
+        return {}
+    for st in status.get('jobs', {}).values():
+        st.pop('durations', None)
+    return status
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'status':
+        print('Usage: python -m workflows.scheduler status')
+        sys.exit(1)
+    status = read_status()
+    if not status:
+        print('No scheduler state yet')
+        sys.exit(0)
+    print(f"updated {status['updated_at']}  queue depth {status['queue_depth']}  "
+          f"running {', '.join(status['running']) or '-'}")
+    for name, st in status['jobs'].items():
+        print(name, st, sep='\t')